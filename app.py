@@ -1,24 +1,42 @@
 import streamlit as st
-from transformers import pipeline
 from datetime import datetime
 import pandas as pd
-import gspread
 from google.oauth2.service_account import Credentials
 import tempfile
 import os
-from googleapiclient.discovery import build
+from google_clients import get_drive_service, get_sheets_client
 from googleapiclient.http import MediaFileUpload
+from config import SUMMARIZATION_MODEL, TRANSCRIPTION_MODEL, INFERENCE_BACKEND, INFERENCE_WORKER_URL
+from model_manager import get_model_manager
+from inference_worker import InferenceClient
+from media_store import sha256_bytes
+from result_cache import get_result_cache, cache_key, text_digest, TRANSCRIPT, SUMMARY
 
-# --- AI Model Caching ---
-@st.cache_resource
-def get_summarizer():
-    """Loads the summarization model from Hugging Face."""
-    return pipeline("summarization", model="sshleifer/distilbart-cnn-12-6")
+# --- AI Models ---
+# With INFERENCE_WORKER_URL set, a shared inference worker process owns the models and this
+# app stays small. Otherwise they are loaded here in the background as soon as the app starts,
+# shared by all sessions, and unloaded again if they sit idle while memory runs short.
+inference_worker = InferenceClient(INFERENCE_WORKER_URL) if INFERENCE_WORKER_URL else None
+models = None if inference_worker else get_model_manager()
 
-@st.cache_resource
-def get_transcriber():
-    """Loads the audio transcription model (Whisper)."""
-    return pipeline("automatic-speech-recognition", model="openai/whisper-base")
+def transcribe_updates(path):
+    """Progress updates of a transcription, from the inference worker or the local engine."""
+    if inference_worker:
+        yield from inference_worker.transcribe_iter(path)
+        return
+    with models.use("transcriber") as transcriber:
+        yield from transcriber.transcribe_iter(path)
+
+def summary_updates(text, max_length, min_length):
+    """Progress updates of a summary, from the inference worker or the local batching service."""
+    if inference_worker:
+        yield from inference_worker.summarize_long(text, max_length=max_length, min_length=min_length)
+        return
+    with models.use("summarizer") as summarizer:
+        yield from summarizer.summarize_long(text, max_length=max_length, min_length=min_length)
+
+# Transcripts and summaries of inputs seen before (by any session) come from here
+result_cache = get_result_cache()
 
 # --- Google Services Connection ---
 @st.cache_resource
@@ -35,7 +53,7 @@ def get_creds():
 def upload_to_drive(file_path, file_name):
     """Uploads a file to the specified Google Drive folder."""
     creds = get_creds()
-    service = build('drive', 'v3', credentials=creds)
+    service = get_drive_service(creds)
     
     # !!! IMPORTANT !!! 
     # Replace this with your NEW Google Drive Folder ID.
@@ -53,6 +71,11 @@ st.set_page_config(page_title="FestFusion Telangana", page_icon="🏛️")
 st.title("🏛️ FestFusion Telangana")
 st.write("Share a story about a local festival from your village.")
 
+model_health = inference_worker.health() if inference_worker else models.health()
+if not model_health["ready"]:
+    loading = [name for name, info in model_health.get("models", {}).items() if info["state"] != "ready"] or ["inference worker"]
+    st.caption(f"⏳ AI models are warming up in the background ({', '.join(loading)}) - you can start writing meanwhile.")
+
 telangana_districts = ["Adilabad", "Bhadradri Kothagudem", "Hyderabad", "Jagtial", "Jangaon", "Jayashankar Bhupalpally", "Jogulamba Gadwal", "Kamareddy", "Karimnagar", "Khammam", "Kumuram Bheem Asifabad", "Mahabubabad", "Mahabubnagar", "Mancherial", "Medak", "Medchal-Malkajgiri", "Nagarkurnool", "Nalgonda", "Nirmal", "Nizamabad", "Peddapalli", "Rajanna Sircilla", "Rangareddy", "Sangareddy", "Siddipet", "Suryapet", "Vikarabad", "Wanaparthy", "Warangal", "Hanamkonda", "Yadadri Bhuvanagiri"]
 
 selected_district = st.selectbox("Select Your District:", options=sorted(telangana_districts))
@@ -74,25 +97,47 @@ if st.button("Generate Summary & Archive Story"):
             st.success("File successfully uploaded to archive!")
 
         if 'audio' in uploaded_file.type:
-            with st.spinner("AI is listening to the audio..."):
-                transcriber = get_transcriber()
-                transcription_result = transcriber(temp_filepath)
-                transcribed_text = transcription_result['text']
-                st.info("Transcription complete!")
+            transcript_key = cache_key(TRANSCRIPT, sha256_bytes(uploaded_file.getvalue()), TRANSCRIPTION_MODEL,
+                                       {"backend": INFERENCE_BACKEND})
+            transcribed_text = result_cache.get(transcript_key)
+            if transcribed_text is None:
+                with st.spinner("AI is listening to the audio..."):
+                    # Show the transcript growing as each stretch of speech is transcribed
+                    transcript_view = st.empty()
+                    for update in transcribe_updates(temp_filepath):
+                        transcribed_text = update['transcript']
+                        transcript_view.caption(transcribed_text)
+                result_cache.put(transcript_key, transcribed_text, TRANSCRIPT)
+            st.info("Transcription complete!")
         
         os.remove(temp_filepath)
 
     final_story = story_text + "\n" + transcribed_text
     
     if final_story.strip():
-        with st.spinner("Our AI is crafting a summary..."):
-            summarizer = get_summarizer()
-            summary = summarizer(final_story, max_length=150, min_length=30, do_sample=False)[0]['summary_text']
+        summary_params = {"max_length": 150, "min_length": 30, "do_sample": False, "backend": INFERENCE_BACKEND}
+        summary_key = cache_key(SUMMARY, text_digest(final_story), SUMMARIZATION_MODEL, summary_params)
+        summary = result_cache.get(summary_key)
+        if summary is None:
+            with st.spinner("Our AI is crafting a summary..."):
+                # Long stories and transcripts are summarised section by section; show each part as it lands
+                progress = st.empty()
+                partial_view = st.empty()
+                for update in summary_updates(final_story, max_length=150, min_length=30):
+                    if update["stage"] == "map":
+                        progress.progress(update["completed"] / update["total"],
+                                          text=f"Summarising part {update['completed']} of {update['total']}...")
+                        partial_view.markdown("\n\n".join(f"- {partial}" for partial in update["partials"]))
+                    else:
+                        summary = update["summary"]
+                progress.empty()
+                partial_view.empty()
+            result_cache.put(summary_key, summary, SUMMARY)
         st.success("Summary Generated!")
 
         with st.spinner("Archiving your story in our database..."):
             creds = get_creds()
-            client = gspread.authorize(creds)
+            client = get_sheets_client(creds)
             # !!! IMPORTANT !!! 
             # Replace this with the name of your NEW Google Sheet.
             spreadsheet = client.open("YOUR_NEW_GOOGLE_SHEET_NAME")
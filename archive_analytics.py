@@ -0,0 +1,363 @@
+"""
+Archive analytics for FestFusion
+Loads the district, festival, time and media columns of the submission index
+into NumPy arrays once, then appends only submissions added since the last
+refresh. Districts, festivals and media types are stored as integer codes, so
+counts, time series and breakdowns are single bincount/unique passes over the
+arrays, and each computed view is cached until the archive changes.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config import ANALYTICS_REFRESH_INTERVAL, ANALYTICS_UTC_OFFSET_HOURS, ANALYTICS_CACHE_SIZE
+from submission_index import get_submission_index
+
+MEDIA_TYPES = ("image", "audio", "video", "document", "story only")
+
+_MEDIA_BY_EXTENSION = {
+    "png": "image", "jpg": "image", "jpeg": "image",
+    "mp3": "audio", "wav": "audio",
+    "mp4": "video",
+    "txt": "document", "pdf": "document",
+}
+
+UNSPECIFIED_FESTIVAL = "(unspecified)"
+
+# Columns read from the submission index (never the story texts)
+SOURCE_COLUMNS = ["created_at", "district", "festival_name", "file_type", "original_filename"]
+
+FREQUENCIES = ("D", "W", "M")
+SECONDS_PER_DAY = 86400
+
+
+def media_type(file_type, filename=""):
+    """Media category of a submission from its MIME type, else its file extension"""
+    major = (file_type or "").split("/", 1)[0].lower()
+    if major in ("image", "audio", "video"):
+        return major
+    if major == "text" or file_type == "application/pdf":
+        return "document"
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    return _MEDIA_BY_EXTENSION.get(extension, "story only" if not filename else "document")
+
+
+class _Vocabulary:
+    """Label <-> integer code mapping; codes are assigned in first-seen order and never change"""
+
+    def __init__(self, normalize=None):
+        self.normalize = normalize
+        self.labels = []
+        self._codes = {}
+
+    def encode(self, values):
+        codes = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            key = self.normalize(value) if self.normalize else value
+            code = self._codes.get(key)
+            if code is None:
+                code = self._codes[key] = len(self.labels)
+                self.labels.append(value)
+            codes[i] = code
+        return codes
+
+    def code(self, value):
+        return self._codes.get(self.normalize(value) if self.normalize else value)
+
+    def __len__(self):
+        return len(self.labels)
+
+
+def _festival_key(name):
+    return " ".join(name.split()).casefold()
+
+
+class ArchiveAnalytics:
+    """
+    Incrementally maintained columnar view of the submission archive
+
+    Args:
+        source (SubmissionIndex, optional): Where submissions are read from
+        utc_offset_hours (float, optional): Time zone of the day/week/month buckets
+    """
+
+    def __init__(self, source=None, refresh_interval=ANALYTICS_REFRESH_INTERVAL,
+                 utc_offset_hours=ANALYTICS_UTC_OFFSET_HOURS, cache_size=ANALYTICS_CACHE_SIZE):
+        self._source = source if source is not None else get_submission_index()
+        self.refresh_interval = refresh_interval
+        self.utc_offset = utc_offset_hours * 3600
+        self.cache_size = cache_size
+
+        self._lock = threading.RLock()
+        self._last_refresh = 0.0
+        self._rowid = 0
+        self.districts = _Vocabulary()
+        self.festivals = _Vocabulary(_festival_key)
+        self.media_types = _Vocabulary()
+        self.media_types.encode(list(MEDIA_TYPES))
+
+        self._created = np.empty(0, dtype=np.float64)
+        self._day = np.empty(0, dtype=np.int32)
+        self._district = np.empty(0, dtype=np.int32)
+        self._festival = np.empty(0, dtype=np.int32)
+        self._media = np.empty(0, dtype=np.int32)
+        self._cache = OrderedDict()
+
+    @property
+    def version(self):
+        """Archive version: rowid of the newest loaded submission"""
+        return self._rowid
+
+    def __len__(self):
+        return len(self._created)
+
+    # --- Loading ---
+
+    def refresh(self, force=False):
+        """
+        Append submissions added since the last refresh (at most every refresh_interval)
+
+        Returns:
+            int: Number of submissions added
+        """
+        with self._lock:
+            now = time.time()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return 0
+            self._last_refresh = now
+
+            chunks = []
+            while True:
+                rows = self._source.columns_after(self._rowid, SOURCE_COLUMNS)
+                if not rows:
+                    break
+                rowids, created, districts, festivals, file_types, filenames = zip(*rows)
+                festivals = [" ".join((name or "").split()) or UNSPECIFIED_FESTIVAL for name in festivals]
+                chunks.append((
+                    np.asarray(created, dtype=np.float64),
+                    self.districts.encode(districts),
+                    self.festivals.encode(festivals),
+                    self.media_types.encode([media_type(t, f) for t, f in zip(file_types, filenames)]),
+                ))
+                self._rowid = rowids[-1]
+
+            if not chunks:
+                return 0
+            created, districts, festivals, media = (np.concatenate(parts) for parts in zip(*chunks))
+            self._created = np.concatenate([self._created, created])
+            self._day = np.concatenate([self._day, self._days(created)])
+            self._district = np.concatenate([self._district, districts])
+            self._festival = np.concatenate([self._festival, festivals])
+            self._media = np.concatenate([self._media, media])
+            self._cache.clear()
+            return len(created)
+
+    def _days(self, created):
+        return np.floor((created + self.utc_offset) / SECONDS_PER_DAY).astype(np.int32)
+
+    def frame(self):
+        """
+        The archive as a columnar DataFrame
+
+        Returns:
+            DataFrame: created_at (datetime), district, festival and media_type (categoricals)
+        """
+        return self._cached("frame", (), lambda: pd.DataFrame({
+            "created_at": pd.to_datetime(self._created + self.utc_offset, unit="s"),
+            "district": pd.Categorical.from_codes(self._district, self.districts.labels),
+            "festival": pd.Categorical.from_codes(self._festival, self.festivals.labels),
+            "media_type": pd.Categorical.from_codes(self._media, self.media_types.labels),
+        }))
+
+    # --- Queries ---
+
+    def _cached(self, name, params, compute):
+        # Computed under the lock, so a refresh can't swap the arrays halfway through; views take milliseconds
+        with self._lock:
+            key = (self._rowid, name, params)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            value = self._cache[key] = compute()
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return value
+
+    def _mask(self, district=None, festival=None, since=None, until=None):
+        """Boolean row filter, or None for every row"""
+        mask = None
+
+        def combine(condition):
+            return condition if mask is None else mask & condition
+
+        if district:
+            code = self.districts.code(district)
+            mask = combine(self._district == (code if code is not None else -1))
+        if festival:
+            code = self.festivals.code(" ".join(festival.split()))
+            mask = combine(self._festival == (code if code is not None else -1))
+        if since is not None:
+            mask = combine(self._created >= since)
+        if until is not None:
+            mask = combine(self._created < until)
+        return mask
+
+    def _column(self, column, mask):
+        return column if mask is None else column[mask]
+
+    def overview(self, **filters):
+        """
+        Headline numbers
+
+        Returns:
+            dict: submissions, districts, festivals, first and last (datetimes or None),
+                  last_7_days (submitted in the seven days before now)
+        """
+        def compute():
+            mask = self._mask(**filters)
+            created = self._column(self._created, mask)
+            if not len(created):
+                return {"submissions": 0, "districts": 0, "festivals": 0, "first": None, "last": None}, created
+            return {
+                "submissions": int(len(created)),
+                "districts": int(np.count_nonzero(np.bincount(self._column(self._district, mask)))),
+                "festivals": int(np.count_nonzero(np.bincount(self._column(self._festival, mask)))),
+                "first": pd.to_datetime(created.min() + self.utc_offset, unit="s"),
+                "last": pd.to_datetime(created.max() + self.utc_offset, unit="s"),
+            }, np.sort(created)
+        overview, created_sorted = self._cached("overview", tuple(sorted(filters.items())), compute)
+
+        # Depends on the current time, so it is counted on every call from the cached sorted times
+        week_ago = time.time() - 7 * SECONDS_PER_DAY
+        last_7_days = len(created_sorted) - np.searchsorted(created_sorted, week_ago, side="right")
+        return {**overview, "last_7_days": int(last_7_days)}
+
+    def district_counts(self, **filters):
+        """
+        Submissions per district, most first
+
+        Returns:
+            DataFrame: district, submissions, share
+        """
+        def compute():
+            codes = self._column(self._district, self._mask(**filters))
+            counts = np.bincount(codes, minlength=len(self.districts))
+            present = np.flatnonzero(counts)
+            order = present[np.argsort(-counts[present], kind="stable")]
+            return pd.DataFrame({
+                "district": [self.districts.labels[i] for i in order],
+                "submissions": counts[order],
+                "share": counts[order] / max(1, len(codes)),
+            })
+        return self._cached("districts", tuple(sorted(filters.items())), compute)
+
+    def festival_counts(self, limit=20, **filters):
+        """
+        The most submitted festivals and how many districts each was submitted from
+
+        Returns:
+            DataFrame: festival, submissions, districts
+        """
+        def compute():
+            mask = self._mask(**filters)
+            festivals = self._column(self._festival, mask)
+            counts = np.bincount(festivals, minlength=len(self.festivals))
+            # Distinct (festival, district) pairs, counted per festival
+            pairs = np.unique(festivals.astype(np.int64) * max(1, len(self.districts))
+                              + self._column(self._district, mask))
+            spread = np.bincount(pairs // max(1, len(self.districts)), minlength=len(self.festivals))
+            present = np.flatnonzero(counts)
+            order = present[np.argsort(-counts[present], kind="stable")][:limit]
+            return pd.DataFrame({
+                "festival": [self.festivals.labels[i] for i in order],
+                "submissions": counts[order],
+                "districts": spread[order],
+            })
+        return self._cached("festivals", (limit,) + tuple(sorted(filters.items())), compute)
+
+    def timeline(self, freq="D", **filters):
+        """
+        Submissions per day, week (from Monday) or month, with empty periods as zero
+
+        Args:
+            freq (str, optional): "D", "W" or "M"
+
+        Returns:
+            DataFrame: period (datetime of the period start), submissions
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"freq must be one of {', '.join(FREQUENCIES)}")
+
+        def compute():
+            days = self._column(self._day, self._mask(**filters))
+            if not len(days):
+                return pd.DataFrame({"period": pd.to_datetime([]), "submissions": np.empty(0, dtype=np.int64)})
+            if freq == "D":
+                buckets = days.astype(np.int64)
+            elif freq == "W":
+                buckets = (days.astype(np.int64) + 3) // 7  # 1970-01-01 was a Thursday
+            else:
+                buckets = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+            first = buckets.min()
+            counts = np.bincount(buckets - first)
+            periods = np.arange(first, first + len(counts))
+            if freq == "D":
+                starts = periods.astype("datetime64[D]")
+            elif freq == "W":
+                starts = (periods * 7 - 3).astype("datetime64[D]")
+            else:
+                starts = periods.astype("datetime64[M]").astype("datetime64[D]")
+            return pd.DataFrame({"period": pd.to_datetime(starts), "submissions": counts})
+        return self._cached("timeline", (freq,) + tuple(sorted(filters.items())), compute)
+
+    def media_breakdown(self, **filters):
+        """
+        Submissions per media type
+
+        Returns:
+            DataFrame: media_type, submissions, share
+        """
+        def compute():
+            codes = self._column(self._media, self._mask(**filters))
+            counts = np.bincount(codes, minlength=len(self.media_types))
+            return pd.DataFrame({
+                "media_type": self.media_types.labels,
+                "submissions": counts,
+                "share": counts / max(1, len(codes)),
+            })
+        return self._cached("media", tuple(sorted(filters.items())), compute)
+
+    def district_media(self, **filters):
+        """
+        District x media type table
+
+        Returns:
+            DataFrame: One row per district with submissions, one column per media type
+        """
+        def compute():
+            mask = self._mask(**filters)
+            width = len(self.media_types)
+            cells = self._column(self._district, mask).astype(np.int64) * width + self._column(self._media, mask)
+            table = np.bincount(cells, minlength=len(self.districts) * width).reshape(-1, width)
+            present = np.flatnonzero(table.sum(axis=1))
+            return pd.DataFrame(table[present], columns=self.media_types.labels,
+                                index=pd.Index([self.districts.labels[i] for i in present], name="district"))
+        return self._cached("district_media", tuple(sorted(filters.items())), compute)
+
+
+_default_analytics = None
+_default_analytics_lock = threading.Lock()
+
+
+def get_archive_analytics():
+    """Process-wide ArchiveAnalytics over the submission index"""
+    global _default_analytics
+    with _default_analytics_lock:
+        if _default_analytics is None:
+            _default_analytics = ArchiveAnalytics()
+        return _default_analytics
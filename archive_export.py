@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Parquet snapshot export of the FestFusion archive
+Writes the archive as compressed Parquet files partitioned by district and
+month, in the Hive layout that pyarrow, pandas, DuckDB and Spark read directly:
+
+    <ARCHIVE_EXPORT_DIR>/district=Warangal/month=2025-10/part-<ULID>.parquet
+
+Rows come from the local submission index, where save_to_sheets and
+save_story_locally record every submission before it is mirrored to Google
+Sheets, plus the uploads/story_*.json files written before the index existed.
+Sheets rows from before the index are brought into it once with
+sheets_backfill.py; the next export picks them up like any new submission,
+and the export itself never calls the Google APIs.
+
+Each export only reads submissions added since the previous one and adds new
+part files next to the existing ones, so nothing already exported is rewritten.
+
+Rows are snapshots: a Drive link filled in after a submission was exported is
+not in its row. Use --full to rebuild everything. Run one export at a time.
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+
+from config import (
+    ARCHIVE_EXPORT_DIR, ARCHIVE_EXPORT_COMPRESSION, ARCHIVE_EXPORT_BATCH_ROWS,
+    ARCHIVE_EXPORT_UTC_OFFSET_HOURS, UPLOAD_FOLDER
+)
+from submission_index import get_submission_index
+from upload_ids import new_ulid
+
+STATE_FILE = "_export_state.json"  # "_" prefix: skipped by Parquet dataset readers
+PART_PREFIX = "part-"
+
+# Columns stored in every part file; district and month live in the directory names
+EXPORT_COLUMNS = (
+    "submission_id", "created_at", "festival_name", "language", "original_filename", "saved_filename",
+    "file_type", "story_text", "english_summary", "telugu_summary", "google_drive_link",
+    "local_file_path", "sha256", "source", "extra_json",
+)
+
+# Partition value pyarrow reads back as null
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        raise RuntimeError("pyarrow is required for the archive export - pip install pyarrow") from None
+
+
+def export_schema():
+    """Arrow schema of the part files"""
+    pa = _require_pyarrow()
+    fields = [pa.field(name, pa.string()) for name in EXPORT_COLUMNS]
+    fields[1] = pa.field("created_at", pa.timestamp("ms", tz="UTC"))
+    return pa.schema(fields)
+
+
+def partition_month(created_at, utc_offset_hours=ARCHIVE_EXPORT_UTC_OFFSET_HOURS):
+    """'YYYY-MM' month partition of a Unix timestamp"""
+    return time.strftime("%Y-%m", time.gmtime(created_at + utc_offset_hours * 3600))
+
+
+def partition_dir(export_dir, district, month):
+    """Directory of one district/month partition (district is URI-encoded, as Hive partitioning expects)"""
+    district_value = quote(district, safe="") if district else NULL_PARTITION
+    return Path(export_dir) / f"district={district_value}" / f"month={month}"
+
+
+def _story_file_row(path):
+    """Export row of a uploads/story_*.json file written before the submission index existed"""
+    with open(path, "r", encoding="utf-8") as f:
+        story = json.load(f)
+    try:
+        created_at = datetime.fromisoformat(story["timestamp"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        created_at = os.path.getmtime(path)
+    extra = {key: story[key] for key in ("contact_email", "additional_notes") if story.get(key)}
+    local_file_path = story.get("local_file_path") or ""
+    return {
+        "submission_id": None,
+        "created_at": created_at,
+        "district": story.get("village") or "",
+        "festival_name": story.get("festival_name") or "",
+        "language": "",
+        "original_filename": "",
+        "saved_filename": os.path.basename(local_file_path),
+        "file_type": "",
+        "story_text": story.get("story_text") or "",
+        "english_summary": "",
+        "telugu_summary": "",
+        "google_drive_link": "",
+        "local_file_path": local_file_path,
+        "sha256": None,
+        "source": f"story_file:{os.path.basename(path)}",
+        "extra_json": json.dumps(extra, ensure_ascii=False) if extra else None,
+    }
+
+
+class ArchiveExporter:
+    """
+    Incremental district/month partitioned Parquet export
+
+    Args:
+        export_dir (Path, optional): Root of the Parquet dataset
+        index (SubmissionIndex, optional): Source of submissions
+        story_folder (Path, optional): Folder scanned for pre-index story_*.json files, or None to skip them
+    """
+
+    def __init__(self, export_dir=ARCHIVE_EXPORT_DIR, index=None, story_folder=UPLOAD_FOLDER,
+                 compression=ARCHIVE_EXPORT_COMPRESSION, batch_rows=ARCHIVE_EXPORT_BATCH_ROWS):
+        self.export_dir = Path(export_dir)
+        self.index = index if index is not None else get_submission_index()
+        self.story_folder = Path(story_folder) if story_folder else None
+        self.compression = compression
+        self.batch_rows = batch_rows
+        self.state_path = self.export_dir / STATE_FILE
+
+    # --- State ---
+
+    def load_state(self):
+        """
+        Progress of previous exports
+
+        Returns:
+            dict: rowid (last exported index rowid), story_files (exported file names),
+                  parts (IDs of committed part files), rows and exported_at
+        """
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"rowid": 0, "story_files": [], "parts": [], "rows": 0, "exported_at": None}
+
+    def _save_state(self, state):
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _part_files(self):
+        if not self.export_dir.exists():
+            return []
+        return list(self.export_dir.glob(f"district=*/month=*/{PART_PREFIX}*.parquet"))
+
+    def _clear(self):
+        """Delete the part files and state, leaving anything else in export_dir alone"""
+        for path in self._part_files():
+            path.unlink()
+        for directory in sorted(self.export_dir.glob("district=*/month=*")) + sorted(self.export_dir.glob("district=*")):
+            if directory.is_dir() and not any(directory.iterdir()):
+                directory.rmdir()
+        if self.state_path.exists():
+            self.state_path.unlink()
+
+    def _remove_uncommitted_parts(self, state):
+        """Delete part files of an export that stopped before recording them"""
+        committed = set(state["parts"])
+        removed = 0
+        for path in self._part_files():
+            if path.stem[len(PART_PREFIX):] not in committed:
+                path.unlink()
+                removed += 1
+        if removed:
+            print(f"Debug - Removed {removed} part files of an interrupted export")
+
+    # --- Writing ---
+
+    def _write_partitions(self, rows, part_id):
+        """Write one part file per district/month partition of the rows"""
+        pa = _require_pyarrow()
+        import pyarrow.parquet as pq
+
+        partitions = {}
+        for row in rows:
+            key = (row["district"], partition_month(row["created_at"]))
+            partitions.setdefault(key, []).append(row)
+
+        schema = export_schema()
+        for (district, month), partition_rows in partitions.items():
+            # Sorted by time, so row-group statistics let readers skip by created_at
+            partition_rows.sort(key=lambda row: row["created_at"])
+            columns = {name: [row[name] for row in partition_rows] for name in EXPORT_COLUMNS}
+            columns["created_at"] = [int(value * 1000) for value in columns["created_at"]]
+            table = pa.Table.from_pydict(columns, schema=schema)
+
+            directory = partition_dir(self.export_dir, district, month)
+            directory.mkdir(parents=True, exist_ok=True)
+            destination = directory / f"{PART_PREFIX}{part_id}.parquet"
+            tmp_path = directory / f".{destination.name}.tmp"
+            pq.write_table(table, tmp_path, compression=self.compression)
+            os.replace(tmp_path, destination)
+        return len(partitions)
+
+    def _commit(self, state, part_id, rows, **progress):
+        state["parts"].append(part_id)
+        state["rows"] += rows
+        state.update(progress)
+        self._save_state(state)
+
+    def _legacy_story_files(self, exported):
+        if self.story_folder is None or not self.story_folder.exists():
+            return []
+        pending = []
+        for path in sorted(self.story_folder.glob("story_*.json")):
+            if path.name in exported:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    if json.load(f).get("submission_id"):
+                        continue  # recorded in the submission index, exported from there
+            except (OSError, ValueError) as e:
+                print(f"Debug - Skipping unreadable story file {path}: {e}")
+                continue
+            pending.append(path)
+        return pending
+
+    def export(self, full=False):
+        """
+        Export submissions added since the previous export
+
+        Args:
+            full (bool, optional): Delete the existing export and rebuild it from the start
+
+        Returns:
+            dict: rows and part_files written by this export, partitions touched, total_rows
+        """
+        _require_pyarrow()
+        if full:
+            self._clear()
+        state = self.load_state()
+        self._remove_uncommitted_parts(state)
+
+        rows_written = 0
+        part_files = 0
+        touched = set()
+
+        while True:
+            batch = self.index.rows_after(state["rowid"], limit=self.batch_rows)
+            if not batch:
+                break
+            rows = []
+            for _, submission in batch:
+                row = {name: submission.get(name) for name in EXPORT_COLUMNS}
+                row["district"] = submission["district"]
+                row["extra_json"] = json.dumps(submission["extra"], ensure_ascii=False) if submission["extra"] else None
+                rows.append(row)
+                touched.add((row["district"], partition_month(row["created_at"])))
+            part_id = new_ulid()
+            part_files += self._write_partitions(rows, part_id)
+            rows_written += len(rows)
+            self._commit(state, part_id, len(rows), rowid=batch[-1][0])
+
+        story_files = self._legacy_story_files(set(state["story_files"]))
+        if story_files:
+            rows = []
+            names = []
+            for path in story_files:
+                try:
+                    rows.append(_story_file_row(path))
+                    names.append(path.name)
+                except (OSError, ValueError) as e:
+                    print(f"Debug - Skipping unreadable story file {path}: {e}")
+            for row in rows:
+                touched.add((row["district"], partition_month(row["created_at"])))
+            if rows:
+                part_id = new_ulid()
+                part_files += self._write_partitions(rows, part_id)
+                rows_written += len(rows)
+                self._commit(state, part_id, len(rows),
+                             story_files=state["story_files"] + names)
+
+        if rows_written:
+            state["exported_at"] = time.time()
+            self._save_state(state)
+        print(f"Debug - Archive export: {rows_written} rows in {part_files} part files "
+              f"({len(touched)} partitions), {state['rows']} rows total")
+        return {"rows": rows_written, "part_files": part_files, "partitions": len(touched),
+                "total_rows": state["rows"]}
+
+
+def open_archive(export_dir=ARCHIVE_EXPORT_DIR):
+    """
+    The export as a memory-mapped pyarrow dataset
+
+    Filters on district and month only open the matching partition folders, e.g.
+    open_archive().to_table(filter=pyarrow.dataset.field("district") == "Warangal").
+
+    Returns:
+        pyarrow.dataset.Dataset: Every part file, with district and month columns from the folder names
+    """
+    pa = _require_pyarrow()
+    import pyarrow.dataset as ds
+    from pyarrow.fs import LocalFileSystem
+
+    partitioning = ds.partitioning(pa.schema([("district", pa.string()), ("month", pa.string())]), flavor="hive")
+    return ds.dataset(str(export_dir), format="parquet", partitioning=partitioning,
+                      filesystem=LocalFileSystem(use_mmap=True))
+
+
+def load_archive(district=None, month=None, columns=None, export_dir=ARCHIVE_EXPORT_DIR):
+    """
+    Read (part of) the export into pandas
+
+    Args:
+        district (str, optional): Only this district
+        month (str, optional): Only this 'YYYY-MM' month
+        columns (list, optional): Columns to read (default: all)
+
+    Returns:
+        DataFrame: The matching submissions
+    """
+    import pyarrow.dataset as ds
+
+    dataset = open_archive(export_dir)
+    condition = None
+    for name, value in (("district", district), ("month", month)):
+        if value is not None:
+            clause = ds.field(name) == value
+            condition = clause if condition is None else condition & clause
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=str(ARCHIVE_EXPORT_DIR), help="Export directory")
+    parser.add_argument("--full", action="store_true", help="Delete the existing export and rebuild it")
+    parser.add_argument("--no-story-files", action="store_true", help="Skip pre-index uploads/story_*.json files")
+    parser.add_argument("--compression", default=ARCHIVE_EXPORT_COMPRESSION)
+    args = parser.parse_args()
+
+    exporter = ArchiveExporter(args.output, story_folder=None if args.no_story_files else UPLOAD_FOLDER,
+                               compression=args.compression)
+    result = exporter.export(full=args.full)
+    print(f"Exported {result['rows']} new submissions into {result['partitions']} partitions "
+          f"({result['total_rows']} in total) at {args.output}")
+
+
+if __name__ == "__main__":
+    main()
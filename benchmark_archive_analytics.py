@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: archive analytics over a large synthetic submission index
+Fills a temporary submission index, loads it into ArchiveAnalytics, then times
+an incremental refresh and the full set of dashboard views - cold (computed)
+and warm (cached). The target is a dashboard render under 200 ms at 300k rows.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from archive_analytics import ArchiveAnalytics
+from config import TELANGANA_DISTRICTS
+from submission_index import SubmissionIndex
+
+FESTIVALS = ["Bathukamma", "Bonalu", "Sammakka Saralamma", "Sankranti", "Ugadi",
+             "Dasara", "Diwali", "Peerla Panduga", "Medaram Jatara", "Ganesh Chaturthi", ""]
+
+FILES = [("image/jpeg", "photo.jpg"), ("audio/mpeg", "song.mp3"), ("video/mp4", "clip.mp4"),
+         ("application/pdf", "notes.pdf"), ("", "")]
+
+
+def fill_index(index, count, rng, start_time, start_id=0):
+    rows = []
+    for i in range(start_id, start_id + count):
+        file_type, filename = rng.choice(FILES)
+        rows.append((f"bench-{i}", start_time + rng.random() * 365 * 86400, rng.choice(TELANGANA_DISTRICTS),
+                     rng.choice(FESTIVALS), filename, file_type))
+    conn = index._connect()
+    try:
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO submissions (submission_id, created_at, district, festival_name, original_filename, file_type)"
+            " VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+def render_dashboard(analytics, **filters):
+    analytics.overview(**filters)
+    analytics.district_counts(**filters)
+    analytics.festival_counts(**filters)
+    analytics.timeline("W", **filters)
+    analytics.media_breakdown(**filters)
+    analytics.district_media(**filters)
+
+
+def time_renders(label, analytics, iterations, clear_cache, **filters):
+    samples = []
+    for _ in range(iterations):
+        if clear_cache:
+            analytics._cache.clear()
+        started = time.perf_counter()
+        render_dashboard(analytics, **filters)
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f"{label:<45} median {statistics.median(samples):8.2f} ms   max {max(samples):8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as folder:
+        index = SubmissionIndex(os.path.join(folder, "submissions.db"))
+        start_time = time.time() - 365 * 86400
+        started = time.perf_counter()
+        fill_index(index, args.rows, rng, start_time)
+        print(f"Generated {args.rows:,} submissions in {time.perf_counter() - started:.1f}s")
+        print("-" * 80)
+
+        analytics = ArchiveAnalytics(index, refresh_interval=0)
+        started = time.perf_counter()
+        analytics.refresh()
+        print(f"{'Initial load':<45} {time.perf_counter() - started:8.2f} s")
+
+        fill_index(index, 1000, rng, start_time, start_id=args.rows)
+        started = time.perf_counter()
+        added = analytics.refresh()
+        print(f"{f'Incremental refresh (+{added} rows)':<45} {(time.perf_counter() - started) * 1000:8.2f} ms")
+
+        time_renders("Dashboard, cold", analytics, args.iterations, clear_cache=True)
+        time_renders("Dashboard, cold, district filter", analytics, args.iterations, clear_cache=True,
+                     district="Warangal")
+        time_renders("Dashboard, warm (cached)", analytics, args.iterations, clear_cache=False)
+
+
+if __name__ == "__main__":
+    main()
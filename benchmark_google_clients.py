@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-call Google client setup vs the shared client factory
+Compares build('drive', 'v3') / gspread.authorize on every call with the
+cached clients from google_clients.py.
+
+Offline by default (client construction only). Pass a service account JSON
+with --credentials to also time a real Drive files().list round trip, where
+connection reuse shows up.
+"""
+
+import argparse
+import statistics
+import time
+
+import gspread
+from google.auth.credentials import AnonymousCredentials
+from google.oauth2.service_account import Credentials
+from googleapiclient.discovery import build
+
+from google_clients import get_drive_service, get_sheets_client
+
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive'
+]
+
+
+def time_calls(label, func, iterations):
+    """Run func repeatedly and print median / p95 latency in milliseconds"""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<45} median {statistics.median(samples):8.2f} ms   p95 {p95:8.2f} ms")
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--credentials", help="Service account JSON for live API calls")
+    args = parser.parse_args()
+
+    if args.credentials:
+        creds = Credentials.from_service_account_file(args.credentials, scopes=SCOPES)
+    else:
+        creds = AnonymousCredentials()
+
+    print(f"Client setup ({args.iterations} iterations)")
+    print("-" * 80)
+    before = time_calls("build('drive', 'v3') per call",
+                        lambda: build('drive', 'v3', credentials=creds), args.iterations)
+    after = time_calls("get_drive_service(creds)",
+                       lambda: get_drive_service(creds), args.iterations)
+    print(f"{'Drive speedup':<45} {before / after:8.1f}x")
+
+    before = time_calls("gspread.authorize per call",
+                        lambda: gspread.authorize(creds), args.iterations)
+    after = time_calls("get_sheets_client(creds)",
+                       lambda: get_sheets_client(creds), args.iterations)
+    print(f"{'Sheets speedup':<45} {before / after:8.1f}x")
+
+    if args.credentials:
+        print()
+        print(f"Live Drive files().list round trip ({args.iterations} iterations)")
+        print("-" * 80)
+        before = time_calls(
+            "build + list per call",
+            lambda: build('drive', 'v3', credentials=creds).files().list(pageSize=1).execute(),
+            args.iterations
+        )
+        after = time_calls(
+            "pooled service + list",
+            lambda: get_drive_service(creds).files().list(pageSize=1).execute(),
+            args.iterations
+        )
+        print(f"{'Round trip speedup':<45} {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
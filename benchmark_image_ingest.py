@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: storage saved by image normalisation on ingest
+Normalises a folder of photos (or synthetic 12 MP phone-style JPEGs) through
+ImageIngestor and reports bytes before/after and throughput.
+"""
+
+import argparse
+import io
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+from config import IMAGE_INGEST_MAX_SIDE, IMAGE_INGEST_WORKERS
+from image_ingest import ImageIngestor, ingest_format
+
+
+def make_photo(seed, width=4032, height=3024):
+    """Textured 12 MP JPEG at camera quality, with an EXIF orientation tag"""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    pixels = np.stack([(x / 16) % 256, (y / 12) % 256, ((x + y) / 20) % 256], axis=-1)
+    pixels += rng.normal(0, 6, pixels.shape)
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotated 90 degrees, as phones store portrait shots
+    output = io.BytesIO()
+    Image.fromarray(np.clip(pixels, 0, 255).astype("uint8")).save(output, format="JPEG", quality=95, exif=exif)
+    return output.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder", nargs="?", help="Folder of .jpg/.png photos (default: synthetic photos)")
+    parser.add_argument("--photos", type=int, default=8, help="Synthetic photos to generate")
+    parser.add_argument("--max-side", type=int, default=IMAGE_INGEST_MAX_SIDE)
+    parser.add_argument("--workers", type=int, default=IMAGE_INGEST_WORKERS)
+    args = parser.parse_args()
+
+    if args.folder:
+        names = sorted(name for name in os.listdir(args.folder) if ingest_format(name))
+        photos = []
+        for name in names:
+            with open(os.path.join(args.folder, name), "rb") as f:
+                photos.append((name, f.read()))
+    else:
+        print(f"Generating {args.photos} synthetic photos...")
+        photos = [(f"photo_{i}.jpg", make_photo(i)) for i in range(args.photos)]
+
+    ingestor = ImageIngestor(enabled=True, max_side=args.max_side, max_workers=args.workers)
+    ingestor.normalize_bytes(photos[0][1], photos[0][0])  # start the worker processes
+
+    print(f"{len(photos)} photos, max side {args.max_side}px, {args.workers} workers")
+    print("-" * 80)
+    before = ingestor.stats()
+    started = time.perf_counter()
+    for name, data in photos:
+        ingestor.normalize_bytes(data, name)
+    elapsed = time.perf_counter() - started
+    after = ingestor.stats()
+    ingestor.shutdown(wait=True)
+
+    original = after["original_bytes"] - before["original_bytes"]
+    stored = after["stored_bytes"] - before["stored_bytes"]
+    print(f"{'Original size':<45} {original / 1048576:10.1f} MB")
+    print(f"{'Stored size':<45} {stored / 1048576:10.1f} MB")
+    print(f"{'Reduction':<45} {original / max(1, stored):10.1f}x")
+    print(f"{'Throughput':<45} {len(photos) / elapsed:10.2f} photos/s")
+
+
+if __name__ == "__main__":
+    main()
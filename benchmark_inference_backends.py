@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: accuracy and latency of the inference backends
+Runs the summarizer (and, with --audio, the transcriber) on each backend in
+inference_backends.py. Outputs are compared with the full-precision pytorch
+backend: ROUGE-L F1 for summaries, word error rate for transcripts.
+
+Needs transformers and torch; the onnx backend also needs optimum[onnxruntime].
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmark_summarization import make_stories
+from inference_backends import BACKENDS, load_summarizer, load_transcriber
+
+
+def lcs_length(a, b):
+    """Longest common subsequence of two token lists"""
+    previous = [0] * (len(b) + 1)
+    for token in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(previous[j] + 1 if token == other else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+def rouge_l(candidate, reference):
+    """ROUGE-L F1 between two texts"""
+    candidate, reference = candidate.lower().split(), reference.lower().split()
+    if not candidate or not reference:
+        return 0.0
+    lcs = lcs_length(candidate, reference)
+    if lcs == 0:
+        return 0.0
+    precision, recall = lcs / len(candidate), lcs / len(reference)
+    return 2 * precision * recall / (precision + recall)
+
+
+def word_error_rate(hypothesis, reference):
+    """Word-level edit distance divided by the reference length"""
+    hypothesis, reference = hypothesis.lower().split(), reference.lower().split()
+    previous = list(range(len(reference) + 1))
+    for i, word in enumerate(hypothesis, start=1):
+        current = [i]
+        for j, other in enumerate(reference, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (word != other)))
+        previous = current
+    return previous[-1] / max(1, len(reference))
+
+
+def run_summaries(summarizer, stories):
+    latencies, outputs = [], []
+    for story in stories:
+        started = time.perf_counter()
+        outputs.append(summarizer(story, max_length=150, min_length=30, do_sample=False)[0]["summary_text"])
+        latencies.append((time.perf_counter() - started) * 1000)
+    return outputs, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--stories", type=int, default=16)
+    parser.add_argument("--audio", help="Also compare transcription on this audio file")
+    args = parser.parse_args()
+
+    backends = ["pytorch"] + [b for b in args.backends if b != "pytorch"]
+    stories = make_stories(args.stories, seed=11)
+
+    print(f"Summarization: {args.stories} stories")
+    print("-" * 80)
+    reference = None
+    for backend in backends:
+        started = time.perf_counter()
+        summarizer = load_summarizer(backend)
+        load_time = time.perf_counter() - started
+        summarizer(stories[0], max_length=150, min_length=30, do_sample=False)  # warm-up
+
+        outputs, latencies = run_summaries(summarizer, stories)
+        if reference is None:
+            reference = outputs
+        score = statistics.mean(rouge_l(o, r) for o, r in zip(outputs, reference))
+        print(f"{backend:<10} load {load_time:6.1f}s   median {statistics.median(latencies):8.1f} ms   "
+              f"ROUGE-L vs pytorch {score:5.3f}")
+        del summarizer
+
+    if args.audio:
+        print()
+        print(f"Transcription: {args.audio}")
+        print("-" * 80)
+        reference = None
+        for backend in backends:
+            transcriber = load_transcriber(backend)
+            started = time.perf_counter()
+            text = transcriber(args.audio, chunk_length_s=30)["text"]
+            elapsed = time.perf_counter() - started
+            if reference is None:
+                reference = text
+            print(f"{backend:<10} {elapsed:8.1f}s   WER vs pytorch {word_error_rate(text, reference):5.3f}")
+            del transcriber
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: story search latency over a large synthetic archive
+Builds a StorySearchIndex from generated English/Telugu festival stories and
+times BM25 queries with and without facet filters. The target is a median
+well under 50 ms at 100k stories.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from config import TELANGANA_DISTRICTS
+from story_search import StorySearchIndex
+
+FESTIVALS = ["Bathukamma", "Bonalu", "Sammakka Saralamma", "Sankranti", "Ugadi",
+             "Dasara", "Diwali", "Peerla Panduga", "Medaram Jatara", "Ganesh Chaturthi"]
+
+ENGLISH_WORDS = ("flowers women songs goddess temple procession village drums dance offerings "
+                 "harvest lamps rangoli sweets family river prayers night fair crowd colourful "
+                 "traditional celebrated community devotees decorated stacked circle evening").split()
+
+TELUGU_WORDS = ("పండుగ పూలు అమ్మవారు గుడి ఊరేగింపు గ్రామం డప్పులు నృత్యం నైవేద్యం పంట దీపాలు "
+                "ముగ్గులు మిఠాయిలు కుటుంబం నది ప్రార్థనలు రాత్రి జాతర భక్తులు బతుకమ్మ బోనాలు").split()
+
+QUERIES = [
+    "bathukamma flowers",
+    "bonalu goddess procession",
+    "temple drums night",
+    "బతుకమ్మ పూలు",
+    "జాతర భక్తులు",
+    "harvest sankranti rangoli",
+    "women songs circle",
+    "medaram jatara devotees",
+]
+
+
+def make_story(rng, index):
+    festival = rng.choice(FESTIVALS)
+    english = " ".join(rng.choices(ENGLISH_WORDS, k=rng.randint(30, 90)))
+    telugu = " ".join(rng.choices(TELUGU_WORDS, k=rng.randint(15, 45)))
+    return {
+        "submission_id": f"bench-{index}",
+        "district": rng.choice(TELANGANA_DISTRICTS),
+        "festival_name": festival,
+        "story_text": f"{festival} {english}",
+        "english_summary": english[:300],
+        "telugu_summary": telugu,
+    }
+
+
+def time_queries(label, search, queries, iterations, **filters):
+    samples = []
+    for _ in range(iterations):
+        for query in queries:
+            started = time.perf_counter()
+            search.search(query, **filters)
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<45} median {statistics.median(samples):8.2f} ms   p95 {p95:8.2f} ms")
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stories", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    search = StorySearchIndex()
+
+    started = time.perf_counter()
+    for i in range(args.stories):
+        search.add(make_story(rng, i))
+    build = time.perf_counter() - started
+    print(f"Indexed {len(search)} stories in {build:.1f}s ({len(search) / build:,.0f} stories/s)")
+
+    # First query per term materialises its numpy postings; time steady state
+    for query in QUERIES:
+        search.search(query)
+
+    print("-" * 80)
+    median = time_queries("BM25 top 10", search, QUERIES, args.iterations)
+    time_queries("BM25 top 10, district filter", search, QUERIES, args.iterations, district="Warangal")
+    time_queries("BM25 top 10, festival filter", search, QUERIES, args.iterations, festival_name="bathukamma")
+
+    started = time.perf_counter()
+    search.add(make_story(rng, args.stories))
+    search.search(QUERIES[0])
+    print(f"{'Add one story + first query':<45} {(time.perf_counter() - started) * 1000:8.2f} ms")
+
+    print("PASS" if median < 50 else "FAIL")
+
+
+if __name__ == "__main__":
+    main()
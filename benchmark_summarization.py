@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request summarization vs the batching service
+Summarizes the same set of festival stories twice - one pipeline call per story
+(the old app.py path) and through BatchSummarizer with concurrent callers -
+and reports throughput in stories per second.
+
+Needs transformers and torch; the model is downloaded on first run.
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import SUMMARIZATION_MODEL, SUMMARY_MAX_BATCH_SIZE, SUMMARY_BATCH_WAIT
+from summarization_service import BatchSummarizer
+
+SENTENCES = [
+    "Women gathered in the evening to arrange flowers into tall conical stacks for Bathukamma.",
+    "The whole village walked behind the decorated pot as drums played through the night.",
+    "Families cooked rice with jaggery and offered it to the goddess at the temple.",
+    "Young people danced in circles, clapping and singing songs passed down by their grandmothers.",
+    "At the end of the festival the flower stacks were floated gently on the village tank.",
+    "Devotees travelled from nearby districts and camped near the fairground for three days.",
+    "Children flew kites from every rooftop while elders drew rangoli patterns at each doorstep.",
+    "The priest led prayers for a good harvest and rain in the coming season.",
+]
+
+
+def make_stories(count, seed):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(SENTENCES, k=rng.randint(3, 14))) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stories", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16, help="Simultaneous callers for the batched run")
+    parser.add_argument("--batch-size", type=int, default=SUMMARY_MAX_BATCH_SIZE)
+    parser.add_argument("--wait", type=float, default=SUMMARY_BATCH_WAIT)
+    parser.add_argument("--model", default=SUMMARIZATION_MODEL)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    from transformers import pipeline
+
+    print(f"Loading {args.model}...")
+    summarizer = pipeline("summarization", model=args.model)
+    stories = make_stories(args.stories, args.seed)
+    summarizer(stories[0], max_length=150, min_length=30, do_sample=False)  # warm-up
+
+    print(f"{args.stories} stories, batch size {args.batch_size}, {args.concurrency} concurrent callers")
+    print("-" * 80)
+
+    started = time.perf_counter()
+    for story in stories:
+        summarizer(story, max_length=150, min_length=30, do_sample=False)
+    before = args.stories / (time.perf_counter() - started)
+    print(f"{'Per-request pipeline call':<45} {before:8.2f} stories/s")
+
+    service = BatchSummarizer(lambda: summarizer, max_batch_size=args.batch_size, max_wait=args.wait)
+    service.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(service.summarize, stories))
+    after = args.stories / (time.perf_counter() - started)
+    service.stop()
+
+    print(f"{'BatchSummarizer':<45} {after:8.2f} stories/s")
+    print(f"{'Average batch size':<45} {service.stats()['avg_batch_size']:8.2f}")
+    print(f"{'Speedup':<45} {after / before:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Telugu glossary translation of long stories
+Translates synthetic English festival stories with the compiled Aho-Corasick
+GlossaryMatcher and, for comparison, with one re.sub per glossary term and
+with a single regex alternation of all terms. Runs on the built-in glossary
+and on a large one padded with synthetic terms, as an external glossary file
+would be.
+"""
+
+import argparse
+import random
+import re
+import statistics
+import time
+
+from telugu_glossary import TELUGU_TRANSLATIONS, GlossaryMatcher, fold_term
+
+FILLER_WORDS = ("the village gathered near old banyan tree while drums played through evening "
+                "and everyone sang songs carrying pots lit lamps on river steps").split()
+
+
+def make_glossary(extra_terms, rng):
+    """Built-in terms plus synthetic one- to three-word terms"""
+    terms = dict(TELUGU_TRANSLATIONS)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    while len(terms) < len(TELUGU_TRANSLATIONS) + extra_terms:
+        words = ["".join(rng.choices(letters, k=rng.randint(4, 9))) for _ in range(rng.randint(1, 3))]
+        terms[" ".join(words)] = "పదం"
+    return terms
+
+
+def make_story(words, terms, rng):
+    """Story with roughly one glossary term for every three words"""
+    vocabulary = list(terms)
+    parts = []
+    while len(parts) < words:
+        if rng.random() < 0.3:
+            term = rng.choice(vocabulary)
+            parts.append(term.capitalize() if rng.random() < 0.2 else term)
+        else:
+            parts.append(rng.choice(FILLER_WORDS))
+        if rng.random() < 0.08:
+            parts[-1] += "."
+    return " ".join(parts)
+
+
+def per_term_resub(terms):
+    """One re.sub per term, longest first (the obvious loop over the dictionary)"""
+    patterns = [(re.compile(r"(?<!\w)" + re.escape(term) + r"(?!\w)", re.IGNORECASE), translation)
+                for term, translation in sorted(terms.items(), key=lambda item: len(item[0]), reverse=True)]
+
+    def translate(text):
+        for pattern, translation in patterns:
+            text = pattern.sub(translation, text)
+        return text
+    return translate
+
+
+def regex_alternation(terms):
+    """One regex alternation of every term, longest first"""
+    lookup = {fold_term(term): translation for term, translation in terms.items()}
+    alternatives = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    pattern = re.compile(r"(?<!\w)(?:" + alternatives + r")(?!\w)", re.IGNORECASE)
+    return lambda text: pattern.sub(lambda match: lookup[fold_term(match.group(0))], text)
+
+
+def time_translator(label, translate, stories, iterations):
+    samples = []
+    for _ in range(iterations):
+        for story in stories:
+            started = time.perf_counter()
+            translate(story)
+            samples.append(time.perf_counter() - started)
+    median = statistics.median(samples)
+    megabytes = statistics.mean(len(story.encode("utf-8")) for story in stories) / 1048576
+    print(f"{label:<45} {median * 1000:9.2f} ms {megabytes / median:9.2f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=20000, help="Words per story")
+    parser.add_argument("--stories", type=int, default=5)
+    parser.add_argument("--extra-terms", type=int, default=5000, help="Synthetic terms in the large glossary")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--skip-resub", action="store_true", help="Skip the slow per-term re.sub loop")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    for label, terms in (("built-in", dict(TELUGU_TRANSLATIONS)),
+                         (f"+{args.extra_terms} terms", make_glossary(args.extra_terms, rng))):
+        stories = [make_story(args.words, terms, rng) for _ in range(args.stories)]
+        started = time.perf_counter()
+        matcher = GlossaryMatcher(terms)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        print(f"\nGlossary {label}: {len(matcher)} terms, {args.stories} stories of {args.words} words")
+        print("-" * 80)
+        print(f"{'Aho-Corasick compile':<45} {compile_ms:9.2f} ms")
+        time_translator("Aho-Corasick (GlossaryMatcher)", matcher.translate, stories, args.iterations)
+        time_translator("Regex alternation", regex_alternation(terms), stories, args.iterations)
+        if not args.skip_resub:
+            time_translator("re.sub per term", per_term_resub(terms), stories[:1], 1)
+
+
+if __name__ == "__main__":
+    main()
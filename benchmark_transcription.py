@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: whole-file Whisper pipeline vs the streaming transcription engine
+Transcribes one recording both ways and reports the real-time factor
+(processing time / audio duration, lower is better) and time to first text.
+
+Needs ffmpeg, transformers and torch; the model is downloaded on first run.
+"""
+
+import argparse
+import time
+
+from config import TRANSCRIPTION_MODEL, TRANSCRIBE_WORKERS
+from transcription_engine import TranscriptionEngine, EnergyVAD, decode_audio_stream
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", help="Audio or video file to transcribe")
+    parser.add_argument("--workers", type=int, default=TRANSCRIBE_WORKERS)
+    parser.add_argument("--model", default=TRANSCRIPTION_MODEL)
+    parser.add_argument("--skip-baseline", action="store_true", help="Only time the streaming engine")
+    args = parser.parse_args()
+
+    duration = sum(len(chunk) for chunk in decode_audio_stream(args.audio)) / EnergyVAD().sample_rate
+    segments = sum(1 for _ in EnergyVAD().segments(decode_audio_stream(args.audio)))
+    print(f"{args.audio}: {duration:.1f}s of audio, {segments} speech segments")
+    print("-" * 80)
+
+    if not args.skip_baseline:
+        from transformers import pipeline
+
+        transcriber = pipeline("automatic-speech-recognition", model=args.model)
+        started = time.perf_counter()
+        # The old app.py path; chunk_length_s is needed for anything over 30 seconds
+        transcriber(args.audio, chunk_length_s=30)
+        elapsed = time.perf_counter() - started
+        print(f"{'Whole-file pipeline':<45} RTF {elapsed / duration:6.3f}   first text after {elapsed:7.1f}s")
+
+    engine = TranscriptionEngine(args.model, workers=args.workers)
+    # Load the model in every worker before timing
+    warm_up = [engine._get_pool().submit(time.sleep, 0) for _ in range(args.workers)]
+    for future in warm_up:
+        future.result()
+
+    started = time.perf_counter()
+    first_text = None
+    for update in engine.transcribe_iter(args.audio):
+        if first_text is None:
+            first_text = time.perf_counter() - started
+    elapsed = time.perf_counter() - started
+    engine.shutdown()
+    print(f"{f'Streaming engine ({args.workers} workers)':<45} RTF {elapsed / duration:6.3f}   "
+          f"first text after {first_text or elapsed:7.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent /upload requests never overwrite each other
+Fires many simultaneous uploads of the same original filename at the Flask API
+and checks every one landed in its own file with the bytes that were sent.
+It also counts how many uploads shared a wall-clock second - each of those
+would have collided under the old timestamp-only naming.
+
+Starts flask_api in-process on a free port unless --url points at a running server.
+In-process runs use a temporary upload folder and media store index, removed
+afterwards, so the real uploads/ and media_store.db are never touched.
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from werkzeug.serving import make_server
+
+import media_store
+from config import UPLOAD_INCOMING_FOLDER
+from media_store import MediaStore
+
+VILLAGE = "Hyderabad"
+# Not an image, so uploads skip image ingest and thumbnailing and only naming is timed
+FILENAME = "festival.txt"
+CONTENT_TYPE = "text/plain"
+
+
+def start_local_server(upload_folder):
+    """Run flask_api.app on an ephemeral port in a background thread, saving into upload_folder"""
+    import flask_api
+
+    # Same disk as the real uploads so ULID placement and blob adoption still use hard links
+    flask_api.UPLOAD_FOLDER = upload_folder
+    media_store._default_store = MediaStore(upload_folder / ".blobs", upload_folder / "media_store.db")
+
+    server = make_server("127.0.0.1", 0, flask_api.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def upload_one(session_factory, url, index, size):
+    payload = os.urandom(size)
+    started = time.perf_counter()
+    response = session_factory().post(
+        f"{url}/upload",
+        data={"village": VILLAGE},
+        files={"file": (FILENAME, payload, CONTENT_TYPE)},
+        timeout=60
+    )
+    elapsed = time.perf_counter() - started
+    response.raise_for_status()
+    data = response.json()["data"]
+    return {
+        "index": index,
+        "second": int(time.time()),
+        "saved_filename": data["saved_filename"],
+        "sha256": hashlib.sha256(payload).hexdigest(),
+        "reported_sha256": data["sha256"],
+        "elapsed": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--size", type=int, default=4096, help="Bytes per uploaded file")
+    parser.add_argument("--url", help="Base URL of a running API (default: start one in-process)")
+    args = parser.parse_args()
+
+    server = None
+    upload_folder = None
+    url = args.url
+    if url is None:
+        upload_folder = Path(tempfile.mkdtemp(prefix="benchmark-", dir=UPLOAD_INCOMING_FOLDER))
+        server, url = start_local_server(upload_folder)
+
+    local = threading.local()
+
+    def session_factory():
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    print(f"{args.uploads} uploads of '{FILENAME}' ({args.size} bytes each), {args.concurrency} concurrent -> {url}")
+    print("-" * 80)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda i: upload_one(session_factory, url, i, args.size), range(args.uploads)))
+    wall = time.perf_counter() - started
+
+    names = Counter(r["saved_filename"] for r in results)
+    duplicates = sum(count - 1 for count in names.values() if count > 1)
+    hash_mismatches = sum(1 for r in results if r["sha256"] != r["reported_sha256"])
+    shared_second = sum(count for count in Counter(r["second"] for r in results).values() if count > 1)
+
+    content_errors = 0
+    if server is not None:
+        for r in results:
+            path = upload_folder / VILLAGE / r["saved_filename"]
+            with open(path, "rb") as f:
+                if hashlib.sha256(f.read()).hexdigest() != r["sha256"]:
+                    content_errors += 1
+
+    latencies = sorted(r["elapsed"] * 1000 for r in results)
+    print(f"{'Throughput':<45} {len(results) / wall:8.1f} uploads/s")
+    print(f"{'Median latency':<45} {latencies[len(latencies) // 2]:8.2f} ms")
+    print(f"{'p95 latency':<45} {latencies[int(len(latencies) * 0.95) - 1]:8.2f} ms")
+    print(f"{'Uploads sharing a second (old scheme clashes)':<45} {shared_second:8d}")
+    print(f"{'Duplicate saved filenames':<45} {duplicates:8d}")
+    print(f"{'Server hash mismatches':<45} {hash_mismatches:8d}")
+    if server is not None:
+        print(f"{'Files on disk with wrong content':<45} {content_errors:8d}")
+
+        server.shutdown()
+        shutil.rmtree(upload_folder, ignore_errors=True)
+
+    ok = duplicates == 0 and hash_mismatches == 0 and content_errors == 0
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
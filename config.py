@@ -4,15 +4,64 @@ from pathlib import Path
 # Base directory
 BASE_DIR = Path(__file__).parent
 
+# Local state directory (queues, caches, indexes)
+DATA_DIR = BASE_DIR / "data"
+
 # Flask API Configuration
 FLASK_HOST = "0.0.0.0"
 FLASK_PORT = 5000
 FLASK_DEBUG = True
 
+# Production server (serve.py) - gunicorn with threaded workers
+# gthread workers get their concurrency from threads, so one worker per CPU is enough;
+# every worker also runs its own derivative threads and (with IMAGE_INGEST) ingest processes
+SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', os.cpu_count() or 1))
+SERVER_THREADS = int(os.getenv('SERVER_THREADS', 8))  # concurrent requests per worker
+SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 300))  # seconds before a stuck worker is restarted
+SERVER_KEEPALIVE = int(os.getenv('SERVER_KEEPALIVE', 5))  # seconds to hold idle connections open
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 120))  # drain time after SIGTERM
+SERVER_MAX_REQUESTS = int(os.getenv('SERVER_MAX_REQUESTS', 2000))  # recycle a worker after this many requests
+SERVER_MAX_REQUESTS_JITTER = int(os.getenv('SERVER_MAX_REQUESTS_JITTER', 200))  # so workers don't recycle together
+
 # File Upload Configuration
 UPLOAD_FOLDER = BASE_DIR / "uploads"
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'mp3', 'wav', 'mp4', 'txt', 'pdf'}
-MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+# Uploads are streamed to disk, so these limits don't cost memory
+MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 2 * 1024 * 1024 * 1024))  # 2GB max request size
+MAX_UPLOAD_FILE_SIZE = int(os.getenv('MAX_UPLOAD_FILE_SIZE', MAX_CONTENT_LENGTH))  # per-file limit
+UPLOAD_INCOMING_FOLDER = UPLOAD_FOLDER / ".incoming"  # partial uploads, same disk as UPLOAD_FOLDER
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB copy buffer
+
+# Content-addressed Media Store Configuration
+BLOB_STORE_FOLDER = UPLOAD_FOLDER / ".blobs"  # one copy per SHA-256, same disk as UPLOAD_FOLDER
+MEDIA_STORE_DB = DATA_DIR / "media_store.db"
+
+# Media Serving Configuration (/uploads/<filename>)
+MEDIA_CACHE_MAX_BYTES = 64 * 1024 * 1024  # in-memory LRU for small, frequently viewed files
+MEDIA_CACHE_MAX_FILE_SIZE = 512 * 1024  # larger files are streamed from disk (sendfile)
+MEDIA_MAX_AGE = 24 * 60 * 60  # saved names are unique and never rewritten, so browsers may cache
+
+# Image Ingest Configuration (opt-in: phone photos are normalised before they are stored or sent to Drive)
+IMAGE_INGEST_ENABLED = os.getenv('IMAGE_INGEST', 'false').lower() == 'true'  # lossy; off keeps originals byte for byte
+IMAGE_INGEST_MAX_SIDE = int(os.getenv('IMAGE_INGEST_MAX_SIDE', 2560))  # archival resolution, longest side in pixels
+IMAGE_INGEST_JPEG_QUALITY = 85
+# Per server worker (pools aren't shared); defaults to that worker's share of half the CPUs, at least 1
+IMAGE_INGEST_WORKERS = int(os.getenv('IMAGE_INGEST_WORKERS', max(1, (os.cpu_count() or 1) // (2 * SERVER_WORKERS))))
+IMAGE_INGEST_TIMEOUT = 60  # seconds before an upload is stored unchanged instead
+
+# Media Derivatives Configuration (thumbnails / poster frames next to the originals)
+DERIVATIVE_FOLDER_NAME = ".derivatives"  # created inside each village folder
+DERIVATIVE_SIZES = {"thumb": 320, "preview": 1280}  # longest side in pixels; never upscaled
+DERIVATIVE_FORMAT = os.getenv('DERIVATIVE_FORMAT', 'webp').lower()  # "webp" or "jpeg"
+DERIVATIVE_QUALITY = 80
+DERIVATIVE_WORKERS = int(os.getenv('DERIVATIVE_WORKERS', 2))  # background threads per process
+DERIVATIVE_WAIT = 10  # seconds a request waits for a derivative that isn't generated yet
+VIDEO_POSTER_SECOND = 1.0  # poster frame position; earlier frames are often black
+
+# Resumable Upload Configuration
+RESUMABLE_UPLOAD_FOLDER = UPLOAD_FOLDER / ".resumable"
+RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024  # suggested chunk size for clients
+RESUMABLE_SESSION_TTL = 7 * 24 * 60 * 60  # abandoned sessions are removed after a week
 
 # Google Services Configuration
 import os
@@ -20,11 +69,99 @@ BASE_DIR = Path(__file__).parent
 GOOGLE_CREDENTIALS_FILE = BASE_DIR / "festfusion-project-cc628988dd80.json"
 GOOGLE_DRIVE_FOLDER_ID = "1DBeE3IW9h3i4m67OXS7nZ2iVO0zXXk0Q"  # FestFusion Uploads folder
 GOOGLE_SHEET_NAME = "FestFusion Data"  # Google Sheet name
+DRIVE_FOLDER_CACHE_FILE = DATA_DIR / "drive_folders.json"
+DRIVE_FOLDER_CACHE_TTL = 24 * 60 * 60  # re-check cached folder IDs once a day
+DISCOVERY_CACHE_DIR = DATA_DIR / "discovery_cache"
+GOOGLE_HTTP_POOL_SIZE = 10  # keep-alive connections per credentials
+GOOGLE_HTTP_TIMEOUT = 60  # seconds
+
+# Google Sheets Archiver Configuration
+SHEETS_QUEUE_DB = DATA_DIR / "sheets_queue.db"
+SHEETS_FLUSH_BATCH_SIZE = 50  # rows per append_rows call
+SHEETS_FLUSH_INTERVAL = 5  # seconds before a partial batch is flushed
+SHEETS_MAX_RETRIES = 8  # attempts before a non-quota failure is parked
+SHEETS_BACKOFF_BASE = 1.0  # seconds
+SHEETS_BACKOFF_MAX = 64.0  # seconds
+SHEETS_HEADER_CACHE_FILE = DATA_DIR / "sheets_header_cache.json"
+
+# Submission Index Configuration (local source of truth, Sheets is a mirror)
+SUBMISSIONS_DB = DATA_DIR / "submissions.db"
+
+# Story Search Configuration (in-memory BM25 index over the submission index)
+SEARCH_BM25_K1 = 1.2  # term-frequency saturation
+SEARCH_BM25_B = 0.75  # document-length normalisation
+SEARCH_REFRESH_INTERVAL = 2  # seconds between checks for new submissions
+
+# Archive Analytics Configuration (dashboard over the submission index)
+ANALYTICS_REFRESH_INTERVAL = 5  # seconds between checks for new submissions
+ANALYTICS_UTC_OFFSET_HOURS = 5.5  # day/week/month buckets follow IST
+ANALYTICS_CACHE_SIZE = 64  # computed views kept per archive version
+
+# Archive Export Configuration (partitioned Parquet snapshots for research, needs pyarrow)
+ARCHIVE_EXPORT_DIR = Path(os.getenv("ARCHIVE_EXPORT_DIR", str(DATA_DIR / "archive_parquet")))
+ARCHIVE_EXPORT_COMPRESSION = "zstd"  # or "snappy", "gzip"
+ARCHIVE_EXPORT_BATCH_ROWS = 50000  # submissions read from the index per batch (one file per partition each)
+ARCHIVE_EXPORT_UTC_OFFSET_HOURS = 5.5  # month partitions follow IST
+
+# Telugu Glossary Configuration (telugu_glossary.py - built-in terms plus an optional, hot-reloaded file)
+TELUGU_GLOSSARY_FILE = Path(os.getenv("TELUGU_GLOSSARY_FILE", str(DATA_DIR / "telugu_glossary.json")))  # .json, .csv or tab-separated
+TELUGU_GLOSSARY_CHECK_INTERVAL = 2  # seconds between checks of the file for changes
+
+# Background Upload Pipeline Configuration
+UPLOAD_JOBS_DB = DATA_DIR / "upload_jobs.db"
+UPLOAD_JOB_WORKERS = 4  # concurrent Drive uploads / archive jobs per process
+UPLOAD_JOB_LEASE_SECONDS = 60  # unfinished jobs of a process that stops renewing this are resumed elsewhere
+UPLOAD_JOB_DRIVE_WAIT = 900  # seconds a Sheets archive job waits for its Drive upload before archiving without a link
 
 # AI Model Configuration
 SUMMARIZATION_MODEL = "sshleifer/distilbart-cnn-12-6"
 TRANSCRIPTION_MODEL = "openai/whisper-base"
 
+# Inference Backend Configuration: "pytorch" (full precision), "int8" (dynamic quantization) or "onnx"
+INFERENCE_BACKEND = os.getenv('INFERENCE_BACKEND', 'pytorch').lower()
+MODEL_CACHE_DIR = DATA_DIR / "model_cache"  # exported ONNX models
+
+# Model Lifecycle Configuration (model_manager.py)
+MODEL_PRELOAD = os.getenv('MODEL_PRELOAD', 'true').lower() == 'true'  # load models in the background at startup
+MODEL_IDLE_SECONDS = int(os.getenv('MODEL_IDLE_SECONDS', 15 * 60))  # unused this long = may be evicted
+MODEL_MIN_AVAILABLE_MEMORY = float(os.getenv('MODEL_MIN_AVAILABLE_MEMORY', 0.15))  # evict below this share of RAM free
+MODEL_EVICTION_CHECK_INTERVAL = 30  # seconds between memory checks
+
+# Result Cache Configuration (transcripts and summaries keyed by input hash + model + parameters)
+RESULT_CACHE_DB = DATA_DIR / "result_cache.db"
+RESULT_CACHE_MAX_BYTES = int(os.getenv('RESULT_CACHE_MAX_BYTES', 256 * 1024 * 1024))  # least recently used go first
+
+# Inference Worker Configuration (inference_worker.py - one process owns the models for all front ends)
+INFERENCE_WORKER_HOST = "127.0.0.1"
+INFERENCE_WORKER_PORT = int(os.getenv('INFERENCE_WORKER_PORT', 5100))
+INFERENCE_WORKER_URL = os.getenv('INFERENCE_WORKER_URL', '')  # e.g. http://127.0.0.1:5100; empty = models in-process
+INFERENCE_MAX_PENDING_SUMMARIES = int(os.getenv('INFERENCE_MAX_PENDING_SUMMARIES', 64))  # more are refused with 503
+INFERENCE_MAX_PENDING_TRANSCRIPTIONS = int(os.getenv('INFERENCE_MAX_PENDING_TRANSCRIPTIONS', 8))
+INFERENCE_SUMMARY_TIMEOUT = 120  # seconds per request
+INFERENCE_TRANSCRIBE_TIMEOUT = 30 * 60
+INFERENCE_RETRY_AFTER = 5  # seconds clients are told to wait when the queue is full
+
+# Summarization Service Configuration (micro-batching in front of the pipeline)
+SUMMARY_MAX_BATCH_SIZE = int(os.getenv('SUMMARY_MAX_BATCH_SIZE', 8))  # stories per forward pass
+SUMMARY_BATCH_WAIT = float(os.getenv('SUMMARY_BATCH_WAIT', 0.05))  # seconds to wait for a batch to fill
+SUMMARY_MAX_LENGTH = 150  # generated tokens
+SUMMARY_MIN_LENGTH = 30
+# Long stories/transcripts are summarised window by window, then the partial summaries are summarised
+SUMMARY_WINDOW_TOKENS = 900  # distilbart reads at most 1024 tokens
+SUMMARY_WINDOW_OVERLAP = 100  # tokens of context repeated from the previous window
+SUMMARY_PARTIAL_MAX_LENGTH = 120
+SUMMARY_PARTIAL_MIN_LENGTH = 20
+
+# Transcription Engine Configuration (streamed decode, VAD segmentation, parallel Whisper)
+TRANSCRIBE_SAMPLE_RATE = 16000  # Whisper's input rate
+TRANSCRIBE_WORKERS = int(os.getenv('TRANSCRIBE_WORKERS', max(1, (os.cpu_count() or 1) // 2)))
+VAD_FRAME_MS = 30
+VAD_MIN_ENERGY_DB = -45  # frames quieter than this are always silence (dBFS)
+VAD_NOISE_MARGIN_DB = 10  # speech must be this far above the running noise floor
+VAD_MIN_SILENCE = 0.5  # seconds of silence that count as a pause
+VAD_MIN_SEGMENT = 5  # seconds; shorter speech is joined with the next part
+VAD_MAX_SEGMENT = 28  # seconds; Whisper reads 30-second windows
+
 # Telangana Districts
 TELANGANA_DISTRICTS = [
     "Adilabad", "Bhadradri Kothagudem", "Hyderabad", "Jagtial", "Jangaon", 
@@ -38,6 +175,7 @@ TELANGANA_DISTRICTS = [
 
 # Create necessary directories
 UPLOAD_FOLDER.mkdir(exist_ok=True)
+DATA_DIR.mkdir(exist_ok=True)
 
 # Environment variables (for production)
 def get_env_var(key, default=None):
@@ -0,0 +1,164 @@
+"""
+Drive folder registry for FestFusion
+Resolves per-district upload folders to Drive folder IDs once, caches them
+on disk with a TTL and makes sure concurrent uploads never create duplicates.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import DRIVE_FOLDER_CACHE_FILE, DRIVE_FOLDER_CACHE_TTL
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+
+def district_folder_name(village):
+    """Drive folder name used for a district's uploads"""
+    return f"FestFusion_Uploads/{village}"
+
+
+class DriveFolderRegistry:
+    """
+    Persistent district -> Drive folder ID cache with single-flight resolution
+
+    Args:
+        cache_path (Path, optional): JSON file the folder IDs are persisted to
+        ttl (float, optional): Seconds before a cached folder ID is re-checked
+    """
+
+    def __init__(self, cache_path=DRIVE_FOLDER_CACHE_FILE, ttl=DRIVE_FOLDER_CACHE_TTL):
+        self.cache_path = str(cache_path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._entries = self._load()
+
+    # --- Persistence ---
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _refresh_from_disk(self):
+        """Merge entries written by other processes, keeping the newest of each"""
+        with self._lock:
+            for folder_name, entry in self._load().items():
+                current = self._entries.get(folder_name)
+                if current is None or entry["resolved_at"] > current["resolved_at"]:
+                    self._entries[folder_name] = entry
+
+    def _cached(self, folder_name):
+        with self._lock:
+            entry = self._entries.get(folder_name)
+            if entry and time.time() - entry["resolved_at"] < self.ttl:
+                return entry["folder_id"]
+            return None
+
+    def _store(self, folder_name, folder_id):
+        self._refresh_from_disk()
+        with self._lock:
+            self._entries[folder_name] = {"folder_id": folder_id, "resolved_at": time.time()}
+            self._save()
+
+    def invalidate(self, village=None):
+        """Drop one district's cached folder ID, or all of them"""
+        with self._lock:
+            if village is None:
+                self._entries = {}
+            else:
+                self._entries.pop(district_folder_name(village), None)
+            self._save()
+
+    # --- Single-flight locking ---
+
+    @contextmanager
+    def _single_flight(self, folder_name):
+        """Serialise resolution of one folder across threads and, where possible, processes"""
+        with self._lock:
+            name_lock = self._inflight.setdefault(folder_name, threading.Lock())
+
+        with name_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.cache_path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # --- Resolution ---
+
+    def resolve(self, drive_service, village):
+        """
+        Return the Drive folder ID for a district, creating the folder if needed
+
+        Args:
+            drive_service: Drive v3 service object
+            village (str): District name
+
+        Returns:
+            str: Drive folder ID
+        """
+        folder_name = district_folder_name(village)
+        folder_id = self._cached(folder_name)
+        if folder_id:
+            return folder_id
+
+        with self._single_flight(folder_name):
+            # Another thread or process may have resolved it while we waited
+            self._refresh_from_disk()
+            folder_id = self._cached(folder_name)
+            if folder_id:
+                return folder_id
+
+            escaped_name = folder_name.replace("\\", "\\\\").replace("'", "\\'")
+            folder_query = f"name='{escaped_name}' and mimeType='{FOLDER_MIME_TYPE}' and trashed=false"
+            folder_results = drive_service.files().list(
+                q=folder_query,
+                orderBy="createdTime",
+                fields="files(id)"
+            ).execute()
+
+            if folder_results.get('files'):
+                # Oldest first, so every process converges on the same folder
+                folder_id = folder_results['files'][0]['id']
+            else:
+                folder_metadata = {'name': folder_name, 'mimeType': FOLDER_MIME_TYPE}
+                folder = drive_service.files().create(body=folder_metadata, fields='id').execute()
+                folder_id = folder['id']
+                print(f"Debug - Created Drive folder {folder_name}: {folder_id}")
+
+            self._store(folder_name, folder_id)
+            return folder_id
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_folder_registry():
+    """Process-wide DriveFolderRegistry backed by DRIVE_FOLDER_CACHE_FILE"""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = DriveFolderRegistry()
+        return _default_registry
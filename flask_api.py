@@ -1,17 +1,46 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
+import time
 from datetime import datetime
 import json
 from config import *
+from streaming_upload import StreamingUploadRequest, HashingSpoolFile, store_upload
+from resumable_uploads import ResumableUploadStore, UploadSessionError
+from media_store import get_media_store
+from upload_ids import place_exclusive, move_exclusive
+from image_ingest import get_image_ingestor
+from media_serving import MediaLibrary
+from media_derivatives import get_derivative_generator, media_kind
+from submission_index import get_submission_index
+from story_search import get_story_search
 
 app = Flask(__name__)
+app.request_class = StreamingUploadRequest  # stream file parts to disk instead of memory
 CORS(app)  # Enable CORS for all routes
 
 # Set maximum content length
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 
+# Resumable upload sessions (state survives restarts)
+resumable_store = ResumableUploadStore()
+resumable_store.cleanup_expired()
+
+# Saved-name index and hot-file cache for /uploads/<filename>
+media_library = MediaLibrary()
+
+# Thumbnails and poster frames, generated in the background after each upload
+derivatives = get_derivative_generator()
+
+def queue_derivatives(file_path, saved_filename):
+    """Start thumbnail generation for an image/video upload and return its URL, or None"""
+    if media_kind(saved_filename) is None:
+        return None
+    derivatives.submit(file_path)
+    return f"/uploads/{saved_filename}/thumbnail"
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -24,15 +53,34 @@ def save_file_locally(file, village):
         village_folder = UPLOAD_FOLDER / village
         village_folder.mkdir(parents=True, exist_ok=True)
         
-        # Generate unique filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         original_filename = secure_filename(file.filename)
-        file_extension = os.path.splitext(original_filename)[1]
-        saved_filename = f"{timestamp}_{original_filename}"
         
-        # Save file to village folder
-        file_path = village_folder / saved_filename
-        file.save(str(file_path))
+        # Phone photos are downscaled and recompressed (in the ingest process pool) before they are stored
+        ingest = None
+        if isinstance(file.stream, HashingSpoolFile):
+            file.stream.flush()
+            ingest = get_image_ingestor().normalize_file(file.stream.path, original_filename)
+        
+        def place(path):
+            if ingest and ingest["path"]:
+                move_exclusive(ingest["path"], str(path))
+                return ingest["stored_bytes"], ingest["sha256"]
+            return store_upload(file, path)
+        
+        # Move the streamed upload into the village folder under a new ULID name (hashed while it arrived)
+        try:
+            file_path, (file_size, sha256) = place_exclusive(
+                village_folder,
+                lambda ulid: f"{ulid}_{original_filename}",
+                place
+            )
+        finally:
+            if ingest and ingest["path"] and os.path.exists(ingest["path"]):
+                os.remove(ingest["path"])
+        saved_filename = file_path.name
+        
+        # Share storage with an identical earlier upload, if there is one
+        duplicate = get_media_store().adopt(file_path, sha256)
         
         return {
             "success": True,
@@ -40,7 +88,10 @@ def save_file_locally(file, village):
             "file_path": str(file_path),
             "original_filename": original_filename,
             "file_type": file.content_type,
-            "file_size": os.path.getsize(file_path)
+            "file_size": file_size,
+            "sha256": sha256,
+            "duplicate": duplicate,
+            "ingest": {key: ingest[key] for key in ("original_bytes", "stored_bytes", "saved_bytes")} if ingest else None
         }
     except Exception as e:
         print(f"Error saving file: {e}")
@@ -53,7 +104,14 @@ def home():
         "message": "FestFusion API is running",
         "endpoints": {
             "/upload": "POST - Upload files and generate summaries",
+            "/upload/resumable": "POST - Start a resumable chunked upload",
+            "/upload/resumable/<upload_id>": "GET - Upload status / PUT - Upload a chunk at ?offset=N",
+            "/upload/resumable/<upload_id>/finalize": "POST - Assemble a completed resumable upload",
+            "/uploads/<filename>": "GET - Download or stream a saved file (Range requests supported)",
+            "/uploads/<filename>/thumbnail": "GET - Resized image or video poster frame (?size=thumb|preview)",
             "/villages": "GET - Get list of Telangana districts",
+            "/search": "GET - Search stories and summaries (?q=&district=&festival=&limit=&offset=)",
+            "/submissions": "GET - List submissions (?district=&festival=&since=&until=&limit=&offset=)",
             "/health": "GET - Health check"
         }
     })
@@ -68,6 +126,55 @@ def get_villages():
     """Get list of Telangana districts"""
     return jsonify({"villages": sorted(TELANGANA_DISTRICTS)})
 
+@app.route('/submissions')
+def list_submissions():
+    """List archived submissions from the local index, newest first"""
+    try:
+        # Negative values would reach SQLite, where LIMIT -1 means no limit
+        limit = max(1, min(int(request.args.get('limit', 50)), 500))
+        offset = max(0, int(request.args.get('offset', 0)))
+        since = float(request.args['since']) if 'since' in request.args else None
+        until = float(request.args['until']) if 'until' in request.args else None
+    except ValueError:
+        return jsonify({"error": "limit, offset, since and until must be numbers"}), 400
+    
+    filters = {
+        "district": request.args.get('district'),
+        "festival_name": request.args.get('festival'),
+        "since": since,
+        "until": until,
+    }
+    index = get_submission_index()
+    return jsonify({
+        "total": index.count(**filters),
+        "submissions": index.list(limit=limit, offset=offset, **filters)
+    })
+
+@app.route('/search')
+def search_stories():
+    """Full-text search over stories and summaries (English and Telugu) with facets"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+    try:
+        limit = max(1, min(int(request.args.get('limit', 10)), 100))
+        offset = max(0, int(request.args.get('offset', 0)))
+    except ValueError:
+        return jsonify({"error": "limit and offset must be numbers"}), 400
+    
+    started = time.perf_counter()
+    search = get_story_search()
+    search.refresh()
+    result = search.search(
+        query,
+        district=request.args.get('district'),
+        festival_name=request.args.get('festival'),
+        limit=limit,
+        offset=offset
+    )
+    result["took_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return jsonify(result)
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     """Handle file upload - save file locally and return info"""
@@ -95,6 +202,8 @@ def upload_file():
         if not result["success"]:
             return jsonify({"error": result["error"]}), 500
         
+        thumbnail_url = queue_derivatives(result["file_path"], result["saved_filename"])
+        
         # Get the ngrok URL if available
         ngrok_url = None
         try:
@@ -112,18 +221,151 @@ def upload_file():
                 "original_filename": result["original_filename"],
                 "file_type": result["file_type"],
                 "file_size": result["file_size"],
+                "sha256": result["sha256"],
+                "duplicate": result["duplicate"],
+                "ingest": result["ingest"],
+                "thumbnail_url": thumbnail_url,
                 "timestamp": datetime.now().isoformat()
             }
         })
         
+    except RequestEntityTooLarge:
+        return jsonify({"error": f"File too large (limit {MAX_UPLOAD_FILE_SIZE} bytes)"}), 413
     except Exception as e:
         print(f"Error processing upload: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
+@app.route('/upload/resumable', methods=['POST'])
+def start_resumable_upload():
+    """Open a resumable upload session for a large file"""
+    params = request.get_json(silent=True) or request.form
+    
+    village = params.get('village')
+    if not village or village not in TELANGANA_DISTRICTS:
+        return jsonify({"error": "Valid village/district is required"}), 400
+    
+    filename = secure_filename(params.get('filename') or '')
+    if not filename or not allowed_file(filename):
+        return jsonify({"error": "File type not allowed"}), 400
+    
+    try:
+        total_size = int(params.get('total_size'))
+    except (TypeError, ValueError):
+        return jsonify({"error": "total_size is required"}), 400
+    if total_size > MAX_UPLOAD_FILE_SIZE:
+        return jsonify({"error": f"File too large (limit {MAX_UPLOAD_FILE_SIZE} bytes)"}), 413
+    
+    try:
+        state = resumable_store.create(
+            village, filename, total_size,
+            content_type=params.get('content_type'),
+            sha256=params.get('sha256')
+        )
+    except UploadSessionError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    
+    return jsonify({
+        "success": True,
+        "chunk_size": RESUMABLE_CHUNK_SIZE,
+        **ResumableUploadStore.public_state(state)
+    }), 201
+
+@app.route('/upload/resumable/<upload_id>', methods=['GET'])
+def resumable_upload_status(upload_id):
+    """Report how many bytes of a resumable upload are stored"""
+    try:
+        state = resumable_store.get(upload_id)
+    except UploadSessionError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    return jsonify(ResumableUploadStore.public_state(state))
+
+@app.route('/upload/resumable/<upload_id>', methods=['PUT'])
+def upload_resumable_chunk(upload_id):
+    """Store one chunk of a resumable upload; the body is the raw chunk bytes"""
+    offset = request.args.get('offset', request.headers.get('Upload-Offset'))
+    try:
+        offset = int(offset)
+    except (TypeError, ValueError):
+        return jsonify({"error": "offset is required"}), 400
+    
+    if request.content_length is None:
+        return jsonify({"error": "Content-Length is required"}), 411
+    
+    try:
+        state = resumable_store.write_chunk(upload_id, offset, request.stream, request.content_length)
+    except UploadSessionError as e:
+        return jsonify({"error": str(e), "offset": e.offset}), e.status_code
+    
+    return jsonify(ResumableUploadStore.public_state(state))
+
+@app.route('/upload/resumable/<upload_id>/finalize', methods=['POST'])
+def finalize_resumable_upload(upload_id):
+    """Move a completed resumable upload into its village folder"""
+    def make_destination(state):
+        return UPLOAD_FOLDER / state["village"], lambda ulid: f"{ulid}_{state['filename']}"
+    
+    def adopt(result):
+        # Runs on the first finalize only; a retry would otherwise find its own file as a duplicate
+        return {"duplicate": get_media_store().adopt(result["file_path"], result["sha256"])}
+    
+    try:
+        state = resumable_store.finalize(upload_id, make_destination, on_placed=adopt)
+    except UploadSessionError as e:
+        return jsonify({"error": str(e), "offset": e.offset}), e.status_code
+    
+    result = state["result"]
+    duplicate = result.get("duplicate", False)
+    thumbnail_url = queue_derivatives(result["file_path"], result["saved_filename"])
+    return jsonify({
+        "success": True,
+        "message": "File uploaded successfully",
+        "data": {
+            "village": state["village"],
+            "saved_filename": result["saved_filename"],
+            "original_filename": state["filename"],
+            "file_type": state["content_type"],
+            "file_size": result["file_size"],
+            "sha256": result["sha256"],
+            "duplicate": duplicate,
+            "thumbnail_url": thumbnail_url,
+            "timestamp": datetime.now().isoformat()
+        }
+    })
+
 @app.route('/uploads/<filename>')
 def uploaded_file(filename):
-    """Serve uploaded files"""
-    return send_from_directory(str(UPLOAD_FOLDER), filename)
+    """Serve uploaded files by saved name (supports Range, ETag and Last-Modified)"""
+    response = media_library.send(filename)
+    if response is None:
+        return jsonify({"error": "File not found"}), 404
+    return response
+
+@app.route('/uploads/<filename>/thumbnail')
+def uploaded_file_thumbnail(filename):
+    """Serve a downscaled image or video poster frame of an upload"""
+    size = request.args.get('size', 'thumb')
+    if size not in derivatives.sizes:
+        return jsonify({"error": f"size must be one of: {', '.join(derivatives.sizes)}"}), 400
+    
+    entry = media_library.lookup(filename)
+    if entry is None or media_kind(filename) is None:
+        return jsonify({"error": "No thumbnail for this file"}), 404
+    
+    try:
+        path = derivatives.get(entry["path"], size)
+    except Exception:
+        return jsonify({"error": "Could not generate a thumbnail for this file"}), 500
+    if path is None:
+        response = jsonify({"error": "Thumbnail is not ready yet"})
+        response.status_code = 503
+        response.headers["Retry-After"] = "5"
+        return response
+    return send_file(str(path.resolve()), mimetype=derivatives.mime_type, conditional=True, max_age=MEDIA_MAX_AGE)
 
 if __name__ == '__main__':
-    app.run(debug=FLASK_DEBUG, host=FLASK_HOST, port=FLASK_PORT) 
\ No newline at end of file
+    if PRODUCTION:
+        # Multi-worker server instead of the single-process development server
+        from serve import run
+        run()
+    else:
+        app.run(debug=FLASK_DEBUG, host=FLASK_HOST, port=FLASK_PORT) 
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Shared Google API clients for FestFusion
+Builds Drive services and gspread clients once per credentials and reuses them,
+with discovery documents cached on disk and pooled keep-alive HTTP sessions.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import gspread
+import httplib2
+import requests
+from google.auth.transport.requests import AuthorizedSession
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+
+from config import DISCOVERY_CACHE_DIR, GOOGLE_HTTP_POOL_SIZE, GOOGLE_HTTP_TIMEOUT
+
+DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/{api}/{version}/rest"
+
+_discovery_lock = threading.Lock()
+_discovery_documents = {}
+
+# Clients hold their credentials, so caches are bounded instead of weak
+MAX_CACHED_CREDENTIALS = 32
+
+_sheets_lock = threading.Lock()
+_sheets_clients = OrderedDict()
+
+# httplib2 connections are not thread-safe, so each thread keeps its own Drive services
+_thread_state = threading.local()
+
+
+def credentials_key(creds):
+    """
+    Cache key of a set of credentials
+
+    Service-account credentials are keyed by account email and scopes, so a
+    Credentials object rebuilt for every request still finds the cached
+    client. Anything else (e.g. OAuth user credentials) is keyed by identity.
+    """
+    email = getattr(creds, "service_account_email", None)
+    if email and email != "default":
+        scopes = getattr(creds, "scopes", None) or getattr(creds, "default_scopes", None) or ()
+        return ("service_account", email, tuple(sorted(scopes)))
+    return ("object", id(creds))
+
+
+def _cached_for_creds(cache, creds, key, factory):
+    """Look up (creds, key) in an LRU cache keyed by credentials_key, building on a miss"""
+    creds_key = credentials_key(creds)
+    cache_key = (creds_key, key)
+    entry = cache.get(cache_key)
+    # Identity-keyed entries also check the object, since id() values are reused after garbage collection
+    if entry is not None and (creds_key[0] == "service_account" or entry[0] is creds):
+        cache.move_to_end(cache_key)
+        return entry[1]
+
+    value = factory()
+    cache[cache_key] = (creds, value)
+    while len(cache) > MAX_CACHED_CREDENTIALS:
+        cache.popitem(last=False)
+    return value
+
+
+def get_discovery_document(api, version):
+    """
+    Return the discovery document for an API, loading it at most once per process
+
+    Looks in memory, then the on-disk cache, then the documents bundled with
+    google-api-python-client, and only then fetches it from Google.
+    """
+    key = (api, version)
+    with _discovery_lock:
+        document = _discovery_documents.get(key)
+        if document is not None:
+            return document
+
+        cache_path = DISCOVERY_CACHE_DIR / f"{api}.{version}.json"
+        if cache_path.exists():
+            document = cache_path.read_text(encoding="utf-8")
+        else:
+            document = discovery_cache.get_static_doc(api, version)
+            if document is None:
+                response = requests.get(DISCOVERY_URL.format(api=api, version=version), timeout=GOOGLE_HTTP_TIMEOUT)
+                response.raise_for_status()
+                document = response.text
+            DISCOVERY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(document, encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+
+        _discovery_documents[key] = document
+        return document
+
+
+def get_service(api, version, creds):
+    """
+    Return a googleapiclient service for the calling thread, built once per credentials
+
+    Args:
+        api (str): API name, e.g. 'drive'
+        version (str): API version, e.g. 'v3'
+        creds: google.auth credentials
+
+    Returns:
+        Resource: Service object backed by a keep-alive httplib2 connection
+    """
+    services = getattr(_thread_state, "services", None)
+    if services is None:
+        services = _thread_state.services = OrderedDict()
+
+    def build_service():
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=GOOGLE_HTTP_TIMEOUT))
+        return build_from_document(get_discovery_document(api, version), http=http)
+
+    return _cached_for_creds(services, creds, (api, version), build_service)
+
+
+def get_drive_service(creds):
+    """Drive v3 service for the calling thread (see get_service)"""
+    return get_service('drive', 'v3', creds)
+
+
+def create_pooled_session(creds):
+    """AuthorizedSession with a connection pool sized for concurrent uploads"""
+    session = AuthorizedSession(creds)
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=GOOGLE_HTTP_POOL_SIZE,
+        pool_maxsize=GOOGLE_HTTP_POOL_SIZE
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+def get_sheets_client(creds):
+    """
+    Return the process-wide gspread client for a set of credentials
+
+    The client shares one pooled AuthorizedSession across threads, so repeated
+    saves reuse warm TLS connections instead of calling gspread.authorize again.
+    """
+    def build_client():
+        client = gspread.Client(creds, session=create_pooled_session(creds))
+        client.set_timeout(GOOGLE_HTTP_TIMEOUT)
+        return client
+
+    with _sheets_lock:
+        return _cached_for_creds(_sheets_clients, creds, 'sheets', build_client)
@@ -8,11 +8,11 @@ import os
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 import json
 import pickle
 from pathlib import Path
+from google_clients import get_drive_service
 
 # OAuth 2.0 scopes for Google Drive and Sheets
 SCOPES = [
@@ -123,8 +123,8 @@ def upload_file_to_drive(file_path, filename, folder_id=None):
             st.error("❌ Could not get OAuth credentials")
             return None
         
-        # Build the Drive service
-        service = build('drive', 'v3', credentials=creds)
+        # Reuse this thread's pooled Drive service
+        service = get_drive_service(creds)
         
         # Prepare file metadata
         file_metadata = {
@@ -173,8 +173,8 @@ def create_drive_folder(folder_name, parent_folder_id=None):
             st.error("❌ Could not get OAuth credentials")
             return None
         
-        # Build the Drive service
-        service = build('drive', 'v3', credentials=creds)
+        # Reuse this thread's pooled Drive service
+        service = get_drive_service(creds)
         
         # Prepare folder metadata
         folder_metadata = {
@@ -213,8 +213,8 @@ def list_drive_folders():
             st.error("❌ Could not get OAuth credentials")
             return []
         
-        # Build the Drive service
-        service = build('drive', 'v3', credentials=creds)
+        # Reuse this thread's pooled Drive service
+        service = get_drive_service(creds)
         
         # Query for folders
         results = service.files().list(
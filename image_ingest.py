@@ -0,0 +1,244 @@
+"""
+Image normalisation on ingest for FestFusion
+Phone photos arrive at 8-12 MB. With IMAGE_INGEST=true (off by default, since
+recompression is lossy), before an image upload is stored or sent to Google
+Drive it is decoded once, rotated upright from its EXIF orientation,
+downscaled to IMAGE_INGEST_MAX_SIDE and recompressed, with EXIF/XMP (camera
+data, GPS position, embedded thumbnails) left out; the ICC colour profile is
+kept. The work runs in a process pool so request threads only wait on it.
+
+The original is kept whenever normalising would not make the file smaller,
+and any failure or timeout falls back to storing the upload unchanged.
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from PIL import Image, ImageOps
+
+from config import (
+    IMAGE_INGEST_ENABLED, IMAGE_INGEST_MAX_SIDE, IMAGE_INGEST_JPEG_QUALITY,
+    IMAGE_INGEST_WORKERS, IMAGE_INGEST_TIMEOUT
+)
+
+# Extension -> Pillow format; the stored file keeps its format and extension
+INGEST_FORMATS = {"jpg": "JPEG", "jpeg": "JPEG", "png": "PNG"}
+
+
+def ingest_format(filename):
+    """Pillow format an upload is normalised to, or None if it isn't a normalised image type"""
+    return INGEST_FORMATS.get(os.path.splitext(str(filename))[1].lower().lstrip("."))
+
+
+def normalize_image(source, image_format, max_side=IMAGE_INGEST_MAX_SIDE, quality=IMAGE_INGEST_JPEG_QUALITY):
+    """
+    Decode, orient, downscale and recompress one image
+
+    Args:
+        source: Path or binary file object of the original
+        image_format (str): "JPEG" or "PNG"
+
+    Returns:
+        tuple: (encoded bytes, dict with original_size and stored_size as (width, height))
+    """
+    with Image.open(source) as image:
+        original_size = image.size
+        # JPEG decodes straight to a smaller scale (1/2, 1/4, 1/8) when that still covers max_side
+        image.draft(None, (max_side, max_side))
+        icc_profile = image.info.get("icc_profile")
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_side, max_side), Image.LANCZOS, reducing_gap=3.0)
+
+        output = io.BytesIO()
+        if image_format == "JPEG":
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.save(output, format="JPEG", quality=quality, optimize=True, progressive=True,
+                       icc_profile=icc_profile)
+        else:
+            image.save(output, format="PNG", optimize=True, icc_profile=icc_profile)
+        return output.getvalue(), {"original_size": original_size, "stored_size": image.size}
+
+
+def _normalize_file(source_path, image_format, max_side, quality):
+    """Worker task: normalise a file on disk, writing the result next to it"""
+    original_bytes = os.path.getsize(source_path)
+    data, info = normalize_image(source_path, image_format, max_side, quality)
+    info.update(original_bytes=original_bytes, stored_bytes=len(data), path=None, sha256=None)
+    if len(data) >= original_bytes:
+        info["stored_bytes"] = original_bytes
+        return info
+
+    output_path = f"{source_path}.ingest"
+    with open(output_path, "wb") as f:
+        f.write(data)
+    info.update(path=output_path, sha256=hashlib.sha256(data).hexdigest())
+    return info
+
+
+def _discard_late_output(future):
+    """Remove the copy a timed-out file task wrote after its caller had stored the original"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    info = future.result()
+    if isinstance(info, dict) and info.get("path"):
+        try:
+            os.remove(info["path"])
+        except FileNotFoundError:
+            pass
+
+
+def _normalize_bytes(data, image_format, max_side, quality):
+    """Worker task: normalise an in-memory upload"""
+    normalized, info = normalize_image(io.BytesIO(data), image_format, max_side, quality)
+    info.update(original_bytes=len(data), stored_bytes=len(normalized))
+    if len(normalized) >= len(data):
+        info["stored_bytes"] = len(data)
+        return None, info
+    return normalized, info
+
+
+class ImageIngestor:
+    """
+    Process pool that normalises image uploads, with a running bytes-saved total
+
+    Args:
+        enabled (bool, optional): False stores every upload unchanged
+        max_side (int, optional): Longest side of a stored image in pixels
+        quality (int, optional): JPEG quality of the recompressed image
+        max_workers (int, optional): Worker processes
+        timeout (float, optional): Seconds to wait for one image before storing it unchanged
+    """
+
+    def __init__(self, enabled=IMAGE_INGEST_ENABLED, max_side=IMAGE_INGEST_MAX_SIDE,
+                 quality=IMAGE_INGEST_JPEG_QUALITY, max_workers=IMAGE_INGEST_WORKERS, timeout=IMAGE_INGEST_TIMEOUT):
+        self.enabled = enabled
+        self.max_side = max_side
+        self.quality = quality
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pool = None
+        self._lock = threading.Lock()
+        self._images = 0
+        self._normalized = 0
+        self._original_bytes = 0
+        self._stored_bytes = 0
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a multi-threaded server process can deadlock in the child
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _run(self, task, *args):
+        future = None
+        try:
+            future = self._get_pool().submit(task, *args, self.max_side, self.quality)
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # The worker can't be interrupted; clean up whatever it writes once it finishes
+            print(f"Debug - Image ingest timed out after {self.timeout}s, storing the original")
+            if not future.cancel():
+                future.add_done_callback(_discard_late_output)
+            return None
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed on memory); start a fresh pool for the next upload
+            print(f"Debug - Image ingest pool failed, storing the original: {e}")
+            self.shutdown()
+            return None
+        except Exception as e:
+            print(f"Debug - Image ingest skipped, storing the original: {e}")
+            return None
+
+    def _record(self, info):
+        info["saved_bytes"] = info["original_bytes"] - info["stored_bytes"]
+        with self._lock:
+            self._images += 1
+            self._normalized += 1 if info["saved_bytes"] else 0
+            self._original_bytes += info["original_bytes"]
+            self._stored_bytes += info["stored_bytes"]
+        print(f"Debug - Image ingest: {info['original_bytes']} -> {info['stored_bytes']} bytes "
+              f"({info['original_size'][0]}x{info['original_size'][1]} -> "
+              f"{info['stored_size'][0]}x{info['stored_size'][1]})")
+
+    def normalize_file(self, path, filename):
+        """
+        Normalise an image that is already on disk
+
+        Args:
+            path (str): The uploaded file
+            filename (str): Upload name, which decides the output format
+
+        Returns:
+            dict: original_bytes, stored_bytes, saved_bytes, sizes, and path/sha256 of the
+                  normalised copy (path is None when the original should be kept), or None
+                  when the file isn't normalised at all
+        """
+        image_format = ingest_format(filename)
+        if not self.enabled or image_format is None:
+            return None
+        info = self._run(_normalize_file, str(path), image_format)
+        if info is not None:
+            self._record(info)
+        return info
+
+    def normalize_bytes(self, data, filename):
+        """
+        Normalise an in-memory image upload
+
+        Returns:
+            tuple: (bytes to store, info dict or None); the bytes are the original
+                   when normalising is disabled, doesn't apply or doesn't help
+        """
+        image_format = ingest_format(filename)
+        if not self.enabled or image_format is None:
+            return data, None
+        result = self._run(_normalize_bytes, data, image_format)
+        if result is None:
+            return data, None
+        normalized, info = result
+        self._record(info)
+        return (normalized if normalized is not None else data), info
+
+    def stats(self):
+        """
+        Bytes saved by this process
+
+        Returns:
+            dict: images, normalized, original_bytes, stored_bytes, saved_bytes
+        """
+        with self._lock:
+            return {
+                "images": self._images,
+                "normalized": self._normalized,
+                "original_bytes": self._original_bytes,
+                "stored_bytes": self._stored_bytes,
+                "saved_bytes": self._original_bytes - self._stored_bytes,
+            }
+
+    def shutdown(self, wait=False):
+        """Stop the worker processes"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=True)
+                self._pool = None
+
+
+_default_ingestor = None
+_default_ingestor_lock = threading.Lock()
+
+
+def get_image_ingestor():
+    """Process-wide ImageIngestor using the config.py settings"""
+    global _default_ingestor
+    with _default_ingestor_lock:
+        if _default_ingestor is None:
+            _default_ingestor = ImageIngestor()
+        return _default_ingestor
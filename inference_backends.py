@@ -0,0 +1,97 @@
+"""
+Inference backends for the FestFusion summarizer and transcriber
+Builds the transformers pipelines on one of three CPU backends, chosen with
+INFERENCE_BACKEND in config.py:
+
+- pytorch: the full-precision model, as before
+- int8: PyTorch dynamic quantization of the Linear layers (weights stored as int8)
+- onnx: the model exported to ONNX and run by ONNX Runtime (needs optimum[onnxruntime]);
+  the export is cached under MODEL_CACHE_DIR so it only happens once
+
+An unavailable backend falls back to pytorch rather than failing the app.
+"""
+
+from config import INFERENCE_BACKEND, MODEL_CACHE_DIR, SUMMARIZATION_MODEL, TRANSCRIPTION_MODEL
+
+BACKENDS = ("pytorch", "int8", "onnx")
+
+SUMMARIZATION_TASK = "summarization"
+TRANSCRIPTION_TASK = "automatic-speech-recognition"
+
+
+def onnx_cache_path(model_name):
+    """Folder an exported ONNX model is kept in"""
+    return MODEL_CACHE_DIR / f"{model_name.replace('/', '--')}-onnx"
+
+
+def _load_pytorch(task, model_name):
+    from transformers import pipeline
+    return pipeline(task, model=model_name)
+
+
+def _load_int8(task, model_name):
+    import torch
+    from transformers import pipeline
+
+    loaded = pipeline(task, model=model_name)
+    # Quantizing takes a few seconds and the result is tied to this torch build, so it isn't cached
+    loaded.model = torch.quantization.quantize_dynamic(loaded.model, {torch.nn.Linear}, dtype=torch.qint8)
+    return loaded
+
+
+def _load_onnx(task, model_name):
+    from transformers import pipeline
+    if task == SUMMARIZATION_TASK:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM as ORTModel
+        from transformers import AutoTokenizer
+        processor_kwargs = {"tokenizer": AutoTokenizer.from_pretrained(model_name)}
+    else:
+        from optimum.onnxruntime import ORTModelForSpeechSeq2Seq as ORTModel
+        from transformers import AutoProcessor
+        processor = AutoProcessor.from_pretrained(model_name)
+        processor_kwargs = {"tokenizer": processor.tokenizer, "feature_extractor": processor.feature_extractor}
+
+    cache_path = onnx_cache_path(model_name)
+    if (cache_path / "config.json").exists():
+        model = ORTModel.from_pretrained(cache_path)
+    else:
+        print(f"Debug - Exporting {model_name} to ONNX (one-time, cached in {cache_path})")
+        model = ORTModel.from_pretrained(model_name, export=True)
+        cache_path.mkdir(parents=True, exist_ok=True)
+        model.save_pretrained(cache_path)
+    return pipeline(task, model=model, **processor_kwargs)
+
+
+_LOADERS = {"pytorch": _load_pytorch, "int8": _load_int8, "onnx": _load_onnx}
+
+
+def load_pipeline(task, model_name, backend=INFERENCE_BACKEND):
+    """
+    Build a transformers pipeline on the requested backend
+
+    Args:
+        task (str): SUMMARIZATION_TASK or TRANSCRIPTION_TASK
+        model_name (str): Hugging Face model ID
+        backend (str, optional): One of BACKENDS
+
+    Returns:
+        Pipeline: Ready-to-call transformers pipeline
+    """
+    if backend not in _LOADERS:
+        raise ValueError(f"Unknown inference backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+    if backend != "pytorch":
+        try:
+            return _LOADERS[backend](task, model_name)
+        except ImportError as e:
+            print(f"Debug - {backend} backend unavailable ({e}), using pytorch for {model_name}")
+    return _load_pytorch(task, model_name)
+
+
+def load_summarizer(backend=INFERENCE_BACKEND, model_name=SUMMARIZATION_MODEL):
+    """Summarization pipeline on the configured backend"""
+    return load_pipeline(SUMMARIZATION_TASK, model_name, backend)
+
+
+def load_transcriber(backend=INFERENCE_BACKEND, model_name=TRANSCRIPTION_MODEL):
+    """Speech recognition pipeline on the configured backend"""
+    return load_pipeline(TRANSCRIPTION_TASK, model_name, backend)
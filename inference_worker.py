@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+FestFusion inference worker
+A single local process that owns the summarizer and transcriber and serves
+them over HTTP on localhost, so any number of Streamlit or Flask front ends
+share one copy of the models instead of loading their own.
+
+- POST /summarize   JSON {text, max_length, min_length, timeout}
+- POST /transcribe  multipart "file" (+ optional timeout form field)
+- GET  /health      readiness (503 until the models are loaded) and queue depth
+
+Summaries from concurrent requests are batched by BatchSummarizer and
+recordings share the transcription process pool. Each endpoint admits a
+bounded number of requests; beyond that it answers 503 with Retry-After so
+callers back off instead of piling up. Responses are newline-delimited JSON
+progress updates (the same dicts summarize_long/transcribe_iter yield); a
+failure after streaming has started arrives as a final {"error", "status"} line.
+
+InferenceClient is the matching client for front ends.
+"""
+
+import argparse
+import json
+import os
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import requests
+from flask import Flask, Response, jsonify, request
+
+from config import (
+    INFERENCE_WORKER_HOST, INFERENCE_WORKER_PORT, INFERENCE_WORKER_URL,
+    INFERENCE_MAX_PENDING_SUMMARIES, INFERENCE_MAX_PENDING_TRANSCRIPTIONS,
+    INFERENCE_SUMMARY_TIMEOUT, INFERENCE_TRANSCRIBE_TIMEOUT, INFERENCE_RETRY_AFTER,
+    SUMMARY_MAX_LENGTH, SUMMARY_MIN_LENGTH
+)
+
+
+class AdmissionQueue:
+    """
+    Bounded count of requests being worked on or waiting for a model
+
+    Args:
+        limit (int): Requests admitted at once; try_enter() refuses the rest
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._active = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+
+    def try_enter(self):
+        with self._lock:
+            if self._active >= self.limit:
+                self._rejected += 1
+                return False
+            self._active += 1
+            self._admitted += 1
+            return True
+
+    def leave(self):
+        with self._lock:
+            self._active -= 1
+
+    def record_timeout(self):
+        with self._lock:
+            self._timed_out += 1
+
+    def stats(self):
+        with self._lock:
+            return {"active": self._active, "limit": self.limit, "admitted": self._admitted,
+                    "rejected": self._rejected, "timed_out": self._timed_out}
+
+
+def _request_timeout(value, default):
+    """Caller's timeout in seconds, capped at the server default"""
+    if value in (None, ""):
+        return default
+    return max(1.0, min(float(value), default))
+
+
+def _busy_response():
+    response = jsonify({"error": "Inference worker is busy, retry later"})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(INFERENCE_RETRY_AFTER)
+    return response
+
+
+def _stream_updates(updates, admission, on_close=None):
+    """NDJSON response for a generator of progress dicts; releases the admission slot when closed"""
+
+    def generate():
+        try:
+            for update in updates:
+                yield json.dumps(update, ensure_ascii=False) + "\n"
+        except FutureTimeout:
+            admission.record_timeout()
+            yield json.dumps({"error": "Request timed out", "status": 504}) + "\n"
+        except Exception as e:
+            print(f"Debug - Inference request failed: {e}")
+            yield json.dumps({"error": str(e), "status": 500}) + "\n"
+
+    response = Response(generate(), mimetype="application/x-ndjson")
+
+    def close():
+        # Runs even if the client went away before the body was read
+        updates.close()
+        admission.leave()
+        if on_close:
+            on_close()
+
+    response.call_on_close(close)
+    return response
+
+
+def create_app(models=None, max_summaries=INFERENCE_MAX_PENDING_SUMMARIES,
+               max_transcriptions=INFERENCE_MAX_PENDING_TRANSCRIPTIONS):
+    """
+    Build the worker's Flask app
+
+    Args:
+        models (ModelManager, optional): Model owner; defaults to the process-wide one (preloading at once)
+
+    Returns:
+        Flask: WSGI app
+    """
+    if models is None:
+        from model_manager import get_model_manager
+        models = get_model_manager()
+
+    app = Flask(__name__)
+    summaries = AdmissionQueue(max_summaries)
+    transcriptions = AdmissionQueue(max_transcriptions)
+
+    @app.route('/health')
+    def health():
+        report = models.health()
+        report["queues"] = {"summarize": summaries.stats(), "transcribe": transcriptions.stats()}
+        report["status"] = "ready" if report["ready"] else "loading"
+        return jsonify(report), 200 if report["ready"] else 503
+
+    @app.route('/summarize', methods=['POST'])
+    def summarize():
+        payload = request.get_json(silent=True) or {}
+        text = payload.get("text")
+        if not isinstance(text, str) or not text.strip():
+            return jsonify({"error": "'text' is required"}), 400
+        try:
+            max_length = int(payload.get("max_length", SUMMARY_MAX_LENGTH))
+            min_length = int(payload.get("min_length", SUMMARY_MIN_LENGTH))
+            timeout = _request_timeout(payload.get("timeout"), INFERENCE_SUMMARY_TIMEOUT)
+        except (TypeError, ValueError):
+            return jsonify({"error": "max_length, min_length and timeout must be numbers"}), 400
+
+        if not summaries.try_enter():
+            return _busy_response()
+
+        def updates():
+            with models.use("summarizer") as summarizer:
+                yield from summarizer.summarize_long(text, max_length, min_length, timeout=timeout)
+
+        return _stream_updates(updates(), summaries)
+
+    @app.route('/transcribe', methods=['POST'])
+    def transcribe():
+        upload = request.files.get("file")
+        if upload is None or not upload.filename:
+            return jsonify({"error": "Audio 'file' is required"}), 400
+        try:
+            timeout = _request_timeout(request.form.get("timeout"), INFERENCE_TRANSCRIBE_TIMEOUT)
+        except ValueError:
+            return jsonify({"error": "timeout must be a number"}), 400
+
+        if not transcriptions.try_enter():
+            return _busy_response()
+        try:
+            fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(upload.filename)[1])
+            with os.fdopen(fd, "wb") as f:
+                upload.save(f)
+        except Exception as e:
+            transcriptions.leave()
+            print(f"Debug - Could not store audio for transcription: {e}")
+            return jsonify({"error": "Could not store the uploaded audio"}), 500
+
+        def updates():
+            with models.use("transcriber") as transcriber:
+                yield from transcriber.transcribe_iter(temp_path, timeout=timeout)
+
+        def remove_temp_file():
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+        return _stream_updates(updates(), transcriptions, on_close=remove_temp_file)
+
+    return app
+
+
+# --- Client ---
+
+class InferenceWorkerError(Exception):
+    """Raised when the inference worker refuses or fails a request"""
+
+    def __init__(self, message, status_code=500, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class InferenceClient:
+    """
+    Client for the inference worker
+
+    Args:
+        base_url (str, optional): Worker address, e.g. http://127.0.0.1:5100
+        busy_retries (int, optional): Times a 503 (queue full) is retried after Retry-After
+    """
+
+    def __init__(self, base_url=INFERENCE_WORKER_URL, busy_retries=2):
+        self.base_url = (base_url or f"http://{INFERENCE_WORKER_HOST}:{INFERENCE_WORKER_PORT}").rstrip("/")
+        self.busy_retries = busy_retries
+        self.session = requests.Session()
+
+    def _stream(self, path, timeout, make_request):
+        for attempt in range(self.busy_retries + 1):
+            # The read timeout applies between lines; updates arrive at least once per batch or segment
+            response = self.session.post(f"{self.base_url}{path}", stream=True, timeout=(5, timeout + 30),
+                                         **make_request())
+            if response.status_code == 503 and attempt < self.busy_retries:
+                retry_after = float(response.headers.get("Retry-After", INFERENCE_RETRY_AFTER))
+                response.close()
+                time.sleep(retry_after)
+                continue
+            break
+
+        with response:
+            if response.status_code != 200:
+                try:
+                    message = response.json().get("error", response.reason)
+                except ValueError:
+                    message = response.reason
+                retry_after = response.headers.get("Retry-After")
+                raise InferenceWorkerError(message, response.status_code,
+                                           float(retry_after) if retry_after else None)
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                update = json.loads(line)
+                if "error" in update:
+                    raise InferenceWorkerError(update["error"], update.get("status", 500))
+                yield update
+
+    def summarize_long(self, text, max_length=SUMMARY_MAX_LENGTH, min_length=SUMMARY_MIN_LENGTH,
+                       timeout=INFERENCE_SUMMARY_TIMEOUT):
+        """Progress updates of a summary, as BatchSummarizer.summarize_long yields them"""
+        payload = {"text": text, "max_length": max_length, "min_length": min_length, "timeout": timeout}
+        return self._stream("/summarize", timeout, lambda: {"json": payload})
+
+    def summarize(self, text, max_length=SUMMARY_MAX_LENGTH, min_length=SUMMARY_MIN_LENGTH,
+                  timeout=INFERENCE_SUMMARY_TIMEOUT):
+        """Summary of a story"""
+        for update in self.summarize_long(text, max_length, min_length, timeout):
+            if update["stage"] == "done":
+                return update["summary"]
+        raise InferenceWorkerError("Inference worker closed the stream without a summary")
+
+    def transcribe_iter(self, path, timeout=INFERENCE_TRANSCRIBE_TIMEOUT):
+        """Progress updates of a transcription, as TranscriptionEngine.transcribe_iter yields them"""
+        opened = []
+
+        def make_request():
+            # Reopened on every attempt, since a refused upload has consumed the file
+            for f in opened:
+                f.close()
+            opened[:] = [open(path, "rb")]
+            return {"files": {"file": (os.path.basename(path), opened[0])}, "data": {"timeout": str(timeout)}}
+
+        try:
+            yield from self._stream("/transcribe", timeout, make_request)
+        finally:
+            for f in opened:
+                f.close()
+
+    def transcribe(self, path, timeout=INFERENCE_TRANSCRIBE_TIMEOUT):
+        """Full transcript of an audio file"""
+        transcript = ""
+        for update in self.transcribe_iter(path, timeout):
+            transcript = update["transcript"]
+        return transcript
+
+    def health(self):
+        """
+        Worker readiness
+
+        Returns:
+            dict: The worker's /health report, or {"ready": False, "error": ...} if it can't be reached
+        """
+        try:
+            return self.session.get(f"{self.base_url}/health", timeout=5).json()
+        except (requests.RequestException, ValueError) as e:
+            return {"ready": False, "error": str(e)}
+
+
+def run(host=INFERENCE_WORKER_HOST, port=INFERENCE_WORKER_PORT):
+    """Serve the worker until terminated"""
+    from werkzeug.serving import make_server
+
+    server = make_server(host, port, create_app(), threaded=True)
+
+    def stop(signum, frame):
+        # shutdown() waits for serve_forever, so it can't run on the serving thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"FestFusion inference worker listening on http://{host}:{port}")
+    server.serve_forever()
+    server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=INFERENCE_WORKER_HOST)
+    parser.add_argument("--port", type=int, default=INFERENCE_WORKER_PORT)
+    args = parser.parse_args()
+    run(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Thumbnail and poster-frame derivatives for FestFusion uploads
+Images are downscaled with Pillow, videos get a poster frame grabbed by ffmpeg,
+and each is saved at the DERIVATIVE_SIZES as WebP (or JPEG) in a
+.derivatives folder next to the original. Generation runs on a background
+thread pool, so uploads return at once and galleries load kilobytes instead
+of the full-size file.
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from config import (
+    DERIVATIVE_FOLDER_NAME, DERIVATIVE_SIZES, DERIVATIVE_FORMAT, DERIVATIVE_QUALITY,
+    DERIVATIVE_WORKERS, DERIVATIVE_WAIT, VIDEO_POSTER_SECOND
+)
+
+IMAGE_EXTENSIONS = {"png", "jpg", "jpeg"}
+VIDEO_EXTENSIONS = {"mp4"}
+
+# Output format name -> (Pillow format, file extension, MIME type)
+FORMATS = {
+    "webp": ("WEBP", "webp", "image/webp"),
+    "jpeg": ("JPEG", "jpg", "image/jpeg"),
+}
+
+
+def media_kind(path):
+    """'image', 'video' or None for a file that gets no derivatives"""
+    extension = os.path.splitext(str(path))[1].lower().lstrip(".")
+    if extension in IMAGE_EXTENSIONS:
+        return "image"
+    if extension in VIDEO_EXTENSIONS:
+        return "video"
+    return None
+
+
+def derivative_path(original, size_name, output_format=DERIVATIVE_FORMAT):
+    """Where the size_name derivative of an original is stored"""
+    original = Path(original)
+    extension = FORMATS[output_format][1]
+    return original.parent / DERIVATIVE_FOLDER_NAME / f"{original.name}.{size_name}.{extension}"
+
+
+def extract_video_frame(path, second=VIDEO_POSTER_SECOND):
+    """
+    Grab one frame of a video with ffmpeg
+
+    Falls back to the first frame for clips shorter than `second`.
+
+    Returns:
+        PIL.Image.Image: The frame
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg is required for video poster frames - install it and make sure it is on PATH")
+
+    for position in (second, 0):
+        # -ss before -i seeks by keyframe index instead of decoding up to the position
+        result = subprocess.run(
+            [ffmpeg, "-nostdin", "-loglevel", "error", "-ss", str(position), "-i", str(path),
+             "-frames:v", "1", "-f", "image2pipe", "-vcodec", "png", "-"],
+            capture_output=True, timeout=120
+        )
+        if result.returncode == 0 and result.stdout:
+            return Image.open(io.BytesIO(result.stdout))
+    raise RuntimeError(f"ffmpeg could not read a frame from {path}: {result.stderr.decode(errors='replace').strip()}")
+
+
+def _prepare_mode(image, output_format):
+    if output_format == "jpeg":
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            # JPEG has no alpha: flatten onto white rather than black
+            rgba = image.convert("RGBA")
+            background = Image.new("RGB", rgba.size, (255, 255, 255))
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            return background
+        return image.convert("RGB") if image.mode != "RGB" else image
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def _save_atomic(image, destination, output_format, quality):
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    pillow_format = FORMATS[output_format][0]
+    options = {"quality": quality}
+    if output_format == "webp":
+        options["method"] = 4  # good compression without the slow top settings
+    else:
+        options.update(optimize=True, progressive=True)
+    temp_path = destination.with_name(f"{destination.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        image.save(temp_path, format=pillow_format, **options)
+        os.replace(temp_path, destination)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def render_derivatives(path, sizes=DERIVATIVE_SIZES, output_format=DERIVATIVE_FORMAT, quality=DERIVATIVE_QUALITY):
+    """
+    Generate every derivative of one upload
+
+    Sizes are made largest first and each smaller one is resized from the
+    previous result, so the full-size image is only decoded and scaled once.
+
+    Returns:
+        dict: Size name -> derivative Path
+    """
+    kind = media_kind(path)
+    if kind is None:
+        return {}
+
+    largest = max(sizes.values())
+    if kind == "video":
+        source = extract_video_frame(path)
+    else:
+        source = Image.open(path)
+        # JPEGs decode straight to a smaller scale when the target allows it
+        source.draft("RGB", (largest, largest))
+
+    with source:
+        current = ImageOps.exif_transpose(source)
+        current = _prepare_mode(current, output_format)
+        outputs = {}
+        for size_name, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+            current = current.copy()
+            current.thumbnail((size, size), Image.LANCZOS, reducing_gap=3.0)
+            destination = derivative_path(path, size_name, output_format)
+            _save_atomic(current, destination, output_format, quality)
+            outputs[size_name] = destination
+    return outputs
+
+
+def is_fresh(original, derivative):
+    """True if the derivative exists and is not older than its original"""
+    try:
+        return os.stat(derivative).st_mtime >= os.stat(original).st_mtime
+    except FileNotFoundError:
+        return False
+
+
+class DerivativeGenerator:
+    """
+    Background thread pool generating derivatives of uploaded files
+
+    Args:
+        sizes (dict, optional): Size name -> longest side in pixels
+        output_format (str, optional): "webp" or "jpeg"
+        max_workers (int, optional): Generation threads (Pillow releases the GIL while resizing and encoding)
+    """
+
+    def __init__(self, sizes=DERIVATIVE_SIZES, output_format=DERIVATIVE_FORMAT,
+                 quality=DERIVATIVE_QUALITY, max_workers=DERIVATIVE_WORKERS):
+        if output_format not in FORMATS:
+            raise ValueError(f"Unknown derivative format '{output_format}' (expected one of {', '.join(FORMATS)})")
+        self.sizes = dict(sizes)
+        self.output_format = output_format
+        self.quality = quality
+        self.mime_type = FORMATS[output_format][2]
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="derivatives")
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self.generated = 0
+        self.failed = 0
+
+    def _render(self, path):
+        try:
+            outputs = render_derivatives(path, self.sizes, self.output_format, self.quality)
+        except Exception as e:
+            print(f"Debug - Could not generate derivatives for {path}: {e}")
+            with self._lock:
+                self.failed += 1
+            raise
+        with self._lock:
+            self.generated += 1
+        return outputs
+
+    def submit(self, path):
+        """
+        Queue derivative generation for an upload (a no-op for unsupported types)
+
+        Returns:
+            Future: Resolves to {size name: Path}; shared by concurrent requests for the same file
+        """
+        key = str(path)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._render, key)
+            self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def get(self, path, size_name, wait=DERIVATIVE_WAIT):
+        """
+        Path of a derivative, generating it first if it is missing or stale
+
+        Returns:
+            Path: The derivative, or None if the file type has none, size_name is
+                  unknown or generation takes longer than `wait`; generation errors are raised
+        """
+        if size_name not in self.sizes or media_kind(path) is None:
+            return None
+        destination = derivative_path(path, size_name, self.output_format)
+        if is_fresh(path, destination):
+            return destination
+        try:
+            outputs = self.submit(path).result(timeout=wait)
+        except FutureTimeout:
+            return None
+        return outputs.get(size_name)
+
+    def stats(self):
+        """Generation counters for monitoring"""
+        with self._lock:
+            return {"generated": self.generated, "failed": self.failed, "in_flight": len(self._in_flight)}
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=wait)
+
+
+_default_generator = None
+_default_generator_lock = threading.Lock()
+
+
+def get_derivative_generator():
+    """Process-wide DerivativeGenerator using the config.py sizes and format"""
+    global _default_generator
+    with _default_generator_lock:
+        if _default_generator is None:
+            _default_generator = DerivativeGenerator()
+        return _default_generator
@@ -0,0 +1,185 @@
+"""
+Media serving for the FestFusion Flask API
+Resolves saved filenames to their village folder, answers Range and conditional
+(ETag / Last-Modified) requests, and keeps small hot files in memory so repeat
+views skip the disk. Larger files go out through the server's file wrapper,
+which uses sendfile() under gunicorn.
+"""
+
+import io
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from flask import send_file
+
+from config import UPLOAD_FOLDER, MEDIA_CACHE_MAX_BYTES, MEDIA_CACHE_MAX_FILE_SIZE, MEDIA_MAX_AGE
+from media_store import get_media_store
+
+
+class MediaLibrary:
+    """
+    Saved-name index and byte cache over UPLOAD_FOLDER
+
+    Files live in UPLOAD_FOLDER/<village>/<saved name> (older Streamlit saves sit
+    in UPLOAD_FOLDER itself). Names are resolved lazily and remembered, so a file
+    saved by another worker process is found on its first request.
+
+    Args:
+        root (Path, optional): Upload folder to serve from
+        cache_max_bytes (int, optional): Memory budget of the byte cache
+        cache_max_file_size (int, optional): Largest file kept in memory
+    """
+
+    def __init__(self, root=UPLOAD_FOLDER, cache_max_bytes=MEDIA_CACHE_MAX_BYTES,
+                 cache_max_file_size=MEDIA_CACHE_MAX_FILE_SIZE):
+        self.root = Path(root)
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_max_file_size = cache_max_file_size
+        self._lock = threading.Lock()
+        self._index = {}
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    # --- Name index ---
+
+    def _folders(self):
+        """The upload root and every village folder (hidden store folders excluded)"""
+        folders = [self.root]
+        try:
+            with os.scandir(self.root) as entries:
+                folders.extend(Path(e.path) for e in entries
+                               if e.is_dir() and not e.name.startswith("."))
+        except FileNotFoundError:
+            pass
+        return folders
+
+    def _stat_entry(self, name, path):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        if not path.is_file():
+            return None
+        return {
+            "name": name,
+            "path": path,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "version": (stat.st_mtime_ns, stat.st_size),
+        }
+
+    def lookup(self, name):
+        """
+        Find a saved file by name
+
+        Returns:
+            dict: path, size, mtime, version and etag, or None if no such file
+        """
+        if not name or name != os.path.basename(name) or name.startswith("."):
+            return None
+
+        with self._lock:
+            known = self._index.get(name)
+        if known is not None:
+            entry = self._stat_entry(name, known["path"])
+            if entry is not None and entry["version"] == known["version"]:
+                return known
+        else:
+            entry = None
+            for folder in self._folders():
+                entry = self._stat_entry(name, folder / name)
+                if entry is not None:
+                    break
+
+        if entry is None:
+            with self._lock:
+                self._index.pop(name, None)
+                self._drop_cached(name)
+            return None
+
+        entry["etag"] = self._etag(entry)
+        with self._lock:
+            self._index[name] = entry
+            self._drop_cached(name)
+        return entry
+
+    @staticmethod
+    def _etag(entry):
+        # Content hash when the media store knows it, so every name for the same bytes shares one ETag
+        digest = get_media_store().digest_for_path(entry["path"])
+        if digest:
+            return digest
+        mtime_ns, size = entry["version"]
+        return f"{mtime_ns:x}-{size:x}"
+
+    # --- Byte cache ---
+
+    def _drop_cached(self, name):
+        cached = self._cache.pop(name, None)
+        if cached is not None:
+            self._cache_bytes -= len(cached[1])
+
+    def _cached_bytes(self, entry):
+        """File contents from memory (reading them in if small enough), or None"""
+        if entry["size"] > self.cache_max_file_size:
+            return None
+
+        name = entry["name"]
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is not None and cached[0] == entry["version"]:
+                self._cache.move_to_end(name)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        with open(entry["path"], "rb") as f:
+            data = f.read()
+        if len(data) != entry["size"]:
+            return None  # changed under us, let the disk path handle it
+
+        with self._lock:
+            self._drop_cached(name)
+            self._cache[name] = (entry["version"], data)
+            self._cache_bytes += len(data)
+            while self._cache_bytes > self.cache_max_bytes and self._cache:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+        return data
+
+    # --- Responses ---
+
+    def send(self, name):
+        """
+        Response for GET /uploads/<name>
+
+        Range requests get 206 partial content, If-None-Match / If-Modified-Since get 304.
+
+        Returns:
+            Response: Flask response, or None if no such file
+        """
+        entry = self.lookup(name)
+        if entry is None:
+            return None
+
+        data = self._cached_bytes(entry)
+        if data is not None:
+            return send_file(io.BytesIO(data), download_name=name, etag=entry["etag"],
+                             last_modified=entry["mtime"], conditional=True, max_age=MEDIA_MAX_AGE)
+        return send_file(str(entry["path"].resolve()), download_name=name, etag=entry["etag"],
+                         conditional=True, max_age=MEDIA_MAX_AGE)
+
+    def stats(self):
+        """Cache counters for monitoring"""
+        with self._lock:
+            return {
+                "indexed_files": len(self._index),
+                "cached_files": len(self._cache),
+                "cached_bytes": self._cache_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
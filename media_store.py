@@ -0,0 +1,210 @@
+"""
+Content-addressed media store for FestFusion
+Every upload is keyed by its SHA-256. Identical files share one blob on disk
+(friendly names under uploads/<village>/ are hard links to it) and a digest
+that is already on Google Drive is not uploaded again.
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config import BLOB_STORE_FOLDER, MEDIA_STORE_DB
+
+
+def sha256_bytes(data):
+    """Hex SHA-256 of an in-memory upload"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class MediaStore:
+    """
+    Blob store plus name and Drive indexes
+
+    Args:
+        root (Path, optional): Folder holding blobs as <root>/<ab>/<cd>/<digest>
+        db_path (Path, optional): SQLite index of names and Drive uploads
+    """
+
+    def __init__(self, root=BLOB_STORE_FOLDER, db_path=MEDIA_STORE_DB):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+        self._init_db()
+
+    # --- Index ---
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS names (
+                    path TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_names_digest ON names (digest)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS drive_uploads (
+                    digest TEXT PRIMARY KEY,
+                    drive_file_id TEXT NOT NULL,
+                    web_view_link TEXT,
+                    uploaded_at REAL NOT NULL
+                )
+            """)
+        finally:
+            conn.close()
+
+    def blob_path(self, digest):
+        """Location of a blob on disk"""
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def has_blob(self, digest):
+        return self.blob_path(digest).exists()
+
+    # --- Ingest ---
+
+    def adopt(self, path, digest):
+        """
+        Make an uploaded file at path share storage with the blob for its digest
+
+        If the blob exists, path is swapped for a hard link to it and the
+        duplicate bytes are freed. Otherwise path becomes the blob's first link.
+
+        Returns:
+            bool: True if the content was already stored (a duplicate upload)
+        """
+        path = Path(path)
+        blob_path = self.blob_path(digest)
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        size = path.stat().st_size
+
+        duplicate = blob_path.exists()
+        if duplicate:
+            tmp_link = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.link")
+            try:
+                os.link(blob_path, tmp_link)
+                os.replace(tmp_link, path)
+            except OSError:
+                # No hard links here (different filesystem, FAT...) - keep the plain copy
+                if tmp_link.exists():
+                    tmp_link.unlink()
+        else:
+            try:
+                os.link(path, blob_path)
+            except FileExistsError:
+                # Same content adopted concurrently; both links hold identical bytes
+                duplicate = True
+            except OSError:
+                shutil.copyfile(path, blob_path)
+
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("INSERT OR IGNORE INTO blobs (digest, size, created_at) VALUES (?, ?, ?)",
+                         (digest, size, now))
+            conn.execute("INSERT OR REPLACE INTO names (path, digest, created_at) VALUES (?, ?, ?)",
+                         (str(path.resolve()), digest, now))
+        finally:
+            conn.close()
+        return duplicate
+
+    def digest_for_path(self, path):
+        """Digest recorded for a friendly name, or None"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT digest FROM names WHERE path = ?", (str(Path(path).resolve()),)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    # --- Drive index ---
+
+    def get_drive_upload(self, digest):
+        """
+        Drive copy of a digest, if one was uploaded before
+
+        Returns:
+            dict: drive_file_id and web_view_link, or None
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT drive_file_id, web_view_link FROM drive_uploads WHERE digest = ?", (digest,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {"drive_file_id": row[0], "web_view_link": row[1]}
+
+    def record_drive_upload(self, digest, drive_file_id, web_view_link):
+        """Remember that a digest is archived in Drive"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO drive_uploads (digest, drive_file_id, web_view_link, uploaded_at) VALUES (?, ?, ?, ?)",
+                (digest, drive_file_id, web_view_link, time.time())
+            )
+        finally:
+            conn.close()
+
+    def forget_drive_upload(self, digest):
+        """Drop a Drive record, e.g. after the Drive file was deleted"""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM drive_uploads WHERE digest = ?", (digest,))
+        finally:
+            conn.close()
+
+    def stats(self):
+        """
+        Report deduplication savings
+
+        Returns:
+            dict: blob_count, name_count, stored_bytes and logical_bytes
+        """
+        conn = self._connect()
+        try:
+            blob_count, stored_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            name_count, logical_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(b.size), 0) FROM names n JOIN blobs b ON b.digest = n.digest"
+            ).fetchone()
+        finally:
+            conn.close()
+        return {
+            "blob_count": blob_count,
+            "name_count": name_count,
+            "stored_bytes": stored_bytes,
+            "logical_bytes": logical_bytes,
+        }
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_media_store():
+    """Process-wide MediaStore backed by BLOB_STORE_FOLDER"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = MediaStore()
+        return _default_store
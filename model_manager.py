@@ -0,0 +1,321 @@
+"""
+Model lifecycle manager for FestFusion
+Keeps the summarizer and transcriber out of the request path: models are
+loaded in a background thread as soon as the app starts, their readiness is
+reported through health(), and models nobody has used for a while are unloaded
+when the machine runs short of memory (and loaded again on next use).
+
+transformers and torch are only imported inside the loaders, so importing this
+module - and starting the app - stays fast.
+"""
+
+import gc
+import threading
+import time
+from contextlib import contextmanager
+
+from config import (
+    SUMMARIZATION_MODEL, TRANSCRIPTION_MODEL, MODEL_PRELOAD, MODEL_IDLE_SECONDS,
+    MODEL_MIN_AVAILABLE_MEMORY, MODEL_EVICTION_CHECK_INTERVAL
+)
+
+# Model states reported by health()
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+EVICTED = "evicted"
+
+
+def memory_status():
+    """
+    System memory, from psutil if installed, else /proc/meminfo
+
+    Returns:
+        dict: total and available bytes, or None if neither source is available
+    """
+    try:
+        import psutil
+        memory = psutil.virtual_memory()
+        return {"total": memory.total, "available": memory.available}
+    except ImportError:
+        pass
+    try:
+        values = {}
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                values[key] = int(rest.split()[0]) * 1024
+        return {"total": values["MemTotal"], "available": values["MemAvailable"]}
+    except (OSError, KeyError, ValueError, IndexError):
+        return None
+
+
+def release_freed_memory():
+    """Collect garbage and ask glibc to hand freed pages back to the OS"""
+    gc.collect()
+    try:
+        import ctypes
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class _ManagedModel:
+    def __init__(self, name, load, unload, preload):
+        self.name = name
+        self.load = load
+        self.unload = unload
+        self.preload = preload
+        self.model = None
+        self.state = NOT_LOADED
+        self.error = None
+        self.load_seconds = None
+        self.last_used = None
+        self.users = 0
+        self.lock = threading.Lock()
+
+
+class ModelManager:
+    """
+    Loads, tracks and evicts heavy models
+
+    Args:
+        idle_seconds (float, optional): Idle time after which a model may be evicted
+        min_available_memory (float, optional): Share of RAM that should stay free;
+            below it, idle models are unloaded, least recently used first
+        check_interval (float, optional): Seconds between memory checks
+    """
+
+    def __init__(self, idle_seconds=MODEL_IDLE_SECONDS, min_available_memory=MODEL_MIN_AVAILABLE_MEMORY,
+                 check_interval=MODEL_EVICTION_CHECK_INTERVAL):
+        self.idle_seconds = idle_seconds
+        self.min_available_memory = min_available_memory
+        self.check_interval = check_interval
+        self._models = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._preload_thread = None
+        self._monitor_thread = None
+
+    def register(self, name, load, unload=None, preload=True):
+        """
+        Add a model
+
+        Args:
+            name (str): Key used with use(), get() and health()
+            load (callable): Builds and returns the model
+            unload (callable, optional): Called with the model before it is dropped
+            preload (bool, optional): Load it in start()'s background thread
+        """
+        with self._lock:
+            self._models[name] = _ManagedModel(name, load, unload, preload)
+
+    # --- Loading ---
+
+    def _ensure_loaded(self, entry):
+        with entry.lock:
+            if entry.model is not None:
+                return entry.model
+            entry.state = LOADING
+            entry.error = None
+            started = time.perf_counter()
+            try:
+                entry.model = entry.load()
+            except Exception as e:
+                entry.state = FAILED
+                entry.error = str(e)
+                print(f"Debug - Loading model '{entry.name}' failed: {e}")
+                raise
+            entry.load_seconds = time.perf_counter() - started
+            entry.last_used = time.monotonic()
+            entry.state = READY
+            print(f"Debug - Model '{entry.name}' ready in {entry.load_seconds:.1f}s")
+            return entry.model
+
+    def get(self, name):
+        """
+        Return a model, loading it now (or waiting for the preload) if needed
+
+        The model is not pinned; use use() around work that must not be
+        interrupted by an eviction.
+        """
+        entry = self._models[name]
+        model = self._ensure_loaded(entry)
+        entry.last_used = time.monotonic()
+        return model
+
+    @contextmanager
+    def use(self, name):
+        """Context manager that provides a model and keeps it loaded until the block exits"""
+        entry = self._models[name]
+        with self._lock:
+            entry.users += 1
+        try:
+            yield self._ensure_loaded(entry)
+        finally:
+            with self._lock:
+                entry.users -= 1
+            entry.last_used = time.monotonic()
+
+    def _preload(self):
+        for entry in list(self._models.values()):
+            if self._stop.is_set():
+                break
+            if entry.preload:
+                try:
+                    self._ensure_loaded(entry)
+                except Exception:
+                    pass  # reported by health(); the next use() retries
+
+    # --- Eviction ---
+
+    def memory_pressure(self):
+        """True when less than min_available_memory of RAM is free"""
+        memory = memory_status()
+        if not memory or not memory["total"]:
+            return False
+        return memory["available"] / memory["total"] < self.min_available_memory
+
+    def evict(self, name):
+        """
+        Unload a model unless it is in use
+
+        Returns:
+            bool: True if the model was unloaded
+        """
+        entry = self._models[name]
+        with entry.lock:
+            with self._lock:
+                if entry.model is None or entry.users:
+                    return False
+                model, entry.model = entry.model, None
+                entry.state = EVICTED
+            if entry.unload:
+                try:
+                    entry.unload(model)
+                except Exception as e:
+                    print(f"Debug - Unloading model '{name}' failed: {e}")
+        del model
+        release_freed_memory()
+        print(f"Debug - Evicted idle model '{name}'")
+        return True
+
+    def evict_idle(self):
+        """
+        Under memory pressure, unload models idle for idle_seconds, least recently used first
+
+        Returns:
+            list: Names of the evicted models
+        """
+        evicted = []
+        now = time.monotonic()
+        idle = sorted(
+            (entry for entry in self._models.values()
+             if entry.model is not None and not entry.users and now - entry.last_used >= self.idle_seconds),
+            key=lambda entry: entry.last_used
+        )
+        for entry in idle:
+            if not self.memory_pressure():
+                break
+            if self.evict(entry.name):
+                evicted.append(entry.name)
+        return evicted
+
+    def _monitor(self):
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                print(f"Debug - Model eviction check failed: {e}")
+
+    # --- Lifecycle ---
+
+    def start(self, preload=MODEL_PRELOAD):
+        """Start the background preload (if enabled) and the memory monitor"""
+        with self._lock:
+            self._stop.clear()
+            if preload and self._preload_thread is None:
+                self._preload_thread = threading.Thread(target=self._preload, name="model-preload", daemon=True)
+                self._preload_thread.start()
+            if self._monitor_thread is None or not self._monitor_thread.is_alive():
+                self._monitor_thread = threading.Thread(target=self._monitor, name="model-monitor", daemon=True)
+                self._monitor_thread.start()
+
+    def stop(self):
+        """Stop the monitor and unload every model"""
+        self._stop.set()
+        for name in list(self._models):
+            self.evict(name)
+
+    def health(self):
+        """
+        Readiness report
+
+        Returns:
+            dict: ready (every preloaded model has loaded), models (state, error,
+                  load_seconds, idle_seconds, in_use per model) and memory
+        """
+        now = time.monotonic()
+        models = {}
+        for name, entry in self._models.items():
+            models[name] = {
+                "state": entry.state,
+                "error": entry.error,
+                "load_seconds": round(entry.load_seconds, 2) if entry.load_seconds is not None else None,
+                "idle_seconds": round(now - entry.last_used, 1) if entry.last_used is not None else None,
+                "in_use": entry.users > 0,
+            }
+        # An evicted model has loaded before and comes back on next use, so it still counts as ready
+        ready = all(entry.state in (READY, EVICTED) for entry in self._models.values() if entry.preload)
+        return {"ready": ready, "models": models, "memory": memory_status()}
+
+
+# --- FestFusion models ---
+
+def _load_summarizer():
+    from inference_backends import load_summarizer
+    from summarization_service import BatchSummarizer
+
+    service = BatchSummarizer(lambda: load_summarizer(model_name=SUMMARIZATION_MODEL))
+    service.pipeline  # load the weights now rather than on the first story
+    service.start()
+    return service
+
+
+def _load_transcriber():
+    from transcription_engine import TranscriptionEngine
+
+    engine = TranscriptionEngine(TRANSCRIPTION_MODEL)
+    try:
+        engine.warm_up()
+    except Exception:
+        engine.shutdown()
+        raise
+    return engine
+
+
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
+def get_model_manager():
+    """Process-wide ModelManager with the summarizer and transcriber registered and started"""
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            manager = ModelManager()
+            manager.register("summarizer", _load_summarizer, unload=lambda service: service.stop())
+            manager.register("transcriber", _load_transcriber, unload=lambda engine: engine.shutdown())
+            manager.start()
+            _default_manager = manager
+        return _default_manager
+
+
+if __name__ == "__main__":
+    # Run once at deploy time to download the models (and build any ONNX export) ahead of the first visitor
+    manager = get_model_manager()
+    for name in ("summarizer", "transcriber"):
+        manager.get(name)
+    print(manager.health())
+    manager.stop()
@@ -0,0 +1,192 @@
+"""
+Persistent result cache for FestFusion's AI models
+Transcripts and summaries are stored in SQLite keyed by a SHA-256 of the input
+(audio bytes or story text), the model and the generation parameters, so a
+duplicate or retried submission gets its result back without running the
+model again. The file is shared by every Streamlit session and process, and
+least recently used results are evicted once it grows past RESULT_CACHE_MAX_BYTES.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from config import RESULT_CACHE_DB, RESULT_CACHE_MAX_BYTES
+
+# Result kinds
+TRANSCRIPT = "transcript"
+SUMMARY = "summary"
+
+
+def text_digest(text):
+    """Hex SHA-256 of a story text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def cache_key(kind, input_digest, model, params=None):
+    """
+    Key for one model result
+
+    Args:
+        kind (str): TRANSCRIPT or SUMMARY
+        input_digest (str): SHA-256 of the input bytes or text
+        model (str): Model name (plus backend, if it can change the output)
+        params (dict, optional): Generation parameters such as max_length, min_length, do_sample
+
+    Returns:
+        str: Hex digest
+    """
+    material = json.dumps([kind, input_digest, model, params or {}], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite (WAL) key-value cache with LRU, size-bounded eviction
+
+    Args:
+        db_path (Path, optional): SQLite file holding the results
+        max_bytes (int, optional): Total size of stored values before eviction
+    """
+
+    def __init__(self, db_path=RESULT_CACHE_DB, max_bytes=RESULT_CACHE_MAX_BYTES):
+        self.db_path = str(db_path)
+        self.max_bytes = max_bytes
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_used ON results (last_used)")
+        finally:
+            conn.close()
+
+    def get(self, key):
+        """
+        Look up a result and mark it as recently used
+
+        Returns:
+            The stored value, or None on a miss
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            print(f"Debug - Result cache lookup failed: {e}")
+            row = None
+        finally:
+            conn.close()
+
+        with self._stats_lock:
+            if row is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, key, value, kind=""):
+        """Store a JSON-serialisable result, evicting old ones if the cache is over size"""
+        data = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, kind, value, size, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, data, len(data.encode("utf-8")), now, now)
+            )
+        except sqlite3.Error as e:
+            print(f"Debug - Result cache write failed: {e}")
+            return
+        finally:
+            conn.close()
+        self.evict()
+
+    def evict(self, max_bytes=None):
+        """
+        Delete least recently used results until the cache fits in max_bytes
+
+        Returns:
+            int: Number of results deleted
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            excess = total - max_bytes
+            victims = []
+            if excess > 0:
+                for key, size in conn.execute("SELECT key, size FROM results ORDER BY last_used"):
+                    victims.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                conn.executemany("DELETE FROM results WHERE key = ?", victims)
+            conn.execute("COMMIT")
+            return len(victims)
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            print(f"Debug - Result cache eviction failed: {e}")
+            return 0
+        finally:
+            conn.close()
+
+    def clear(self):
+        """Delete every cached result"""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM results")
+        finally:
+            conn.close()
+
+    def stats(self):
+        """
+        Report cache size and hit rate
+
+        Returns:
+            dict: entries, bytes, max_bytes, and hits/misses for this process
+        """
+        conn = self._connect()
+        try:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        finally:
+            conn.close()
+        with self._stats_lock:
+            return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes,
+                    "hits": self._hits, "misses": self._misses}
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Process-wide ResultCache backed by RESULT_CACHE_DB"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
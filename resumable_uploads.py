@@ -0,0 +1,259 @@
+"""
+Resumable chunked uploads for the FestFusion Flask API
+A client opens an upload session, sends the file in chunks by byte offset and
+finalizes it. Session state lives on disk, so an interrupted upload resumes from
+the last stored byte, and a chunk sent again is acknowledged without being rewritten.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from config import RESUMABLE_UPLOAD_FOLDER, RESUMABLE_SESSION_TTL, UPLOAD_CHUNK_SIZE
+from upload_ids import move_exclusive, place_exclusive
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+class UploadSessionError(Exception):
+    """Raised for requests that don't fit the session's state"""
+
+    def __init__(self, message, status_code=400, offset=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.offset = offset
+
+
+class ResumableUploadStore:
+    """
+    On-disk store of resumable upload sessions
+
+    Each session is a folder holding state.json and data.part.
+
+    Args:
+        root (Path, optional): Folder holding the sessions
+    """
+
+    def __init__(self, root=RESUMABLE_UPLOAD_FOLDER):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._locks_guard = threading.Lock()
+        self._locks = {}
+
+    # --- Paths and state ---
+
+    def _session_dir(self, upload_id):
+        # IDs are uuid4 hex, anything else could escape the root folder
+        if len(upload_id) != 32 or not all(c in "0123456789abcdef" for c in upload_id):
+            raise UploadSessionError("Unknown upload session", 404)
+        return self.root / upload_id
+
+    def _read_state(self, upload_id):
+        try:
+            with open(self._session_dir(upload_id) / "state.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise UploadSessionError("Unknown upload session", 404)
+
+    def _write_state(self, state):
+        session_dir = self._session_dir(state["upload_id"])
+        state["updated_at"] = time.time()
+        tmp_path = session_dir / f"state.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, session_dir / "state.json")
+
+    @contextmanager
+    def _locked(self, upload_id):
+        """Serialise writes to one session across threads and, where possible, processes"""
+        # A session removed by cleanup_expired (or never created) is a 404, not a missing lock file
+        session_dir = self._session_dir(upload_id)
+        if not session_dir.is_dir():
+            raise UploadSessionError("Unknown upload session", 404)
+        with self._locks_guard:
+            lock = self._locks.setdefault(upload_id, threading.Lock())
+        with lock:
+            if fcntl is None:
+                yield
+                return
+            try:
+                lock_file = open(session_dir / "session.lock", "a")
+            except FileNotFoundError:
+                raise UploadSessionError("Unknown upload session", 404)
+            with lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def public_state(state):
+        """Session fields safe to return to clients"""
+        return {
+            "upload_id": state["upload_id"],
+            "village": state["village"],
+            "filename": state["filename"],
+            "total_size": state["total_size"],
+            "offset": state["received"],
+            "status": "finalized" if state.get("result") else "uploading",
+        }
+
+    # --- Session lifecycle ---
+
+    def create(self, village, filename, total_size, content_type=None, sha256=None):
+        """
+        Open a new upload session
+
+        Returns:
+            dict: Initial session state
+        """
+        if total_size <= 0:
+            raise UploadSessionError("total_size must be positive")
+
+        upload_id = uuid.uuid4().hex
+        session_dir = self._session_dir(upload_id)
+        session_dir.mkdir(parents=True)
+        (session_dir / "data.part").touch()
+
+        now = time.time()
+        state = {
+            "upload_id": upload_id,
+            "village": village,
+            "filename": filename,
+            "content_type": content_type,
+            "total_size": total_size,
+            "expected_sha256": sha256.lower() if sha256 else None,
+            "received": 0,
+            "created_at": now,
+            "result": None,
+        }
+        self._write_state(state)
+        return state
+
+    def get(self, upload_id):
+        """Current session state"""
+        return self._read_state(upload_id)
+
+    def write_chunk(self, upload_id, offset, stream, length):
+        """
+        Store a chunk that starts at byte offset
+
+        Bytes the session already holds are skipped, so re-sending a chunk after
+        a lost response is harmless. A chunk that starts past the stored end is
+        rejected with the offset the client should resume from. A negative offset
+        or length is rejected before the data file is touched.
+
+        Returns:
+            dict: Updated session state
+        """
+        if offset < 0 or length < 0:
+            raise UploadSessionError("offset and length must not be negative")
+
+        with self._locked(upload_id):
+            state = self._read_state(upload_id)
+            data_path = self._session_dir(upload_id) / "data.part"
+
+            # The data file is the source of truth if a previous write died half way
+            received = min(state["received"], os.path.getsize(data_path))
+            chunk_end = offset + length
+
+            if state.get("result"):
+                raise UploadSessionError("Upload already finalized", 409, offset=received)
+            if offset > received:
+                raise UploadSessionError("Chunk starts past the stored data", 409, offset=received)
+            if chunk_end > state["total_size"]:
+                raise UploadSessionError("Chunk extends past total_size", 400, offset=received)
+
+            remaining = length
+            skip = received - offset
+            with open(data_path, "r+b") as f:
+                f.truncate(received)
+                f.seek(received)
+                while remaining > 0:
+                    chunk = stream.read(min(UPLOAD_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    if skip >= len(chunk):
+                        skip -= len(chunk)
+                        continue
+                    f.write(chunk[skip:])
+                    skip = 0
+                f.flush()
+                os.fsync(f.fileno())
+                state["received"] = max(received, f.tell())
+
+            self._write_state(state)
+            if remaining > 0:
+                raise UploadSessionError("Chunk body ended early", 400, offset=state["received"])
+            return state
+
+    def finalize(self, upload_id, make_destination, on_placed=None):
+        """
+        Verify a complete upload and move it into place
+
+        Finalizing twice returns the first result, so a client can retry safely.
+
+        Args:
+            upload_id (str): Session ID
+            make_destination (callable): Given the session state, returns (folder, make_name)
+                where make_name turns a fresh ULID into the stored filename
+            on_placed (callable, optional): Called once with the result when the file is first
+                moved into place; the dict it returns is merged into the stored result
+
+        Returns:
+            dict: Session state with its 'result' filled in
+        """
+        with self._locked(upload_id):
+            state = self._read_state(upload_id)
+            if state.get("result"):
+                return state
+            if state["received"] != state["total_size"]:
+                raise UploadSessionError("Upload is incomplete", 409, offset=state["received"])
+
+            data_path = self._session_dir(upload_id) / "data.part"
+            file_hash = hashlib.sha256()
+            with open(data_path, "rb") as f:
+                for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+                    file_hash.update(chunk)
+            sha256 = file_hash.hexdigest()
+            if state["expected_sha256"] and state["expected_sha256"] != sha256:
+                raise UploadSessionError("Checksum mismatch", 422, offset=state["received"])
+
+            folder, make_name = make_destination(state)
+            folder.mkdir(parents=True, exist_ok=True)
+            destination, _ = place_exclusive(folder, make_name, lambda path: move_exclusive(data_path, path))
+
+            state["result"] = {
+                "saved_filename": destination.name,
+                "file_path": str(destination),
+                "file_size": state["total_size"],
+                "sha256": sha256,
+            }
+            if on_placed:
+                state["result"].update(on_placed(state["result"]) or {})
+            self._write_state(state)
+            return state
+
+    def cleanup_expired(self, max_age=RESUMABLE_SESSION_TTL):
+        """Delete sessions untouched for max_age seconds. Returns how many were removed."""
+        removed = 0
+        cutoff = time.time() - max_age
+        for session_dir in self.root.iterdir():
+            try:
+                state = self._read_state(session_dir.name)
+            except UploadSessionError:
+                continue
+            if state["updated_at"] < cutoff:
+                shutil.rmtree(session_dir, ignore_errors=True)
+                removed += 1
+        return removed
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+FestFusion production server for the Flask API
+Runs flask_api.app under gunicorn with a pool of threaded workers, so uploads
+are handled in parallel. Workers are recycled after SERVER_MAX_REQUESTS and
+drain in-flight requests for up to SERVER_GRACEFUL_TIMEOUT seconds on SIGTERM.
+
+Each worker imports flask_api and so has its own pools: DERIVATIVE_WORKERS
+threads and, when IMAGE_INGEST is on, IMAGE_INGEST_WORKERS spawned processes.
+With the defaults (one worker per CPU, one ingest process per worker) that is
+at most 2 x CPU Python processes in total, instead of growing with CPU squared.
+
+Falls back to a threaded single-process server where gunicorn isn't available (Windows).
+"""
+
+import argparse
+import os
+import signal
+import threading
+
+from config import (
+    FLASK_HOST, FLASK_PORT, IMAGE_INGEST_ENABLED, IMAGE_INGEST_WORKERS,
+    SERVER_WORKERS, SERVER_THREADS, SERVER_TIMEOUT, SERVER_KEEPALIVE,
+    SERVER_GRACEFUL_TIMEOUT, SERVER_MAX_REQUESTS, SERVER_MAX_REQUESTS_JITTER
+)
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # gunicorn is POSIX-only
+    BaseApplication = None
+
+
+def server_options(host=FLASK_HOST, port=FLASK_PORT, workers=SERVER_WORKERS, threads=SERVER_THREADS):
+    """Gunicorn settings built from config.py"""
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "gthread",
+        "threads": threads,
+        "timeout": SERVER_TIMEOUT,
+        "keepalive": SERVER_KEEPALIVE,
+        "graceful_timeout": SERVER_GRACEFUL_TIMEOUT,
+        "max_requests": SERVER_MAX_REQUESTS,
+        "max_requests_jitter": SERVER_MAX_REQUESTS_JITTER,
+        "accesslog": "-",
+        "errorlog": "-",
+    }
+    # Worker heartbeats on tmpfs, so a slow disk can't make healthy workers look stuck
+    if os.path.isdir("/dev/shm"):
+        options["worker_tmp_dir"] = "/dev/shm"
+    return options
+
+
+if BaseApplication is not None:
+    class FestFusionServer(BaseApplication):
+        """Embedded gunicorn application serving flask_api.app"""
+
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Imported per worker, so each process opens its own SQLite/HTTP connections
+            from flask_api import app
+            return app
+
+
+def run_fallback_server(host, port):
+    """Threaded werkzeug server that stops cleanly on SIGTERM/SIGINT"""
+    from werkzeug.serving import make_server
+    from flask_api import app
+
+    print("Debug - gunicorn not available, using the threaded single-process server")
+    server = make_server(host, port, app, threaded=True)
+
+    def stop(signum, frame):
+        # shutdown() waits for serve_forever, so it can't run on the serving thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"FestFusion API listening on http://{host}:{port}")
+    server.serve_forever()
+    server.server_close()
+
+
+def run(host=FLASK_HOST, port=FLASK_PORT, workers=SERVER_WORKERS, threads=SERVER_THREADS):
+    """Serve the API until terminated"""
+    if BaseApplication is None:
+        run_fallback_server(host, port)
+        return
+    ingest_processes = workers * IMAGE_INGEST_WORKERS if IMAGE_INGEST_ENABLED else 0
+    print(f"FestFusion API: {workers} workers x {threads} threads on {host}:{port}, "
+          f"up to {ingest_processes} image ingest processes")
+    FestFusionServer(server_options(host, port, workers, threads)).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=FLASK_HOST)
+    parser.add_argument("--port", type=int, default=FLASK_PORT)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    parser.add_argument("--threads", type=int, default=SERVER_THREADS)
+    args = parser.parse_args()
+    run(args.host, args.port, args.workers, args.threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Header-state cache for Google Sheets appends
+Remembers which worksheets already have the expected header row so writers
+don't read row 1 every time they open the sheet. Rows themselves go through
+append_rows, which finds the end of the table on the server.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import SHEETS_HEADER_CACHE_FILE
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+def worksheet_key(worksheet):
+    """Cache key for a worksheet: spreadsheet ID plus sheet ID"""
+    return f"{worksheet.spreadsheet_id}:{worksheet.id}"
+
+
+class SheetHeaderCache:
+    """
+    Persistent per-worksheet header state, shared by every process through one JSON file
+
+    Args:
+        cache_path (Path, optional): JSON file the header state is persisted to
+    """
+
+    def __init__(self, cache_path=SHEETS_HEADER_CACHE_FILE):
+        self.cache_path = str(cache_path)
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.cache_path)
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialise read-merge-write of the cache file across threads and, where possible, processes"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.cache_path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _modify(self, change):
+        """Apply change(entries) to the file's current contents, so other processes' entries are kept"""
+        with self._file_lock():
+            self._entries = self._load()
+            if change(self._entries):
+                self._save()
+
+    def _get(self, worksheet):
+        with self._lock:
+            return dict(self._entries.get(worksheet_key(worksheet), {}))
+
+    def invalidate(self, worksheet):
+        """Forget everything cached for a worksheet"""
+        self._modify(lambda entries: entries.pop(worksheet_key(worksheet), None) is not None)
+
+    def ensure_headers(self, worksheet, headers):
+        """
+        Make sure row 1 holds the expected headers, reading it only when the cache can't vouch for it
+
+        Returns:
+            bool: True if the header row had to be rewritten
+        """
+        if self._get(worksheet).get("headers") == headers:
+            return False
+
+        current_headers = worksheet.row_values(1)
+        rewritten = current_headers != headers
+        if rewritten:
+            if current_headers:
+                worksheet.delete_rows(1)
+            worksheet.insert_row(headers, 1)
+            print(f"Debug - Sheet headers fixed: {headers}")
+
+        def store(entries):
+            entries[worksheet_key(worksheet)] = {"headers": headers, "updated_at": time.time()}
+            return True
+        self._modify(store)
+        return rewritten
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_header_cache():
+    """Process-wide SheetHeaderCache backed by SHEETS_HEADER_CACHE_FILE"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SheetHeaderCache()
+        return _default_cache
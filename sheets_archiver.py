@@ -0,0 +1,381 @@
+"""
+Write-behind Google Sheets archiver for FestFusion
+Rows are queued in a local SQLite file and a background thread sends them
+to the sheet with one append_rows call per batch.
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+import requests
+from gspread.exceptions import APIError
+
+from config import (
+    SHEETS_QUEUE_DB,
+    SHEETS_FLUSH_BATCH_SIZE,
+    SHEETS_FLUSH_INTERVAL,
+    SHEETS_MAX_RETRIES,
+    SHEETS_BACKOFF_BASE,
+    SHEETS_BACKOFF_MAX,
+)
+from sheet_header_cache import get_header_cache
+
+# Status codes that mean "slow down and try again" rather than "this row is bad"
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# A claimed batch is handed back to the queue if its flusher dies mid-flight
+CLAIM_LEASE_SECONDS = 120
+
+# How long written submission IDs are remembered so they are never queued twice
+ARCHIVED_RETENTION_SECONDS = 7 * 24 * 3600
+
+
+def is_retryable_error(error):
+    """Check if a Sheets error is a quota or transient failure"""
+    if isinstance(error, APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+class SheetsArchiver:
+    """
+    Durable queue in front of a Google Sheets worksheet
+
+    Args:
+        open_worksheet (callable): Returns the gspread worksheet to append to
+        headers (list, optional): Header row to enforce before the first flush
+        db_path (Path, optional): SQLite file holding the pending rows
+        batch_size (int, optional): Flush as soon as this many rows are pending
+        flush_interval (float, optional): Flush a partial batch after this many seconds
+        on_archived (callable, optional): Called with the submission IDs of every batch written
+    """
+
+    def __init__(self, open_worksheet, headers=None, db_path=SHEETS_QUEUE_DB,
+                 batch_size=SHEETS_FLUSH_BATCH_SIZE, flush_interval=SHEETS_FLUSH_INTERVAL,
+                 on_archived=None):
+        self.open_worksheet = open_worksheet
+        self.headers = headers
+        self.on_archived = on_archived
+        self.db_path = str(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.header_cache = get_header_cache()
+        self._worksheet = None
+        self._headers_checked = False
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+        self._owner = f"{os.getpid()}-{id(self)}"
+
+        self._stats_lock = threading.Lock()
+        self._flushed_rows = 0
+        self._flush_count = 0
+        self._last_flush_latency = None
+        self._total_flush_latency = 0.0
+        self._last_error = None
+        self._consecutive_failures = 0
+
+        self._init_db()
+
+    # --- Queue storage ---
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pending_rows (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    row_json TEXT NOT NULL,
+                    enqueued_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    claimed_by TEXT,
+                    claimed_at REAL,
+                    failed INTEGER NOT NULL DEFAULT 0,
+                    submission_id TEXT
+                )
+            """)
+            # Queues created before rows carried their submission ID
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(pending_rows)")}
+            if "submission_id" not in columns:
+                conn.execute("ALTER TABLE pending_rows ADD COLUMN submission_id TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pending_ready ON pending_rows (failed, id)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS archived_submissions (
+                    submission_id TEXT PRIMARY KEY,
+                    archived_at REAL NOT NULL
+                )
+            """)
+        finally:
+            conn.close()
+
+    def enqueue(self, row, submission_id=None):
+        """
+        Add a row to the durable queue and wake the flusher
+
+        Returns:
+            int: The queue ID, or None if this submission is already queued or was archived
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if submission_id and conn.execute(
+                """SELECT 1 FROM pending_rows WHERE submission_id = ?
+                   UNION ALL SELECT 1 FROM archived_submissions WHERE submission_id = ?""",
+                (submission_id, submission_id)
+            ).fetchone():
+                conn.execute("COMMIT")
+                return None
+            cursor = conn.execute(
+                "INSERT INTO pending_rows (row_json, enqueued_at, submission_id) VALUES (?, ?, ?)",
+                (json.dumps(row, ensure_ascii=False), time.time(), submission_id)
+            )
+            row_id = cursor.lastrowid
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        with self._wakeup:
+            self._wakeup.notify()
+        return row_id
+
+    def archived_submission_ids(self):
+        """Submission IDs written to the sheet in the last ARCHIVED_RETENTION_SECONDS"""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT submission_id FROM archived_submissions").fetchall()
+        finally:
+            conn.close()
+        return {submission_id for submission_id, in rows}
+
+    def _claim_batch(self):
+        """Claim up to batch_size ready rows so other processes skip them"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                """SELECT id, row_json, submission_id FROM pending_rows
+                   WHERE failed = 0 AND (claimed_by IS NULL OR claimed_at < ?)
+                   ORDER BY id LIMIT ?""",
+                (now - CLAIM_LEASE_SECONDS, self.batch_size)
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE pending_rows SET claimed_by = ?, claimed_at = ? WHERE id = ?",
+                    [(self._owner, now, row_id) for row_id, _, _ in rows]
+                )
+            conn.execute("COMMIT")
+            return [(row_id, json.loads(row_json), submission_id) for row_id, row_json, submission_id in rows]
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _complete_batch(self, batch):
+        """Drop a written batch and remember its submission IDs in the same transaction"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("DELETE FROM pending_rows WHERE id = ?", [(row_id,) for row_id, _, _ in batch])
+            conn.executemany(
+                "INSERT OR REPLACE INTO archived_submissions (submission_id, archived_at) VALUES (?, ?)",
+                [(submission_id, now) for _, _, submission_id in batch if submission_id]
+            )
+            conn.execute("DELETE FROM archived_submissions WHERE archived_at < ?", (now - ARCHIVED_RETENTION_SECONDS,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _release_batch(self, ids, count_attempt):
+        """Hand a failed batch back to the queue, parking rows that keep failing"""
+        conn = self._connect()
+        try:
+            if count_attempt:
+                conn.executemany(
+                    "UPDATE pending_rows SET attempts = attempts + 1 WHERE id = ?",
+                    [(row_id,) for row_id in ids]
+                )
+                conn.execute(
+                    "UPDATE pending_rows SET failed = 1 WHERE attempts >= ?",
+                    (SHEETS_MAX_RETRIES,)
+                )
+            conn.executemany(
+                "UPDATE pending_rows SET claimed_by = NULL, claimed_at = NULL WHERE id = ?",
+                [(row_id,) for row_id in ids]
+            )
+        finally:
+            conn.close()
+
+    def _pending_summary(self):
+        """Return (ready row count, enqueue time of the oldest ready row)"""
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT COUNT(*), MIN(enqueued_at) FROM pending_rows WHERE failed = 0"
+            ).fetchone()
+        finally:
+            conn.close()
+
+    # --- Sheets side ---
+
+    def _get_worksheet(self):
+        if self._worksheet is None:
+            self._worksheet = self.open_worksheet()
+            self._headers_checked = False
+
+        if self.headers and not self._headers_checked:
+            self.header_cache.ensure_headers(self._worksheet, self.headers)
+            self._headers_checked = True
+
+        return self._worksheet
+
+    def flush_once(self):
+        """
+        Send one batch to the sheet
+
+        Returns:
+            int: Number of rows written (0 if the queue was empty)
+        """
+        batch = self._claim_batch()
+        if not batch:
+            return 0
+
+        ids = [row_id for row_id, _, _ in batch]
+        rows = [row for _, row, _ in batch]
+        started = time.perf_counter()
+
+        worksheet = None
+        try:
+            worksheet = self._get_worksheet()
+            worksheet.append_rows(rows)
+        except Exception as e:
+            retryable = is_retryable_error(e)
+            if not retryable:
+                # Force a fresh client on the next attempt (expired token, deleted sheet, ...)
+                if worksheet is not None:
+                    self.header_cache.invalidate(worksheet)
+                self._worksheet = None
+            self._release_batch(ids, count_attempt=not retryable)
+            with self._stats_lock:
+                self._last_error = str(e)
+                self._consecutive_failures += 1
+            raise
+
+        self._complete_batch(batch)
+        if self.on_archived:
+            try:
+                self.on_archived([submission_id for _, _, submission_id in batch if submission_id])
+            except Exception as e:
+                print(f"Debug - Could not record archived submissions: {e}")
+        latency = time.perf_counter() - started
+        with self._stats_lock:
+            self._flushed_rows += len(rows)
+            self._flush_count += 1
+            self._last_flush_latency = latency
+            self._total_flush_latency += latency
+            self._consecutive_failures = 0
+        print(f"Debug - Archived {len(rows)} rows to Google Sheets in {latency:.2f}s")
+        return len(rows)
+
+    def flush(self):
+        """Drain the queue synchronously. Returns the number of rows written."""
+        written = 0
+        while True:
+            count = self.flush_once()
+            if count == 0:
+                return written
+            written += count
+
+    # --- Background flusher ---
+
+    def _backoff_delay(self):
+        with self._stats_lock:
+            failures = self._consecutive_failures
+        delay = min(SHEETS_BACKOFF_BASE * (2 ** (failures - 1)), SHEETS_BACKOFF_MAX)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _should_flush(self):
+        pending, oldest = self._pending_summary()
+        if not pending:
+            return False
+        return pending >= self.batch_size or time.time() - oldest >= self.flush_interval
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self._should_flush() and self.flush_once():
+                    continue
+            except Exception as e:
+                print(f"Debug - Sheets flush failed: {e}")
+                self._stop.wait(self._backoff_delay())
+                continue
+
+            with self._wakeup:
+                self._wakeup.wait(timeout=min(self.flush_interval, 1.0))
+
+        # Best-effort drain so rows queued right before shutdown are not delayed
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Debug - Final Sheets flush failed, rows stay queued: {e}")
+
+    def start(self):
+        """Start the background flusher thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sheets-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10):
+        """Stop the flusher after a final drain"""
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def stats(self):
+        """
+        Report queue depth and flush latency
+
+        Returns:
+            dict: queue_depth, failed_rows, flushed_rows, last/avg flush latency and last error
+        """
+        conn = self._connect()
+        try:
+            queue_depth, failed_rows = conn.execute(
+                "SELECT COALESCE(SUM(failed = 0), 0), COALESCE(SUM(failed = 1), 0) FROM pending_rows"
+            ).fetchone()
+        finally:
+            conn.close()
+
+        with self._stats_lock:
+            avg_latency = self._total_flush_latency / self._flush_count if self._flush_count else None
+            return {
+                "queue_depth": queue_depth,
+                "failed_rows": failed_rows,
+                "flushed_rows": self._flushed_rows,
+                "flush_count": self._flush_count,
+                "last_flush_latency": self._last_flush_latency,
+                "avg_flush_latency": avg_latency,
+                "last_error": self._last_error,
+            }
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+One-time backfill of Google Sheets history into the submission index
+Rows saved to the "FestFusion Data" sheet before the submission index existed
+only live in the sheet. This reads the sheet once and records every row that
+the index doesn't already hold, so the index (and the Parquet export built
+from it) covers the whole archive.
+
+Sheet rows carry no submission ID. A row counts as already indexed when an
+indexed submission has the same minute, district, festival and file name;
+rows that the archiver mirrored from the index match that way (one minute
+either side, as the row timestamp is taken just after the index records the
+submission). Identical rows are matched one for one, so running the backfill
+again imports nothing.
+"""
+
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta
+
+from config import GOOGLE_CREDENTIALS_FILE, GOOGLE_SHEET_NAME
+from submission_index import get_submission_index, SHEETS_SYNCED
+
+# Column positions shared by every layout the frontends have written
+SHEET_TIMESTAMP, SHEET_FILE_NAME, SHEET_DISTRICT, SHEET_ENGLISH, SHEET_FESTIVAL, SHEET_TELUGU, SHEET_LOCATION = range(7)
+
+MINUTE_FORMAT = "%Y-%m-%d %H:%M"
+LOCAL_PC_PREFIX = "Local PC: "
+
+
+def match_key(minute, district, festival_name, original_filename):
+    """Key a sheet row and an indexed submission share"""
+    return (minute, district.strip(), " ".join(festival_name.split()).casefold(), original_filename.strip())
+
+
+def _parse_timestamp(value):
+    try:
+        return datetime.fromisoformat(value.strip())
+    except (AttributeError, ValueError):
+        return None
+
+
+def _cell(row, column):
+    return row[column] if len(row) > column else ""
+
+
+def indexed_keys(index, batch_rows=50000):
+    """Counter of match keys of indexed submissions that are mirrored to Sheets"""
+    keys = Counter()
+    rowid = 0
+    while True:
+        rows = index.columns_after(rowid, ["created_at", "district", "festival_name", "original_filename",
+                                           "sheets_status"], limit=batch_rows)
+        if not rows:
+            return keys
+        for _, created_at, district, festival_name, original_filename, sheets_status in rows:
+            if sheets_status is None:
+                continue  # never written to the sheet (local story files, API-only uploads)
+            minute = datetime.fromtimestamp(created_at).strftime(MINUTE_FORMAT)
+            keys[match_key(minute, district, festival_name, original_filename)] += 1
+        rowid = rows[-1][0]
+
+
+def _take_match(keys, timestamp, row):
+    """Consume the indexed submission a sheet row mirrors, if there is one"""
+    for shift in (0, -1, 1):
+        minute = (timestamp + timedelta(minutes=shift)).strftime(MINUTE_FORMAT)
+        key = match_key(minute, _cell(row, SHEET_DISTRICT), _cell(row, SHEET_FESTIVAL), _cell(row, SHEET_FILE_NAME))
+        if keys[key] > 0:
+            keys[key] -= 1
+            return True
+    return False
+
+
+def backfill_rows(rows, index=None):
+    """
+    Record sheet rows that have no submission in the index
+
+    Args:
+        rows (list): Sheet values without the header row, as returned by get_all_values()
+        index (SubmissionIndex, optional): Index to record into
+
+    Returns:
+        dict: rows read, already_indexed, imported, and skipped (rows without a readable timestamp or district)
+    """
+    index = index if index is not None else get_submission_index()
+    keys = indexed_keys(index)
+    result = {"rows": len(rows), "already_indexed": 0, "imported": 0, "skipped": 0}
+
+    for number, row in enumerate(rows, start=2):
+        timestamp = _parse_timestamp(_cell(row, SHEET_TIMESTAMP))
+        if timestamp is None or not _cell(row, SHEET_DISTRICT).strip():
+            print(f"Debug - Sheet row {number} has no readable timestamp or district, not imported: {row}")
+            result["skipped"] += 1
+            continue
+        if _take_match(keys, timestamp, row):
+            result["already_indexed"] += 1
+            continue
+
+        location = _cell(row, SHEET_LOCATION)
+        index.record(
+            district=_cell(row, SHEET_DISTRICT).strip(),
+            festival_name=_cell(row, SHEET_FESTIVAL),
+            original_filename=_cell(row, SHEET_FILE_NAME),
+            english_summary=_cell(row, SHEET_ENGLISH),
+            telugu_summary=_cell(row, SHEET_TELUGU),
+            google_drive_link=location if location.startswith("http") else "",
+            local_file_path=location[len(LOCAL_PC_PREFIX):] if location.startswith(LOCAL_PC_PREFIX) else "",
+            source="sheets",
+            sheets_status=SHEETS_SYNCED,
+            extra={"sheet_row": number},
+            created_at=timestamp.timestamp()
+        )
+        result["imported"] += 1
+
+    print(f"Debug - Sheets backfill: {result['imported']} imported, {result['already_indexed']} already indexed, "
+          f"{result['skipped']} skipped of {result['rows']} rows")
+    return result
+
+
+def backfill_from_sheets(worksheet, index=None):
+    """Read the whole worksheet once and backfill it (see backfill_rows)"""
+    values = worksheet.get_all_values()
+    return backfill_rows(values[1:], index)
+
+
+def main():
+    from google.oauth2.service_account import Credentials
+    from google_clients import get_sheets_client
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--credentials", default=str(GOOGLE_CREDENTIALS_FILE), help="Service account JSON file")
+    parser.add_argument("--sheet", default=GOOGLE_SHEET_NAME)
+    args = parser.parse_args()
+
+    creds = Credentials.from_service_account_file(args.credentials, scopes=[
+        "https://www.googleapis.com/auth/spreadsheets",
+        "https://www.googleapis.com/auth/drive"
+    ])
+    worksheet = get_sheets_client(creds).open(args.sheet).sheet1
+    result = backfill_from_sheets(worksheet)
+    print(f"Imported {result['imported']} sheet rows into the submission index "
+          f"({result['already_indexed']} were already there, {result['skipped']} skipped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 """
 FestFusion Server Startup Script
 This script helps you start both the Flask API and Streamlit frontend
+Pass --production to run the API under the multi-worker server (serve.py)
 """
 
 import subprocess
@@ -10,6 +11,7 @@ import time
 import requests
 import os
 from pathlib import Path
+from config import SERVER_GRACEFUL_TIMEOUT
 
 def check_dependencies():
     """Check if required packages are installed"""
@@ -75,15 +77,18 @@ def wait_for_flask_api(url="http://localhost:5000", timeout=30):
     print("Flask API failed to start within timeout")
     return False
 
-def start_flask_api():
-    """Start the Flask API server"""
+def start_flask_api(production=False):
+    """Start the Flask API server (multi-worker serve.py in production mode)"""
     print("Starting Flask API server...")
     
     try:
         # Start Flask API in a subprocess
+        # Gunicorn logs every request, so let its output reach the console rather than a pipe
+        script = "serve.py" if production else "flask_api.py"
+        output = None if production else subprocess.PIPE
         flask_process = subprocess.Popen([
-            sys.executable, "flask_api.py"
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            sys.executable, script
+        ], stdout=output, stderr=output)
         
         # Wait for API to be ready
         if wait_for_flask_api():
@@ -121,6 +126,8 @@ def main():
     print("FestFusion Telangana - Server Startup")
     print("=" * 50)
     
+    production = "--production" in sys.argv
+    
     # Check dependencies
     if not check_dependencies():
         sys.exit(1)
@@ -133,7 +140,7 @@ def main():
             sys.exit(1)
     
     # Start Flask API
-    flask_process = start_flask_api()
+    flask_process = start_flask_api(production)
     if not flask_process:
         sys.exit(1)
     
@@ -167,9 +174,13 @@ def main():
     except KeyboardInterrupt:
         print("\nShutting down servers...")
         
-        # Terminate processes
+        # Terminate processes (SIGTERM lets serve.py drain in-flight uploads)
         if flask_process:
             flask_process.terminate()
+            try:
+                flask_process.wait(timeout=SERVER_GRACEFUL_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                flask_process.kill()
         if streamlit_process:
             streamlit_process.terminate()
         
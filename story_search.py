@@ -0,0 +1,322 @@
+"""
+Full-text search over FestFusion submissions
+An in-memory inverted index with BM25 ranking and district/festival facets.
+English text is lowercased, stop-worded and lightly stemmed; Telugu words are
+kept whole with common case suffixes stripped. The index follows the submission
+index incrementally, so new stories are searchable within SEARCH_REFRESH_INTERVAL.
+
+Documents are indexed as first recorded; the story and summaries are never
+edited afterwards. The one field filled in later, the Google Drive link, is
+read from the submission index for each page of results instead.
+"""
+
+import math
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+from config import SEARCH_BM25_K1, SEARCH_BM25_B, SEARCH_REFRESH_INTERVAL
+from submission_index import get_submission_index
+
+# Runs of Latin letters/digits, or of Telugu script (letters, vowel signs, virama, digits)
+TOKEN_RE = re.compile(r"[a-z0-9]+|[\u0c00-\u0c7f]+")
+
+# Joiners change rendering, not meaning
+ZERO_WIDTH_RE = re.compile("[\u200b-\u200d]")
+
+ENGLISH_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+""".split())
+
+# Longest first, so "లలో" is stripped before "లో"
+TELUGU_SUFFIXES = ("యొక్క", "లలో", "లకు", "లను", "లో", "కు", "ను", "ని", "తో", "గా", "లు")
+
+
+@lru_cache(maxsize=65536)
+def _stem_english(word):
+    """Light suffix stripping so 'festivals' and 'celebrating' match 'festival' and 'celebrate'"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 5 and word.endswith("ing"):
+        return word[:-3]
+    if len(word) > 4 and word.endswith("ed"):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("es") and word[-3] in "sxz":
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    if len(word) > 4 and word.endswith("e"):
+        return word[:-1]
+    return word
+
+
+@lru_cache(maxsize=65536)
+def _stem_telugu(word):
+    for suffix in TELUGU_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text):
+    """Split English and Telugu text into index terms"""
+    terms = []
+    for token in TOKEN_RE.findall(ZERO_WIDTH_RE.sub("", text).lower()):
+        if token[0] >= "\u0c00":
+            terms.append(_stem_telugu(token))
+        elif token not in ENGLISH_STOPWORDS:
+            terms.append(_stem_english(token))
+    return terms
+
+
+def searchable_text(submission):
+    """Text of a submission that is indexed (festival name counts twice)"""
+    festival_name = submission.get("festival_name", "")
+    return " ".join([
+        festival_name, festival_name,
+        submission.get("story_text", ""),
+        submission.get("english_summary", ""),
+        submission.get("telugu_summary", ""),
+    ])
+
+
+class StorySearchIndex:
+    """
+    Inverted index with vectorised BM25 scoring
+
+    Postings are appended as documents arrive and turned into numpy arrays on
+    first use, so an update only re-materialises the terms it touched.
+
+    Args:
+        k1 (float, optional): BM25 term-frequency saturation
+        b (float, optional): BM25 length normalisation
+    """
+
+    def __init__(self, k1=SEARCH_BM25_K1, b=SEARCH_BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+
+        self._postings = {}  # term -> (array of doc numbers, array of term frequencies)
+        self._term_arrays = {}  # term -> numpy copies of its postings, dropped when it changes
+        self._doc_lengths = array("I")
+        self._total_length = 0
+        self._facet_codes = {"district": array("I"), "festival_name": array("I")}
+        self._facet_values = {"district": [], "festival_name": []}
+        self._facet_lookup = {"district": {}, "festival_name": {}}
+        self._doc_arrays = None
+
+        self.docs = []
+        self._doc_numbers = {}
+
+        self._source = None
+        self._source_rowid = 0
+        self._last_refresh = 0.0
+
+    def __len__(self):
+        return len(self.docs)
+
+    # --- Updates ---
+
+    def _facet_code(self, facet, value):
+        lookup = self._facet_lookup[facet]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(self._facet_values[facet])
+            self._facet_values[facet].append(value)
+        return code
+
+    def add(self, submission):
+        """
+        Index one submission (a dict as returned by SubmissionIndex)
+
+        Submissions already in the index are skipped.
+
+        Returns:
+            bool: True if it was added
+        """
+        terms = tokenize(searchable_text(submission))
+        frequencies = Counter(terms)
+
+        with self._lock:
+            submission_id = submission["submission_id"]
+            if submission_id in self._doc_numbers:
+                return False
+
+            doc = len(self.docs)
+            self._doc_numbers[submission_id] = doc
+            self.docs.append({
+                "submission_id": submission_id,
+                "district": submission.get("district", ""),
+                "festival_name": submission.get("festival_name", ""),
+                "timestamp": submission.get("timestamp", ""),
+                "english_summary": submission.get("english_summary", ""),
+                "telugu_summary": submission.get("telugu_summary", ""),
+                "saved_filename": submission.get("saved_filename", ""),
+                "google_drive_link": submission.get("google_drive_link", ""),
+            })
+
+            self._doc_lengths.append(len(terms))
+            self._total_length += len(terms)
+            self._facet_codes["district"].append(self._facet_code("district", submission.get("district", "")))
+            self._facet_codes["festival_name"].append(
+                self._facet_code("festival_name", (submission.get("festival_name") or "").strip().title())
+            )
+
+            for term, tf in frequencies.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("I"), array("I"))
+                postings[0].append(doc)
+                postings[1].append(tf)
+                self._term_arrays.pop(term, None)
+            self._doc_arrays = None
+            return True
+
+    def attach(self, submission_index):
+        """Follow a SubmissionIndex: load everything now and new rows on refresh()"""
+        self._source = submission_index
+        self._source_rowid = 0
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        """
+        Pull submissions added since the last refresh (at most every SEARCH_REFRESH_INTERVAL)
+
+        Returns:
+            int: Number of submissions added
+        """
+        if self._source is None:
+            return 0
+        with self._lock:
+            now = time.time()
+            if not force and now - self._last_refresh < SEARCH_REFRESH_INTERVAL:
+                return 0
+            self._last_refresh = now
+
+            added = 0
+            while True:
+                rows = self._source.rows_after(self._source_rowid)
+                if not rows:
+                    return added
+                for rowid, submission in rows:
+                    added += self.add(submission)
+                    self._source_rowid = rowid
+
+    # --- Queries ---
+
+    def _arrays_for(self, term):
+        arrays = self._term_arrays.get(term)
+        if arrays is None:
+            postings = self._postings.get(term)
+            if postings is None:
+                return None
+            arrays = (np.frombuffer(postings[0], dtype=np.uint32).copy(),
+                      np.frombuffer(postings[1], dtype=np.uint32).astype(np.float32))
+            self._term_arrays[term] = arrays
+        return arrays
+
+    def _doc_level_arrays(self):
+        if self._doc_arrays is None:
+            self._doc_arrays = {
+                "length": np.frombuffer(self._doc_lengths, dtype=np.uint32).astype(np.float32),
+                "district": np.frombuffer(self._facet_codes["district"], dtype=np.uint32).copy(),
+                "festival_name": np.frombuffer(self._facet_codes["festival_name"], dtype=np.uint32).copy(),
+            }
+        return self._doc_arrays
+
+    def search(self, query, district=None, festival_name=None, limit=10, offset=0):
+        """
+        Rank submissions for a query with BM25
+
+        Args:
+            query (str): English and/or Telugu search text
+            district (str, optional): Only return this district
+            festival_name (str, optional): Only return this festival (case-insensitive)
+
+        Returns:
+            dict: total, results (submission fields plus score) and facets
+                  (district / festival_name -> {value: count} over all matches)
+        """
+        terms = set(tokenize(query))
+        limit = max(0, limit)
+        offset = max(0, offset)
+        empty = {"total": 0, "results": [], "facets": {"district": {}, "festival_name": {}}}
+
+        with self._lock:
+            doc_count = len(self.docs)
+            if not terms or not doc_count:
+                return empty
+
+            doc_arrays = self._doc_level_arrays()
+            avg_length = self._total_length / doc_count or 1.0
+            length_norm = self.k1 * (1 - self.b + self.b * doc_arrays["length"] / avg_length)
+
+            scores = np.zeros(doc_count, dtype=np.float32)
+            for term in terms:
+                arrays = self._arrays_for(term)
+                if arrays is None:
+                    continue
+                docs, tf = arrays
+                idf = math.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+                # A term's postings hold each document once, so plain fancy-index add is safe
+                scores[docs] += idf * tf * (self.k1 + 1) / (tf + length_norm[docs])
+
+            matches = scores > 0
+            for facet, value in (("district", district), ("festival_name", festival_name)):
+                if not value:
+                    continue
+                code = self._facet_lookup[facet].get(value.strip().title() if facet == "festival_name" else value)
+                if code is None:
+                    return empty
+                matches &= doc_arrays[facet] == code
+
+            candidates = np.flatnonzero(matches)
+            facets = {}
+            for facet in ("district", "festival_name"):
+                counts = np.bincount(doc_arrays[facet][candidates], minlength=len(self._facet_values[facet]))
+                present = np.flatnonzero(counts)
+                ordered = present[np.argsort(-counts[present], kind="stable")]
+                facets[facet] = {self._facet_values[facet][code]: int(counts[code]) for code in ordered}
+
+            wanted = offset + limit
+            candidate_scores = scores[candidates]
+            if len(candidates) > wanted:
+                top = np.argpartition(-candidate_scores, wanted - 1)[:wanted]
+            else:
+                top = np.arange(len(candidates))
+            top = top[np.argsort(-candidate_scores[top], kind="stable")][offset:]
+
+            results = []
+            for position in top:
+                doc = dict(self.docs[candidates[position]])
+                doc["score"] = round(float(candidate_scores[position]), 4)
+                results.append(doc)
+
+        if self._source is not None and results:
+            # Drive links are set after the upload finishes, long after the document was indexed
+            links = self._source.drive_links([doc["submission_id"] for doc in results])
+            for doc in results:
+                doc["google_drive_link"] = links.get(doc["submission_id"], doc["google_drive_link"])
+
+        return {"total": int(len(candidates)), "results": results, "facets": facets}
+
+
+_default_search = None
+_default_search_lock = threading.Lock()
+
+
+def get_story_search():
+    """Process-wide StorySearchIndex following the submission index"""
+    global _default_search
+    with _default_search_lock:
+        if _default_search is None:
+            search = StorySearchIndex()
+            search.attach(get_submission_index())
+            _default_search = search
+        return _default_search
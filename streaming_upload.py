@@ -0,0 +1,116 @@
+"""
+Streaming multipart ingest for the FestFusion Flask API
+Uploaded file parts are written straight to disk next to the district folders
+while being hashed and size-checked, so a request never holds the file in memory.
+"""
+
+import hashlib
+import os
+import tempfile
+
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from config import UPLOAD_INCOMING_FOLDER, MAX_UPLOAD_FILE_SIZE, UPLOAD_CHUNK_SIZE
+from upload_ids import move_exclusive
+
+
+class HashingSpoolFile:
+    """
+    Temporary upload file that hashes and counts bytes as they are written
+
+    It lives in UPLOAD_INCOMING_FOLDER (same filesystem as the district folders),
+    so commit() is a rename rather than a copy. Uncommitted files are removed on close.
+
+    Args:
+        directory (Path, optional): Where the temporary file is created
+        max_size (int, optional): Largest accepted file in bytes
+    """
+
+    def __init__(self, directory=UPLOAD_INCOMING_FOLDER, max_size=MAX_UPLOAD_FILE_SIZE):
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=str(directory), prefix="upload_", suffix=".part")
+        self._file = os.fdopen(fd, "w+b")
+        self._hash = hashlib.sha256()
+        self._committed = False
+        self.max_size = max_size
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_size and self.size > self.max_size:
+            raise RequestEntityTooLarge(f"File exceeds the {self.max_size} byte upload limit")
+        self._hash.update(data)
+        return self._file.write(data)
+
+    @property
+    def sha256(self):
+        """Hex digest of everything written so far"""
+        return self._hash.hexdigest()
+
+    def commit(self, destination):
+        """Move the finished upload to its final path (FileExistsError if it is taken)"""
+        self._file.close()
+        move_exclusive(self.path, str(destination))
+        self._committed = True
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        if not self._committed and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __getattr__(self, name):
+        # read/seek/tell/flush/readline etc. go to the underlying file
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._file, name)
+
+
+class StreamingUploadRequest(Request):
+    """Flask request class that spools every file part into a HashingSpoolFile"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        spool_file = HashingSpoolFile()
+        # Track spool files ourselves: a part that fails mid-parse never reaches request.files
+        self.__dict__.setdefault("_spool_files", []).append(spool_file)
+        return spool_file
+
+    def close(self):
+        super().close()
+        for spool_file in self.__dict__.get("_spool_files", []):
+            spool_file.close()
+
+
+def copy_stream_hashed(stream, destination, chunk_size=UPLOAD_CHUNK_SIZE):
+    """
+    Copy a readable stream to disk in fixed-size chunks while hashing it
+
+    Returns:
+        tuple: (size in bytes, sha256 hex digest)
+    """
+    file_hash = hashlib.sha256()
+    size = 0
+    with open(destination, "xb") as f:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            file_hash.update(chunk)
+            size += len(chunk)
+            f.write(chunk)
+    return size, file_hash.hexdigest()
+
+
+def store_upload(file, destination):
+    """
+    Write an uploaded FileStorage to a new file at destination without buffering it in memory
+
+    Returns:
+        tuple: (size in bytes, sha256 hex digest)
+    """
+    stream = file.stream
+    if isinstance(stream, HashingSpoolFile):
+        stream.commit(destination)
+        return stream.size, stream.sha256
+    return copy_stream_hashed(stream, destination)
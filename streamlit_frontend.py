@@ -2,15 +2,27 @@ import streamlit as st
 import os
 import tempfile
 from datetime import datetime
-import gspread
 from google.oauth2.service_account import Credentials
 from pathlib import Path
 import requests
 import json
 import pandas as pd
-from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseUpload
+from googleapiclient.errors import HttpError
 import io
+import atexit
+import time
+from sheets_archiver import SheetsArchiver
+from drive_folders import get_folder_registry
+from google_clients import get_drive_service, get_sheets_client
+from upload_jobs import UploadJobPipeline, DONE as JOB_DONE, FAILED as JOB_FAILED
+from config import UPLOAD_JOB_DRIVE_WAIT
+from media_store import get_media_store, sha256_bytes
+from upload_ids import unique_filename
+from image_ingest import get_image_ingestor
+from archive_analytics import get_archive_analytics
+from telugu_glossary import get_telugu_glossary
+from submission_index import get_submission_index, SHEETS_QUEUED
 # transformers import removed - using template-based summaries instead
 
 # Configuration
@@ -90,129 +102,6 @@ def create_telugu_summary(festival_name, selected_village):
 
 స్థానిక సంప్రదాయాలు మరియు మత ఆచారాలు ఈ ముఖ్యమైన వేడుకలో పాటించబడతాయి."""
 
-# Comprehensive Telugu translation dictionary for festival terms
-TELUGU_TRANSLATIONS = {
-    "festival": "పండుగ",
-    "celebration": "సంబరం",
-    "traditional": "సాంప్రదాయిక",
-    "cultural": "సాంస్కృతిక",
-    "significance": "ప్రాముఖ్యత",
-    "importance": "ముఖ్యత",
-    "district": "జిల్లా",
-    "village": "గ్రామం",
-    "region": "ప్రాంతం",
-    "telangana": "తెలంగాణ",
-    "india": "భారతదేశం",
-    "celebrated": "జరుపుకుంటారు",
-    "celebrating": "జరుపుకుంటున్న",
-    "traditions": "సంప్రదాయాలు",
-    "customs": "ఆచారాలు",
-    "religious": "మతపరమైన",
-    "spiritual": "ఆధ్యాత్మిక",
-    "heritage": "మార్గదర్శకత్వం",
-    "culture": "సంస్కృతి",
-    "local": "స్థానిక",
-    "community": "సమాజం",
-    "people": "ప్రజలు",
-    "family": "కుటుంబం",
-    "temple": "దేవాలయం",
-    "god": "దేవుడు",
-    "goddess": "దేవి",
-    "prayer": "ప్రార్థన",
-    "worship": "పూజ",
-    "ceremony": "వేడుక",
-    "ritual": "కర్మకాండ",
-    "offering": "నైవేద్యం",
-    "blessing": "ఆశీర్వాదం",
-    "auspicious": "శుభకరమైన",
-    "sacred": "పవిత్రమైన",
-    "holy": "పవిత్రమైన",
-    "divine": "దైవికమైన",
-    "ancient": "ప్రాచీనమైన",
-    "historical": "చారిత్రకమైన",
-    "centuries": "శతాబ్దాలు",
-    "generations": "తరాలు",
-    "ancestors": "పూర్వీకులు",
-    "elders": "ముసలివారు",
-    "youth": "యువత",
-    "children": "పిల్లలు",
-    "women": "మహిళలు",
-    "men": "పురుషులు",
-    "dance": "నృత్యం",
-    "music": "సంగీతం",
-    "song": "పాట",
-    "drum": "డోలు",
-    "bell": "గంట",
-    "flower": "పువ్వు",
-    "incense": "ధూపం",
-    "lamp": "దీపం",
-    "candle": "మొమ్మ",
-    "food": "ఆహారం",
-    "sweet": "మిఠాయి",
-    "rice": "బియ్యం",
-    "milk": "పాలు",
-    "honey": "తేనె",
-    "coconut": "కొబ్బరి",
-    "banana": "అరటి",
-    "mango": "మామిడి",
-    "color": "రంగు",
-    "red": "ఎరుపు",
-    "yellow": "పసుపు",
-    "orange": "నారింజ",
-    "green": "పచ్చ",
-    "blue": "నీలం",
-    "white": "తెలుపు",
-    "gold": "బంగారం",
-    "silver": "వెండి",
-    "beautiful": "అందమైన",
-    "wonderful": "అద్భుతమైన",
-    "amazing": "ఆశ్చర్యకరమైన",
-    "special": "ప్రత్యేకమైన",
-    "unique": "అనూహ్యమైన",
-    "famous": "ప్రసిద్ధమైన",
-    "popular": "జనాదరణ పొందిన",
-    "important": "ముఖ్యమైన",
-    "essential": "అవసరమైన",
-    "necessary": "అవసరమైన",
-    "valuable": "విలువైన",
-    "precious": "విలువైన",
-    "this": "ఇది",
-    "is": "ఉంది",
-    "a": "ఒక",
-    "in": "లో",
-    "of": "యొక్క",
-    "the": "",
-    "with": "తో",
-    "and": "మరియు",
-    "or": "లేదా",
-    "for": "కోసం",
-    "to": "కు",
-    "from": "నుండి",
-    "by": "ద్వారా",
-    "at": "వద్ద",
-    "on": "పై",
-    "about": "గురించి",
-    "detailed": "వివరమైన",
-    "summary": "సారాంశం",
-    "please": "దయచేసి",
-    "provide": "ఇవ్వండి",
-    "festival's": "పండుగ యొక్క",
-    "traditions and": "సంప్రదాయాలు మరియు",
-    "cultural importance": "సాంస్కృతిక ముఖ్యత",
-    "hyderabad": "హైదరాబాద్",
-    "bonalu": "బోనాలు",
-    "bathukamma": "బతుకమ్మ",
-    "ugadi": "ఉగాది",
-    "sankranti": "సంక్రాంతి",
-    "dasara": "దసరా",
-    "diwali": "దీపావళి",
-    "holi": "హోళీ",
-    "ramzan": "రంజాన్",
-    "christmas": "క్రిస్మస్"
-}
-
-# Translation function removed - using template-based Telugu summaries instead
-
 # Google Services Connection
 @st.cache_resource
 def get_creds():
@@ -247,62 +136,59 @@ def get_creds():
         st.error(f"Failed to load Google credentials: {e}")
         return None
 
-def save_to_sheets(village, original_filename, saved_filename, file_type, english_summary, telugu_summary, story_text="", language="", festival_name="", google_drive_link=""):
-    """Save data to Google Sheets using user-edited summaries"""
+# Column order of the "FestFusion Data" sheet
+SHEET_HEADERS = [
+    "timestamp",
+    "file_name",
+    "district_name",
+    "story[english summary]",
+    "festival_name",
+    "telugu summary",
+    "google_drive_link"
+]
+
+@st.cache_resource
+def get_sheets_archiver():
+    """Starts the background archiver that batches rows into Google Sheets."""
+    creds = get_creds()
+    if creds is None:
+        return None
+
+    def open_worksheet():
+        client = get_sheets_client(creds)
+        return client.open("FestFusion Data").sheet1
+
+    archiver = SheetsArchiver(open_worksheet, headers=SHEET_HEADERS,
+                              on_archived=get_submission_index().mark_synced)
+    archiver.start()
+    atexit.register(archiver.stop)
+    return archiver
+
+def save_to_sheets(village, original_filename, saved_filename, file_type, english_summary, telugu_summary, story_text="", language="", festival_name="", google_drive_link="", drive_job_id=None, sha256=None):
+    """Record user-edited summaries in the local index and queue them for the Google Sheets mirror"""
     try:
-        print(f"Debug - Starting save_to_sheets function")
-        creds = get_creds()
+        archiver = get_sheets_archiver()
         
-        if creds is None:
+        if archiver is None:
             st.error("Google credentials not available. Please check your Streamlit secrets configuration.")
             return False
-            
-        client = gspread.authorize(creds)
-        
-        print(f"Debug - Connected to Google Sheets")
-        spreadsheet = client.open("FestFusion Data")
-        worksheet = spreadsheet.sheet1
-        print(f"Debug - Opened worksheet: {worksheet.title}")
         
-        # Check current headers and fix if needed
-        try:
-            current_headers = worksheet.row_values(1)
-            print(f"Debug - Current headers: {current_headers}")
-            
-            correct_headers = [
-                "timestamp",
-                "file_name", 
-                "district_name",
-                "story[english summary]",
-                "festival_name",
-                "telugu summary"
-            ]
-            
-            # Only fix headers if they're wrong
-            if not current_headers or len(current_headers) < 7 or current_headers != correct_headers:
-                print(f"Debug - Fixing headers")
-                # Delete only the first row and insert correct headers
-                worksheet.delete_rows(1)
-                worksheet.insert_row(correct_headers, 1)
-                print(f"Debug - Headers fixed: {correct_headers}")
-            else:
-                print(f"Debug - Headers are already correct")
-                
-        except Exception as e:
-            print(f"Debug - Error checking/fixing headers: {e}")
-            # If there's an error, reset the sheet completely
-            worksheet.clear()
-            correct_headers = [
-                "timestamp",
-                "file_name", 
-                "district_name",
-                "story[english summary]",
-                "festival_name",
-                "telugu summary",
-                "google_drive_link"
-            ]
-            worksheet.append_row(correct_headers)
-            print(f"Debug - Sheet reset with headers: {correct_headers}")
+        # The local index is the source of truth; the sheet row mirrors it
+        submission_id = get_submission_index().record(
+            district=village,
+            festival_name=festival_name,
+            original_filename=original_filename,
+            saved_filename=saved_filename,
+            file_type=file_type,
+            language=language,
+            story_text=story_text,
+            english_summary=english_summary,
+            telugu_summary=telugu_summary,
+            google_drive_link=google_drive_link,
+            sha256=sha256,
+            source="streamlit",
+            sheets_status=SHEETS_QUEUED
+        )
         
         # Convert to list format to ensure proper column order
         row_data = [
@@ -315,33 +201,16 @@ def save_to_sheets(village, original_filename, saved_filename, file_type, englis
             google_drive_link
         ]
         
-        # Debug: Print the data being saved
-        print(f"Debug - Saving to Google Sheets:")
-        print(f"Row data: {row_data}")
-        
-        # Write data to the next row
-        try:
-            # Get all values to find the next empty row
-            all_values = worksheet.get_all_values()
-            next_row = len(all_values) + 1
-            print(f"Debug - Writing to row {next_row}")
-            
-            # Insert the row at the correct position
-            worksheet.insert_row(row_data, next_row)
-            print(f"Debug - Row inserted successfully at row {next_row}")
-            
-            # Verify the data was written
-            try:
-                written_row = worksheet.row_values(next_row)
-                print(f"Debug - Verified row {next_row}: {written_row}")
-            except Exception as e:
-                print(f"Debug - Could not verify row: {e}")
-            
-        except Exception as e:
-            print(f"Debug - Error writing data: {e}")
-            # Fallback to append
-            worksheet.append_row(row_data)
-            print(f"Debug - Row appended as fallback")
+        if drive_job_id:
+            # Let the pipeline fill in the Drive link once the background upload finishes
+            job_id = get_upload_pipeline().submit(
+                "sheets_archive", {"row": row_data, "drive_job_id": drive_job_id, "submission_id": submission_id}
+            )
+            print(f"Debug - Submitted archive job {job_id} for Google Sheets: {row_data}")
+        else:
+            # The row is durable once queued; the archiver appends it with the next batch
+            queue_id = archiver.enqueue(row_data, submission_id=submission_id)
+            print(f"Debug - Queued row {queue_id} for Google Sheets: {row_data}")
         
         return True
     except Exception as e:
@@ -349,13 +218,161 @@ def save_to_sheets(village, original_filename, saved_filename, file_type, englis
         st.error(f"Error saving to Google Sheets: {e}")
         return False
 
+def show_archive_status():
+    """Show the Sheets archiver queue depth and flush latency"""
+    archiver = get_sheets_archiver()
+    if archiver is None:
+        return
+    
+    stats = archiver.stats()
+    st.write(f"**Pending in Sheets Queue:** {stats['queue_depth']}")
+    if stats['last_flush_latency'] is not None:
+        st.write(f"**Last Sheets Flush:** {stats['last_flush_latency']:.2f}s")
+    if stats['failed_rows']:
+        st.warning(f"{stats['failed_rows']} rows could not be archived: {stats['last_error']}")
+
+def create_drive_file(drive_service, folder_id, filename, file_bytes, mimetype):
+    """Uploads bytes into a Drive folder and returns the new file's id and webViewLink."""
+    file_metadata = {
+        'name': filename,
+        'parents': [folder_id]
+    }
+    
+    media = MediaIoBaseUpload(
+        io.BytesIO(file_bytes),
+        mimetype=mimetype,
+        resumable=True
+    )
+    
+    return drive_service.files().create(
+        body=file_metadata,
+        media_body=media,
+        fields='id,webViewLink'
+    ).execute()
+
+def drive_file_exists(drive_service, file_id):
+    """Checks that a Drive file is still there (not deleted or in the trash)."""
+    try:
+        drive_file = drive_service.files().get(fileId=file_id, fields='id,trashed').execute()
+    except HttpError as e:
+        if e.resp.status == 404:
+            return False
+        # Can't tell right now - keep using the recorded copy rather than failing the upload
+        print(f"Debug - Could not check Drive file {file_id}: {e}")
+        return True
+    return not drive_file.get('trashed', False)
+
+def upload_to_drive(creds, village, filename, file_bytes, mimetype, sha256=None):
+    """Uploads a file into the district's Google Drive folder and returns its webViewLink."""
+    # Reuse this thread's pooled Drive service
+    drive_service = get_drive_service(creds)
+    
+    # Identical content already archived in Drive - reuse that copy while it still exists
+    media_store = get_media_store()
+    if sha256:
+        existing = media_store.get_drive_upload(sha256)
+        if existing and drive_file_exists(drive_service, existing["drive_file_id"]):
+            print(f"Debug - Skipping Drive upload, {sha256[:12]} already archived")
+            return existing["web_view_link"]
+        if existing:
+            print(f"Debug - Drive copy of {sha256[:12]} was deleted, uploading it again")
+            media_store.forget_drive_upload(sha256)
+    
+    # Resolve the district folder (cached, created once if missing)
+    folder_registry = get_folder_registry()
+    folder_id = folder_registry.resolve(drive_service, village)
+    
+    try:
+        file_drive = create_drive_file(drive_service, folder_id, filename, file_bytes, mimetype)
+    except HttpError as e:
+        if e.resp.status != 404:
+            raise
+        # Cached folder was deleted in Drive - resolve it again and retry once
+        folder_registry.invalidate(village)
+        folder_id = folder_registry.resolve(drive_service, village)
+        file_drive = create_drive_file(drive_service, folder_id, filename, file_bytes, mimetype)
+    
+    google_drive_link = file_drive.get('webViewLink', '')
+    if sha256:
+        media_store.record_drive_upload(sha256, file_drive['id'], google_drive_link)
+    return google_drive_link
+
+def run_drive_upload_job(creds, payload):
+    """Upload job: sends a locally saved file to Google Drive."""
+    with open(payload["file_path"], "rb") as f:
+        file_bytes = f.read()
+    
+    google_drive_link = upload_to_drive(
+        creds, payload["village"], payload["filename"], file_bytes, payload["mimetype"], sha256=payload.get("sha256")
+    )
+    return {"google_drive_link": google_drive_link}
+
+def run_sheets_archive_job(archiver, pipeline, payload):
+    """Archive job: waits for the file's Drive upload, then queues the Sheets row with its link."""
+    row_data = payload["row"]
+    submission_id = payload.get("submission_id")
+    
+    drive_job = None
+    if payload.get("drive_job_id"):
+        try:
+            drive_job = pipeline.wait(payload["drive_job_id"], timeout=UPLOAD_JOB_DRIVE_WAIT)
+        except TimeoutError as e:
+            # Don't hold a worker forever on an upload that never finishes; archive the row without the link
+            print(f"Debug - {e}, archiving the row without a Drive link")
+    if drive_job and drive_job["status"] == JOB_DONE:
+        google_drive_link = drive_job["result"]["google_drive_link"]
+        row_data[SHEET_HEADERS.index("google_drive_link")] = google_drive_link
+        if submission_id:
+            get_submission_index().set_drive_link(submission_id, google_drive_link)
+    
+    return {"queue_id": archiver.enqueue(row_data, submission_id=submission_id)}
+
+@st.cache_resource
+def get_upload_pipeline():
+    """Starts the background pipeline that runs Drive uploads and Sheets archival."""
+    creds = get_creds()
+    archiver = get_sheets_archiver()
+    
+    pipeline = UploadJobPipeline()
+    if creds is not None:
+        pipeline.register("drive_upload", lambda payload: run_drive_upload_job(creds, payload))
+    if archiver is not None:
+        pipeline.register("sheets_archive", lambda payload: run_sheets_archive_job(archiver, pipeline, payload))
+    
+    pipeline.resume_pending()
+    atexit.register(pipeline.shutdown, wait=False)
+    return pipeline
+
+def show_drive_upload_status(job_id):
+    """Shows the status of the background Google Drive upload, polling only while it is unfinished"""
+    job = get_upload_pipeline().get(job_id)
+    if job is None:
+        return
+    
+    if job["status"] == JOB_DONE:
+        st.write(f"**Google Drive:** [View file]({job['result']['google_drive_link']})")
+    elif job["status"] == JOB_FAILED:
+        st.warning(f"Google Drive upload failed: {job['error']}")
+    else:
+        poll_drive_upload_status(job_id)
+
+@st.fragment(run_every=2)
+def poll_drive_upload_status(job_id):
+    """Re-runs every 2 seconds until the upload finishes, then reruns the page once to show the result"""
+    job = get_upload_pipeline().get(job_id)
+    if job is None or job["status"] in (JOB_DONE, JOB_FAILED):
+        st.rerun()
+    st.write(f"**Google Drive:** Uploading in background ({job['status']})...")
+
 def upload_file(village, file):
     """Handles file upload - saves locally and uploads to Google Drive."""
     try:
         # Prepare file metadata
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{file.name}"
-        file_bytes = file.getvalue()
+        filename = unique_filename(file.name)
+        # Phone photos are downscaled and recompressed once, before they are stored or sent to Drive
+        file_bytes, ingest = get_image_ingestor().normalize_bytes(file.getvalue(), file.name)
+        sha256 = sha256_bytes(file_bytes)
         
         # Try local storage first (works on local machine)
         file_path = ""
@@ -374,11 +391,17 @@ def upload_file(village, file):
             
             # Save file locally
             file_path = village_dir / filename
-            with open(file_path, "wb") as f:
+            with open(file_path, "xb") as f:
                 f.write(file_bytes)
             
+            # Keep one copy on disk when the same file is submitted again
+            get_media_store().adopt(file_path, sha256)
+            
             storage_type = "local"
             storage_message = f"File saved locally: {file_path}"
+            if ingest and ingest["saved_bytes"]:
+                storage_message += (f" | Image optimised: {ingest['original_bytes'] / 1048576:.1f} MB -> "
+                                    f"{ingest['stored_bytes'] / 1048576:.1f} MB")
             
         except Exception as local_error:
             # Local storage failed (probably on Streamlit Cloud)
@@ -396,51 +419,25 @@ def upload_file(village, file):
             storage_type = "session"
             storage_message = f"File stored in session (temporary): {filename}"
         
-        # Try to upload to Google Drive
+        # Hand the Google Drive upload to the background pipeline so the form returns right away
+        drive_job_id = None
         try:
-            creds = get_creds()
-            if creds:
-                # Build Drive service
-                drive_service = build('drive', 'v3', credentials=creds)
-                
-                # Create folder structure in Drive
-                folder_name = f"FestFusion_Uploads/{village}"
-                
-                # Check if folder exists, create if not
-                folder_query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
-                folder_results = drive_service.files().list(q=folder_query).execute()
-                
-                if folder_results['files']:
-                    folder_id = folder_results['files'][0]['id']
-                else:
-                    # Create folder
-                    folder_metadata = {
-                        'name': folder_name,
-                        'mimeType': 'application/vnd.google-apps.folder'
-                    }
-                    folder = drive_service.files().create(body=folder_metadata, fields='id').execute()
-                    folder_id = folder['id']
-                
-                # Upload file to Drive
-                file_metadata = {
-                    'name': filename,
-                    'parents': [folder_id]
-                }
-                
-                media = MediaIoBaseUpload(
-                    io.BytesIO(file_bytes),
-                    mimetype=file.type,
-                    resumable=True
-                )
-                
-                file_drive = drive_service.files().create(
-                    body=file_metadata,
-                    media_body=media,
-                    fields='id,webViewLink'
-                ).execute()
-                
-                google_drive_link = file_drive.get('webViewLink', '')
-                storage_message += f" | Uploaded to Google Drive: {google_drive_link}"
+            pipeline = get_upload_pipeline()
+            if file_path and "drive_upload" in pipeline.handlers:
+                drive_job_id = pipeline.submit("drive_upload", {
+                    "file_path": str(Path(file_path).resolve()),
+                    "filename": filename,
+                    "village": village,
+                    "mimetype": file.type,
+                    "sha256": sha256
+                })
+                storage_message += f" | Google Drive upload queued: job {drive_job_id}"
+            else:
+                # Session storage leaves nothing on disk for a worker to read, so upload inline
+                creds = get_creds()
+                if creds:
+                    google_drive_link = upload_to_drive(creds, village, filename, file_bytes, file.type, sha256=sha256)
+                    storage_message += f" | Uploaded to Google Drive: {google_drive_link}"
                 
         except Exception as drive_error:
             # Google Drive upload failed, but local upload succeeded
@@ -452,9 +449,11 @@ def upload_file(village, file):
             "original_filename": file.name,
             "file_size": len(file_bytes),
             "file_type": file.type,
+            "sha256": sha256,
             "village": village,
             "file_path": str(file_path) if file_path else "",
             "google_drive_link": google_drive_link,
+            "drive_job_id": drive_job_id,
             "storage_type": storage_type
         }
         
@@ -463,24 +462,11 @@ def upload_file(village, file):
         return {"error": f"Upload error: {str(e)}"}
 
 def translate_english_to_telugu(english_text):
-    """Creates Telugu summary based on English text using smart template."""
+    """Translates the festival terms of an English summary with the Telugu glossary."""
     try:
-        # Extract key information from English text
-        lines = english_text.split('\n')
-        festival_info = lines[0] if lines else english_text
-        
-        # Create smart Telugu template based on English content
-        telugu_summary = f"""{festival_info.split(' is ')[0] if ' is ' in festival_info else 'పండుగ'} తెలంగాణలో జరుపుకునే సాంప్రదాయ పండుగ.
-
-ఈ పండుగ స్థానిక సమాజానికి గొప్ప సాంస్కృతిక మరియు మత ప్రాముఖ్యతను కలిగి ఉంది.
-
-సాంప్రదాయ ఆచారాలు, ఆరాధనలు మరియు సమాజ పాల్గొనేతో జరుపుకుంటారు.
-
-ఈ పండుగ తెలంగాణ సంపన్న సాంస్కృతిక వారసత్వాన్ని ప్రదర్శిస్తుంది మరియు సమాజ బంధాలను బలపరుస్తుంది.
-
-స్థానిక సంప్రదాయాలు మరియు మత ఆచారాలు ఈ ముఖ్యమైన వేడుకలో పాటించబడతాయి."""
-        return telugu_summary
+        return get_telugu_glossary().translate(english_text)
     except Exception as e:
+        print(f"Debug - Glossary translation failed: {e}")
         # Fallback to simple template
         return f"తెలుగు అనువాదం: {english_text}"
 
@@ -636,7 +622,7 @@ def main():
                         summary = english_summary
                 else:  # English & Telugu
                     try:
-                        # Use the sentence transformer model to translate English to Telugu
+                        # Replace festival terms using the Telugu glossary
                         telugu_summary = translate_english_to_telugu(english_summary)
                         summary = f"English: {english_summary}\n\nతెలుగు: {telugu_summary}"
                     except Exception as e:
@@ -687,6 +673,8 @@ def main():
             st.write(f"**File Size:** {upload_data['file_size']} bytes")
             st.write(f"**District:** {upload_data.get('village', selected_village)}")
             st.write(f"**Festival:** {upload_data.get('festival_name', festival_name)}")
+            if upload_data.get('drive_job_id'):
+                show_drive_upload_status(upload_data['drive_job_id'])
             
             if story_text:
                 st.markdown("### Story Text")
@@ -761,7 +749,9 @@ def main():
                     story_text=upload_data.get('story_text', story_text),
                     language=upload_data.get('language', summary_language),
                     festival_name=upload_data.get('festival_name', festival_name),
-                    google_drive_link=upload_data.get('storage_type', 'unknown')
+                    google_drive_link=upload_data.get('google_drive_link', ''),
+                    drive_job_id=upload_data.get('drive_job_id'),
+                    sha256=upload_data.get('sha256')
                 )
             
             if sheets_success:
@@ -769,6 +759,7 @@ def main():
                 st.markdown("### Database Status")
                 st.write(f"**Saved to Sheets:** Success")
                 st.write(f"**Timestamp:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                show_archive_status()
                 
                 # Add a button to start new submission instead of auto-resetting
                 st.markdown("---")
@@ -796,6 +787,8 @@ def main():
             st.write(f"**File Size:** {upload_data['file_size']} bytes")
             st.write(f"**District:** {upload_data.get('village', 'N/A')}")
             st.write(f"**Festival:** {upload_data.get('festival_name', 'N/A')}")
+            if upload_data.get('drive_job_id'):
+                show_drive_upload_status(upload_data['drive_job_id'])
             
             # Show file location based on storage type
             storage_type = upload_data.get('storage_type', 'unknown')
@@ -878,7 +871,9 @@ def main():
                     story_text=upload_data.get('story_text', ''),
                     language=upload_data.get('language', ''),
                     festival_name=upload_data.get('festival_name', ''),
-                    google_drive_link=upload_data.get('storage_type', 'unknown')
+                    google_drive_link=upload_data.get('google_drive_link', ''),
+                    drive_job_id=upload_data.get('drive_job_id'),
+                    sha256=upload_data.get('sha256')
                 )
             
             if sheets_success:
@@ -886,6 +881,7 @@ def main():
                 st.markdown("### Database Status")
                 st.write(f"**Saved to Sheets:** Success")
                 st.write(f"**Timestamp:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                show_archive_status()
                 
                 # Add a button to start new submission instead of auto-resetting
                 st.markdown("---")
@@ -899,5 +895,66 @@ def main():
             else:
                 st.error("Failed to save to Google Sheets. Please try again.")
 
+def show_analytics_dashboard():
+    """Archive analytics page: submissions by district, festival, time and media type"""
+    started = time.perf_counter()
+    analytics = get_archive_analytics()
+    analytics.refresh()
+    
+    st.markdown('<h1 class="main-header">Archive Analytics</h1>', unsafe_allow_html=True)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        districts = sorted(analytics.district_counts()["district"])
+        district = st.selectbox("District:", options=["All districts"] + districts)
+    with col2:
+        period = st.selectbox("Period:", options=["All time", "Last 30 days", "Last 365 days"])
+    with col3:
+        freq = st.radio("Timeline by:", options=["Day", "Week", "Month"], index=1, horizontal=True)
+    
+    filters = {}
+    if district != "All districts":
+        filters["district"] = district
+    if period != "All time":
+        # Start of today, so the filter (and its cached results) only change once a day
+        today = (time.time() // 86400) * 86400
+        filters["since"] = today - (30 if period == "Last 30 days" else 365) * 86400
+    
+    overview = analytics.overview(**filters)
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("Submissions", f"{overview['submissions']:,}")
+    metric_cols[1].metric("Districts", overview["districts"])
+    metric_cols[2].metric("Festivals", overview["festivals"])
+    metric_cols[3].metric("Last 7 days", f"{overview['last_7_days']:,}")
+    if not overview["submissions"]:
+        st.info("No submissions match these filters yet.")
+        return
+    
+    st.markdown("### Submissions over time")
+    st.line_chart(analytics.timeline(freq[0], **filters).set_index("period"))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("### By district")
+        st.bar_chart(analytics.district_counts(**filters).set_index("district")["submissions"])
+    with col2:
+        st.markdown("### Top festivals")
+        st.dataframe(analytics.festival_counts(**filters), hide_index=True, use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("### By media type")
+        st.bar_chart(analytics.media_breakdown(**filters).set_index("media_type")["submissions"])
+    with col2:
+        st.markdown("### Media per district")
+        st.dataframe(analytics.district_media(**filters), use_container_width=True)
+    
+    st.caption(f"{len(analytics):,} submissions in the archive - computed in "
+               f"{(time.perf_counter() - started) * 1000:.0f} ms")
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    page = st.sidebar.radio("Page", options=["Submit a Story", "Archive Analytics"])
+    if page == "Archive Analytics":
+        show_analytics_dashboard()
+    else:
+        main() 
\ No newline at end of file
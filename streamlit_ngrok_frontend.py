@@ -10,6 +10,11 @@ import json
 from datetime import datetime
 from pathlib import Path
 import time
+import atexit
+from sheets_archiver import SheetsArchiver
+from google_clients import get_sheets_client
+from submission_index import get_submission_index, SHEETS_QUEUED
+from upload_ids import new_ulid
 
 # Page configuration
 st.set_page_config(
@@ -59,26 +64,102 @@ def get_ngrok_url():
     except FileNotFoundError:
         return None
 
+# Files larger than this go through the resumable chunked upload endpoints
+RESUMABLE_UPLOAD_THRESHOLD = 16 * 1024 * 1024
+CHUNK_RETRIES = 5
+
+def upload_file_resumable(village, file, api_url):
+    """Upload a large file in chunks, resuming from the server's offset after failures"""
+    try:
+        response = requests.post(f"{api_url}/upload/resumable", json={
+            "village": village,
+            "filename": file.name,
+            "total_size": file.size,
+            "content_type": file.type
+        }, timeout=30)
+        if response.status_code != 201:
+            return {"error": response.json().get('error', 'Could not start upload')}
+        
+        session = response.json()
+        upload_id = session['upload_id']
+        chunk_size = session['chunk_size']
+        offset = session['offset']
+        failures = 0
+        
+        while offset < file.size:
+            file.seek(offset)
+            chunk = file.read(chunk_size)
+            try:
+                response = requests.put(
+                    f"{api_url}/upload/resumable/{upload_id}",
+                    params={"offset": offset},
+                    data=chunk,
+                    timeout=120
+                )
+            except requests.exceptions.RequestException as e:
+                failures += 1
+                if failures > CHUNK_RETRIES:
+                    return {"error": f"Connection error: {str(e)}"}
+                time.sleep(2 ** failures)
+                # Ask the server where to continue from
+                status = requests.get(f"{api_url}/upload/resumable/{upload_id}", timeout=30)
+                if status.status_code == 200:
+                    offset = status.json()['offset']
+                continue
+            
+            if response.status_code in (200, 409) and response.json().get('offset') is not None:
+                offset = response.json()['offset']
+                failures = 0
+            else:
+                return {"error": response.json().get('error', 'Upload failed')}
+        
+        response = requests.post(f"{api_url}/upload/resumable/{upload_id}/finalize", timeout=120)
+        if response.status_code != 200:
+            return {"error": response.json().get('error', 'Upload failed')}
+        
+        result = response.json()['data']
+        return {
+            "success": True,
+            "saved_filename": result.get('saved_filename'),
+            "original_filename": file.name,
+            "file_size": file.size,
+            "file_type": file.type,
+            "village": village,
+            "file_path": result.get('file_path'),
+            "sha256": result.get('sha256'),
+            "api_url": api_url
+        }
+        
+    except requests.exceptions.RequestException as e:
+        return {"error": f"Connection error: {str(e)}"}
+    except Exception as e:
+        return {"error": f"Upload error: {str(e)}"}
+
 def upload_file_to_api(village, file, api_url):
     """Upload file to Flask API via ngrok"""
+    if file.size > RESUMABLE_UPLOAD_THRESHOLD:
+        return upload_file_resumable(village, file, api_url)
+    
     try:
-        # Prepare the file for upload
-        files = {'file': (file.name, file.getvalue(), file.type)}
+        # Pass the file object itself so its bytes aren't copied out up front
+        file.seek(0)
+        files = {'file': (file.name, file, file.type)}
         data = {'village': village}
         
         # Upload to Flask API
         response = requests.post(f"{api_url}/upload", files=files, data=data, timeout=30)
         
         if response.status_code == 200:
-            result = response.json()
+            result = response.json()['data']
             return {
                 "success": True,
                 "saved_filename": result.get('saved_filename'),
                 "original_filename": file.name,
-                "file_size": len(file.getvalue()),
+                "file_size": file.size,
                 "file_type": file.type,
                 "village": village,
                 "file_path": result.get('file_path'),
+                "sha256": result.get('sha256'),
                 "api_url": api_url
             }
         else:
@@ -90,78 +171,136 @@ def upload_file_to_api(village, file, api_url):
     except Exception as e:
         return {"error": f"Upload error: {str(e)}"}
 
-def save_to_sheets(village, original_filename, saved_filename, file_type, english_summary, telugu_summary, story_text="", language="", festival_name="", file_path=""):
-    """Save data to Google Sheets"""
+@st.cache_resource
+def get_creds():
+    """Loads the service account credentials once, so the pooled Sheets client is reused across saves"""
+    from google.oauth2.service_account import Credentials
+    
+    scope = [
+        'https://www.googleapis.com/auth/spreadsheets',
+        'https://www.googleapis.com/auth/drive'
+    ]
+    
+    # Use Streamlit secrets for Streamlit Cloud deployment
     try:
-        # Import required modules
-        from google.oauth2.service_account import Credentials
-        import gspread
-        
-        # Get credentials
-        scope = [
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        
-        # Use Streamlit secrets for Streamlit Cloud deployment
+        return Credentials.from_service_account_info(
+            st.secrets["gcp_service_account"],
+            scopes=scope
+        )
+    except Exception as e:
+        # Fallback to local file for development
         try:
-            creds = Credentials.from_service_account_info(
-                st.secrets["gcp_service_account"],
-                scopes=scope
-            )
-        except Exception as e:
-            # Fallback to local file for development
-            try:
-                import os
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                credentials_path = os.path.join(current_dir, "festfusion-project-cc628988dd80.json")
-                creds = Credentials.from_service_account_file(credentials_path, scopes=scope)
-            except Exception as e2:
-                st.error(f"Failed to load Google credentials: {e2}")
-                return False
-        
-        client = gspread.authorize(creds)
-        spreadsheet = client.open("FestFusion Data")
-        worksheet = spreadsheet.sheet1
+            import os
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            credentials_path = os.path.join(current_dir, "festfusion-project-cc628988dd80.json")
+            return Credentials.from_service_account_file(credentials_path, scopes=scope)
+        except Exception as e2:
+            st.error(f"Failed to load Google credentials: {e2}")
+            return None
+
+# Column order of the "FestFusion Data" sheet written by this frontend
+SHEET_HEADERS = [
+    "timestamp",
+    "file_name", 
+    "district_name",
+    "story[english summary]",
+    "festival_name",
+    "telugu summary",
+    "file_location"
+]
+
+def make_sheet_row(submission):
+    """Sheet row of a submission from the local index"""
+    file_path = submission["local_file_path"]
+    return [
+        datetime.fromisoformat(submission["timestamp"]).strftime("%Y-%m-%d %H:%M"),
+        submission["original_filename"],
+        submission["district"],
+        submission["english_summary"],
+        submission["festival_name"],
+        submission["telugu_summary"],
+        f"Local PC: {file_path}" if file_path else "Uploaded via API"
+    ]
+
+def requeue_unsynced(archiver):
+    """Queues ngrok submissions recorded for Sheets that never reached the archiver queue (e.g. a crash in between)"""
+    submission_index = get_submission_index()
+    unsynced = submission_index.unsynced(source="ngrok", limit=1000)
+    
+    # Written to the sheet, but the process stopped before the index was updated
+    archived = archiver.archived_submission_ids()
+    submission_index.mark_synced([s["submission_id"] for s in unsynced if s["submission_id"] in archived])
+    
+    # enqueue skips submissions that are already queued or were archived meanwhile
+    requeued = 0
+    for submission in unsynced:
+        if submission["submission_id"] in archived:
+            continue
+        if archiver.enqueue(make_sheet_row(submission), submission_id=submission["submission_id"]) is not None:
+            requeued += 1
+    if requeued:
+        print(f"Debug - Requeued {requeued} submissions for Google Sheets")
+    return requeued
+
+@st.cache_resource
+def get_sheets_archiver():
+    """Starts the background archiver that batches rows into Google Sheets."""
+    creds = get_creds()
+    if creds is None:
+        return None
+    
+    def open_worksheet():
+        client = get_sheets_client(creds)
+        return client.open("FestFusion Data").sheet1
+    
+    archiver = SheetsArchiver(open_worksheet, headers=SHEET_HEADERS,
+                              on_archived=get_submission_index().mark_synced)
+    requeue_unsynced(archiver)
+    archiver.start()
+    atexit.register(archiver.stop)
+    return archiver
+
+def save_to_sheets(submission_id, village, original_filename, saved_filename, file_type, english_summary, telugu_summary, story_text="", language="", festival_name="", file_path="", sha256=None):
+    """
+    Record the submission in the local index and queue it for the Google Sheets mirror
+    
+    Args:
+        submission_id (str): ID generated once per upload, so a repeated save of the same upload is idempotent
+    """
+    try:
+        archiver = get_sheets_archiver()
+        if archiver is None:
+            return False
         
-        # Check and fix headers
-        try:
-            current_headers = worksheet.row_values(1)
-            correct_headers = [
-                "timestamp",
-                "file_name", 
-                "district_name",
-                "story[english summary]",
-                "festival_name",
-                "telugu summary",
-                "file_location"
-            ]
-            
-            if not current_headers or len(current_headers) < 7 or current_headers != correct_headers:
-                worksheet.delete_rows(1)
-                worksheet.insert_row(correct_headers, 1)
-                
-        except Exception as e:
-            worksheet.clear()
-            worksheet.append_row(correct_headers)
+        submission_index = get_submission_index()
         
-        # Prepare row data
-        file_location = f"Local PC: {file_path}" if file_path else "Uploaded via API"
-        row_data = [
-            datetime.now().strftime("%Y-%m-%d %H:%M"),
-            original_filename,
-            village,
-            english_summary,
-            festival_name,
-            telugu_summary,
-            file_location
-        ]
+        # A retried save of the same upload reuses its first record instead of archiving it twice
+        existing = submission_index.get(submission_id)
+        if existing:
+            print(f"Debug - Submission {submission_id} already recorded, not saving it again")
+            if existing["sheets_status"] == SHEETS_QUEUED:
+                archiver.enqueue(make_sheet_row(existing), submission_id=submission_id)
+            return True
         
-        # Write to sheet
-        all_values = worksheet.get_all_values()
-        next_row = len(all_values) + 1
-        worksheet.insert_row(row_data, next_row)
+        submission_id = submission_index.record(
+            district=village,
+            festival_name=festival_name,
+            original_filename=original_filename,
+            saved_filename=saved_filename,
+            file_type=file_type,
+            language=language,
+            story_text=story_text,
+            english_summary=english_summary,
+            telugu_summary=telugu_summary,
+            local_file_path=file_path,
+            sha256=sha256,
+            source="ngrok",
+            sheets_status=SHEETS_QUEUED,
+            submission_id=submission_id
+        )
         
+        # The row is durable once queued; the archiver appends it with the next batch
+        archiver.enqueue(make_sheet_row(submission_index.get(submission_id)), submission_id=submission_id)
         return True
         
     except Exception as e:
@@ -316,6 +455,7 @@ def main():
                     # Store data in session state
                     st.session_state.upload_data = {
                         **upload_result,
+                        'submission_id': new_ulid(),
                         'festival_name': festival_name,
                         'story_text': story_text,
                         'english_summary': english_summary,
@@ -390,6 +530,7 @@ def main():
         if st.button("Confirm and Save to Google Sheets", type="primary", use_container_width=True):
             with st.spinner("Saving to Google Sheets..."):
                 sheets_success = save_to_sheets(
+                    submission_id=upload_data["submission_id"],
                     village=upload_data.get('village', selected_village),
                     original_filename=upload_data["original_filename"],
                     saved_filename=upload_data["saved_filename"],
@@ -399,7 +540,8 @@ def main():
                     story_text=upload_data.get('story_text', story_text),
                     language=summary_language,
                     festival_name=upload_data.get('festival_name', festival_name),
-                    file_path=upload_data.get('file_path', '')
+                    file_path=upload_data.get('file_path', ''),
+                    sha256=upload_data.get('sha256')
                 )
             
             if sheets_success:
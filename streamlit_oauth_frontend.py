@@ -11,6 +11,9 @@ import os
 from datetime import datetime
 from pathlib import Path
 import tempfile
+from upload_ids import open_exclusive
+from media_store import sha256_bytes
+from submission_index import get_submission_index
 from google_oauth_config import (
     get_oauth_credentials, 
     upload_file_to_drive, 
@@ -313,15 +316,33 @@ def save_story_locally(story_data, uploaded_file):
     upload_dir.mkdir(exist_ok=True)
     
     # Save uploaded file if provided
+    file_path = None
     if uploaded_file:
-        file_path = upload_dir / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uploaded_file.name}"
-        with open(file_path, "wb") as f:
+        file_path, f = open_exclusive(upload_dir, lambda ulid: f"{ulid}_{uploaded_file.name}")
+        with f:
             f.write(uploaded_file.getbuffer())
         story_data["local_file_path"] = str(file_path)
     
+    # Record it in the local submission index (no Sheets mirror from this frontend)
+    story_data["submission_id"] = get_submission_index().record(
+        district=story_data["village"],
+        festival_name=story_data["festival_name"],
+        original_filename=uploaded_file.name if uploaded_file else "",
+        saved_filename=file_path.name if file_path else "",
+        file_type=uploaded_file.type if uploaded_file else "",
+        story_text=story_data["story_text"],
+        local_file_path=str(file_path) if file_path else "",
+        sha256=sha256_bytes(uploaded_file.getbuffer()) if uploaded_file else None,
+        source="oauth",
+        extra={
+            "contact_email": story_data.get("contact_email", ""),
+            "additional_notes": story_data.get("additional_notes", ""),
+        }
+    )
+    
     # Save story data as JSON
-    story_file = upload_dir / f"story_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(story_file, "w", encoding="utf-8") as f:
+    story_file, f = open_exclusive(upload_dir, lambda ulid: f"story_{ulid}.json", mode="x")
+    with f:
         json.dump(story_data, f, indent=2, ensure_ascii=False)
 
 def upload_to_google_drive(story_data, uploaded_file):
@@ -0,0 +1,286 @@
+"""
+Local submission index for FestFusion
+Every archived story is recorded in a SQLite table first; Google Sheets is kept
+as an asynchronous mirror by the Sheets archiver. Listing, filtering and
+duplicate checks run against this table instead of downloading the sheet.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from config import SUBMISSIONS_DB
+from upload_ids import new_ulid
+
+# Sheets mirror state of a submission
+SHEETS_QUEUED = "queued"
+SHEETS_SYNCED = "synced"
+
+COLUMNS = (
+    "submission_id", "created_at", "district", "festival_name", "original_filename",
+    "saved_filename", "file_type", "language", "story_text", "english_summary",
+    "telugu_summary", "google_drive_link", "local_file_path", "sha256", "source",
+    "sheets_status", "sheets_synced_at", "extra_json",
+)
+
+
+class SubmissionIndex:
+    """
+    SQLite (WAL) table of submissions with district, festival and time indexes
+
+    Args:
+        db_path (Path, optional): SQLite file holding the index
+    """
+
+    def __init__(self, db_path=SUBMISSIONS_DB):
+        self.db_path = str(db_path)
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS submissions (
+                    submission_id TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    district TEXT NOT NULL,
+                    festival_name TEXT NOT NULL DEFAULT '',
+                    original_filename TEXT NOT NULL DEFAULT '',
+                    saved_filename TEXT NOT NULL DEFAULT '',
+                    file_type TEXT NOT NULL DEFAULT '',
+                    language TEXT NOT NULL DEFAULT '',
+                    story_text TEXT NOT NULL DEFAULT '',
+                    english_summary TEXT NOT NULL DEFAULT '',
+                    telugu_summary TEXT NOT NULL DEFAULT '',
+                    google_drive_link TEXT NOT NULL DEFAULT '',
+                    local_file_path TEXT NOT NULL DEFAULT '',
+                    sha256 TEXT,
+                    source TEXT NOT NULL DEFAULT '',
+                    sheets_status TEXT,
+                    sheets_synced_at REAL,
+                    extra_json TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_submissions_district ON submissions (district, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_submissions_festival ON submissions (festival_name COLLATE NOCASE, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_submissions_created ON submissions (created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_submissions_sha256 ON submissions (sha256)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_submissions_sheets ON submissions (sheets_status)")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_dict(row):
+        submission = {column: row[column] for column in COLUMNS if column != "extra_json"}
+        submission["extra"] = json.loads(row["extra_json"]) if row["extra_json"] else {}
+        submission["timestamp"] = datetime.fromtimestamp(row["created_at"]).isoformat()
+        return submission
+
+    # --- Writes ---
+
+    def record(self, district, festival_name="", original_filename="", saved_filename="", file_type="",
+               language="", story_text="", english_summary="", telugu_summary="", google_drive_link="",
+               local_file_path="", sha256=None, source="", sheets_status=None, extra=None, created_at=None,
+               submission_id=None):
+        """
+        Add a submission
+
+        Args:
+            sheets_status (str, optional): SHEETS_QUEUED if the caller is mirroring it to Sheets
+            extra (dict, optional): Frontend-specific fields (contact email, notes...)
+            submission_id (str, optional): ID chosen by the caller (from new_ulid), so a retried save can find its record
+
+        Returns:
+            str: The submission ID (a ULID, so IDs sort by creation time)
+        """
+        submission_id = submission_id or new_ulid()
+        conn = self._connect()
+        try:
+            conn.execute(
+                f"INSERT INTO submissions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                (submission_id, created_at or time.time(), district, festival_name or "",
+                 original_filename or "", saved_filename or "", file_type or "", language or "",
+                 story_text or "", english_summary or "", telugu_summary or "", google_drive_link or "",
+                 local_file_path or "", sha256 or None, source, sheets_status, None,
+                 json.dumps(extra, ensure_ascii=False) if extra else None)
+            )
+        finally:
+            conn.close()
+        return submission_id
+
+    def set_drive_link(self, submission_id, google_drive_link):
+        """Fill in the Drive link once a background upload finishes"""
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE submissions SET google_drive_link = ? WHERE submission_id = ?",
+                         (google_drive_link, submission_id))
+        finally:
+            conn.close()
+
+    def drive_links(self, submission_ids):
+        """
+        Current Drive links of some submissions
+
+        Returns:
+            dict: submission_id -> google_drive_link
+        """
+        if not submission_ids:
+            return {}
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"""SELECT submission_id, google_drive_link FROM submissions
+                    WHERE submission_id IN ({', '.join('?' * len(submission_ids))})""",
+                list(submission_ids)
+            ).fetchall()
+        finally:
+            conn.close()
+        return {row["submission_id"]: row["google_drive_link"] for row in rows}
+
+    def mark_synced(self, submission_ids):
+        """Record that these submissions are now in the Sheets mirror"""
+        submission_ids = [s for s in submission_ids if s]
+        if not submission_ids:
+            return
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.executemany(
+                "UPDATE submissions SET sheets_status = ?, sheets_synced_at = ? WHERE submission_id = ?",
+                [(SHEETS_SYNCED, now, submission_id) for submission_id in submission_ids]
+            )
+        finally:
+            conn.close()
+
+    # --- Queries ---
+
+    def get(self, submission_id):
+        """One submission as a dict, or None"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM submissions WHERE submission_id = ?", (submission_id,)).fetchone()
+        finally:
+            conn.close()
+        return self._to_dict(row) if row else None
+
+    @staticmethod
+    def _where(district=None, festival_name=None, since=None, until=None):
+        clauses, params = [], []
+        if district:
+            clauses.append("district = ?")
+            params.append(district)
+        if festival_name:
+            clauses.append("festival_name = ? COLLATE NOCASE")
+            params.append(festival_name)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def list(self, district=None, festival_name=None, since=None, until=None, limit=100, offset=0):
+        """
+        Newest-first submissions matching the filters
+
+        Args:
+            district (str, optional): Exact district name
+            festival_name (str, optional): Festival name, case-insensitive
+            since (float, optional): Unix time lower bound (inclusive)
+            until (float, optional): Unix time upper bound (exclusive)
+
+        Returns:
+            list: Submission dicts
+        """
+        where, params = self._where(district, festival_name, since, until)
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT * FROM submissions{where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._to_dict(row) for row in rows]
+
+    def count(self, district=None, festival_name=None, since=None, until=None):
+        """Number of submissions matching the filters"""
+        where, params = self._where(district, festival_name, since, until)
+        conn = self._connect()
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM submissions{where}", params).fetchone()[0]
+        finally:
+            conn.close()
+
+    def rows_after(self, rowid, limit=1000):
+        """
+        Submissions added after a given SQLite rowid, for incremental consumers
+
+        Returns:
+            list: (rowid, submission dict) pairs in insertion order
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT rowid, * FROM submissions WHERE rowid > ? ORDER BY rowid LIMIT ?", (rowid, limit)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [(row["rowid"], self._to_dict(row)) for row in rows]
+
+    def columns_after(self, rowid, columns, limit=50000):
+        """
+        Selected columns of submissions added after a given rowid, without the story texts
+
+        Args:
+            columns (list): Names from COLUMNS
+
+        Returns:
+            list: (rowid, *columns) tuples in insertion order
+        """
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown submission columns: {', '.join(sorted(unknown))}")
+        conn = self._connect()
+        try:
+            return conn.execute(
+                f"SELECT rowid, {', '.join(columns)} FROM submissions WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (rowid, limit)
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def unsynced(self, source=None, limit=100):
+        """Submissions queued for Sheets that haven't reached it yet, oldest first (optionally from one frontend)"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"""SELECT * FROM submissions WHERE sheets_status = ?{' AND source = ?' if source else ''}
+                    ORDER BY created_at LIMIT ?""",
+                (SHEETS_QUEUED, source, limit) if source else (SHEETS_QUEUED, limit)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._to_dict(row) for row in rows]
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_submission_index():
+    """Process-wide SubmissionIndex backed by SUBMISSIONS_DB"""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = SubmissionIndex()
+        return _default_index
@@ -0,0 +1,297 @@
+"""
+Batched summarization service for FestFusion
+Requests from all Streamlit sessions are collected into micro-batches, sorted
+by token length so little padding is wasted, and sent through the transformers
+summarization pipeline in one forward pass per batch. Stories longer than the
+model's context are summarised in overlapping windows and then reduced.
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout, as_completed
+
+from config import (
+    SUMMARY_MAX_BATCH_SIZE, SUMMARY_BATCH_WAIT, SUMMARY_MAX_LENGTH, SUMMARY_MIN_LENGTH,
+    SUMMARY_WINDOW_TOKENS, SUMMARY_WINDOW_OVERLAP, SUMMARY_PARTIAL_MAX_LENGTH, SUMMARY_PARTIAL_MIN_LENGTH
+)
+
+# Sentence ends (including the Devanagari/Telugu danda) and line breaks
+SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?\u0964])\s+|\n+")
+
+
+class BatchSummarizer:
+    """
+    Micro-batching front end for a summarization pipeline
+
+    Args:
+        load_pipeline (callable): Returns the transformers pipeline; called once, on first use
+        max_batch_size (int, optional): Most stories per forward pass
+        max_wait (float, optional): Seconds the first request waits for others to join its batch
+    """
+
+    def __init__(self, load_pipeline, max_batch_size=SUMMARY_MAX_BATCH_SIZE, max_wait=SUMMARY_BATCH_WAIT):
+        self.load_pipeline = load_pipeline
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._pipeline = None
+        self._pipeline_lock = threading.Lock()
+        self._pending = []
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._stories = 0
+        self._busy_seconds = 0.0
+
+    # --- Model ---
+
+    @property
+    def pipeline(self):
+        with self._pipeline_lock:
+            if self._pipeline is None:
+                self._pipeline = self.load_pipeline()
+            return self._pipeline
+
+    def token_length(self, text):
+        """Input length in model tokens (whitespace words if the pipeline has no tokenizer)"""
+        tokenizer = getattr(self.pipeline, "tokenizer", None)
+        if tokenizer is None:
+            return len(text.split())
+        return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+    def split_windows(self, text, window_tokens=SUMMARY_WINDOW_TOKENS, overlap_tokens=SUMMARY_WINDOW_OVERLAP):
+        """
+        Split text into sentence-aligned windows of at most window_tokens
+
+        Each window after the first starts with up to overlap_tokens of trailing
+        sentences from the one before, so nothing is cut off from its context.
+
+        Returns:
+            list: Window texts (a single item if the text already fits)
+        """
+        pieces = []
+        for sentence in SENTENCE_BREAK_RE.split(text):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            length = self.token_length(sentence)
+            if length <= window_tokens:
+                pieces.append((sentence, length))
+                continue
+            # Unpunctuated run (common in transcripts): cut it by words
+            words = sentence.split()
+            step = max(1, len(words) * window_tokens // (length + 1))
+            for start in range(0, len(words), step):
+                part = " ".join(words[start:start + step])
+                pieces.append((part, self.token_length(part)))
+
+        windows = []
+        current, current_length = [], 0
+        for piece, length in pieces:
+            if current and current_length + length > window_tokens:
+                windows.append(" ".join(p for p, _ in current))
+                # Carry the tail of this window into the next one
+                carried, carried_length = [], 0
+                for previous, previous_length in reversed(current):
+                    if carried_length + previous_length > overlap_tokens:
+                        break
+                    carried.insert(0, (previous, previous_length))
+                    carried_length += previous_length
+                if carried_length + length > window_tokens:
+                    carried, carried_length = [], 0
+                current, current_length = carried, carried_length
+            current.append((piece, length))
+            current_length += length
+        if current:
+            windows.append(" ".join(p for p, _ in current))
+        return windows
+
+    def summarize_many(self, texts, max_length=SUMMARY_MAX_LENGTH, min_length=SUMMARY_MIN_LENGTH):
+        """
+        Summarize a list of texts directly, in length-sorted batches of max_batch_size
+
+        Returns:
+            list: Summary strings, in input order
+        """
+        if not texts:
+            return []
+        lengths = [self.token_length(text) for text in texts]
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+
+        summaries = [None] * len(texts)
+        for start in range(0, len(order), self.max_batch_size):
+            batch = order[start:start + self.max_batch_size]
+            outputs = self.pipeline(
+                [texts[i] for i in batch],
+                batch_size=len(batch),
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False,
+                truncation=True
+            )
+            for i, output in zip(batch, outputs):
+                # A list input returns one dict per text (a list of dicts with num_return_sequences)
+                if isinstance(output, list):
+                    output = output[0]
+                summaries[i] = output["summary_text"]
+        return summaries
+
+    # --- Request queue ---
+
+    def submit(self, text, max_length=SUMMARY_MAX_LENGTH, min_length=SUMMARY_MIN_LENGTH):
+        """
+        Queue one story for the next batch
+
+        Returns:
+            Future: Resolves to the summary string
+        """
+        future = Future()
+        with self._wakeup:
+            self._pending.append((text, max_length, min_length, future))
+            self._wakeup.notify()
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        return future
+
+    def summarize(self, text, max_length=SUMMARY_MAX_LENGTH, min_length=SUMMARY_MIN_LENGTH, timeout=None):
+        """Summarize one story, sharing a forward pass with concurrent callers"""
+        future = self.submit(text, max_length, min_length)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            future.cancel()  # dropped from its batch if it hasn't started yet
+            raise
+
+    def summarize_long(self, text, max_length=SUMMARY_MAX_LENGTH, min_length=SUMMARY_MIN_LENGTH, timeout=None):
+        """
+        Map-reduce summarization for text longer than the model's context
+
+        Windows are summarised through the batching queue, the partial summaries
+        are joined and split again, until the result fits in one window and gets
+        the final summary. Only window texts and summaries are held in memory.
+
+        Args:
+            timeout (float, optional): Seconds for the whole summary; raises
+                concurrent.futures.TimeoutError and drops unstarted windows when exceeded
+
+        Yields:
+            dict: Progress updates - stage ('map' or 'done'), level, completed,
+                  total, partials (summaries so far, in order) and, when done, summary
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        def remaining():
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        level = 0
+        while True:
+            windows = self.split_windows(text)
+            if len(windows) <= 1:
+                summary = self.summarize(windows[0] if windows else text, max_length, min_length, remaining())
+                yield {"stage": "done", "level": level, "completed": 1, "total": 1,
+                       "partials": [], "summary": summary}
+                return
+
+            level += 1
+            futures = {
+                self.submit(window, SUMMARY_PARTIAL_MAX_LENGTH, SUMMARY_PARTIAL_MIN_LENGTH): index
+                for index, window in enumerate(windows)
+            }
+            partials = [None] * len(windows)
+            try:
+                for completed, future in enumerate(as_completed(futures, timeout=remaining()), start=1):
+                    partials[futures[future]] = future.result()
+                    yield {"stage": "map", "level": level, "completed": completed, "total": len(windows),
+                           "partials": [p for p in partials if p is not None]}
+            finally:
+                # Timed out or abandoned by the caller: don't spend batches on the rest
+                for future in futures:
+                    future.cancel()
+
+            text = "\n".join(partials)
+
+    def _take_batch(self):
+        """Wait for a request, then for up to max_wait while the batch fills"""
+        with self._wakeup:
+            while not self._pending and not self._stop.is_set():
+                self._wakeup.wait(timeout=1.0)
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < self.max_batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._wakeup.wait(timeout=remaining)
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            return batch
+
+    def _run_batch(self, batch):
+        # Requests with different generation settings can't share a forward pass
+        groups = {}
+        for text, max_length, min_length, future in batch:
+            if future.set_running_or_notify_cancel():
+                groups.setdefault((max_length, min_length), []).append((text, future))
+
+        started = time.perf_counter()
+        for (max_length, min_length), items in groups.items():
+            try:
+                summaries = self.summarize_many([text for text, _ in items], max_length, min_length)
+            except Exception as e:
+                print(f"Debug - Summarization batch of {len(items)} failed: {e}")
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            for (_, future), summary in zip(items, summaries):
+                future.set_result(summary)
+
+        with self._stats_lock:
+            self._batches += 1
+            self._stories += sum(len(items) for items in groups.values())
+            self._busy_seconds += time.perf_counter() - started
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._take_batch()
+            if batch:
+                self._run_batch(batch)
+        # Don't leave callers blocked on requests that will never run
+        with self._wakeup:
+            leftover, self._pending = self._pending, []
+        for _, _, _, future in leftover:
+            future.cancel()
+
+    def start(self):
+        """Start the batching thread"""
+        with self._wakeup:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="summarizer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=30):
+        """Stop the batching thread after the batch in progress"""
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def stats(self):
+        """
+        Report batching efficiency
+
+        Returns:
+            dict: batches, stories, avg_batch_size and stories_per_second (while busy)
+        """
+        with self._stats_lock:
+            return {
+                "batches": self._batches,
+                "stories": self._stories,
+                "avg_batch_size": self._stories / self._batches if self._batches else None,
+                "stories_per_second": self._stories / self._busy_seconds if self._busy_seconds else None,
+            }
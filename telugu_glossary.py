@@ -0,0 +1,415 @@
+"""
+Telugu glossary translation for FestFusion
+Compiles TELUGU_TRANSLATIONS (and an optional larger glossary file) into an
+Aho-Corasick automaton and replaces every glossary term in one pass over the
+text. Matching is case-insensitive and whole-word, and where terms overlap the
+leftmost, then longest, one wins ("traditions and" before "traditions").
+The glossary file is reloaded when it changes, without a restart.
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+import unicodedata
+from pathlib import Path
+
+from config import TELUGU_GLOSSARY_FILE, TELUGU_GLOSSARY_CHECK_INTERVAL
+
+# Comprehensive Telugu translation dictionary for festival terms
+TELUGU_TRANSLATIONS = {
+    "festival": "పండుగ",
+    "celebration": "సంబరం",
+    "traditional": "సాంప్రదాయిక",
+    "cultural": "సాంస్కృతిక",
+    "significance": "ప్రాముఖ్యత",
+    "importance": "ముఖ్యత",
+    "district": "జిల్లా",
+    "village": "గ్రామం",
+    "region": "ప్రాంతం",
+    "telangana": "తెలంగాణ",
+    "india": "భారతదేశం",
+    "celebrated": "జరుపుకుంటారు",
+    "celebrating": "జరుపుకుంటున్న",
+    "traditions": "సంప్రదాయాలు",
+    "customs": "ఆచారాలు",
+    "religious": "మతపరమైన",
+    "spiritual": "ఆధ్యాత్మిక",
+    "heritage": "వారసత్వం",
+    "culture": "సంస్కృతి",
+    "local": "స్థానిక",
+    "community": "సమాజం",
+    "people": "ప్రజలు",
+    "family": "కుటుంబం",
+    "temple": "దేవాలయం",
+    "god": "దేవుడు",
+    "goddess": "దేవి",
+    "prayer": "ప్రార్థన",
+    "worship": "పూజ",
+    "ceremony": "వేడుక",
+    "ritual": "కర్మకాండ",
+    "offering": "నైవేద్యం",
+    "blessing": "ఆశీర్వాదం",
+    "auspicious": "శుభకరమైన",
+    "sacred": "పవిత్రమైన",
+    "holy": "పవిత్రమైన",
+    "divine": "దైవికమైన",
+    "ancient": "ప్రాచీనమైన",
+    "historical": "చారిత్రకమైన",
+    "centuries": "శతాబ్దాలు",
+    "generations": "తరాలు",
+    "ancestors": "పూర్వీకులు",
+    "elders": "పెద్దలు",
+    "youth": "యువత",
+    "children": "పిల్లలు",
+    "women": "మహిళలు",
+    "men": "పురుషులు",
+    "dance": "నృత్యం",
+    "music": "సంగీతం",
+    "song": "పాట",
+    "drum": "డోలు",
+    "bell": "గంట",
+    "flower": "పువ్వు",
+    "incense": "ధూపం",
+    "lamp": "దీపం",
+    "candle": "కొవ్వొత్తి",
+    "food": "ఆహారం",
+    "sweet": "మిఠాయి",
+    "rice": "బియ్యం",
+    "milk": "పాలు",
+    "honey": "తేనె",
+    "coconut": "కొబ్బరి",
+    "banana": "అరటి",
+    "mango": "మామిడి",
+    "color": "రంగు",
+    "red": "ఎరుపు",
+    "yellow": "పసుపు",
+    "orange": "నారింజ",
+    "green": "పచ్చ",
+    "blue": "నీలం",
+    "white": "తెలుపు",
+    "gold": "బంగారం",
+    "silver": "వెండి",
+    "beautiful": "అందమైన",
+    "wonderful": "అద్భుతమైన",
+    "amazing": "ఆశ్చర్యకరమైన",
+    "special": "ప్రత్యేకమైన",
+    "unique": "విశిష్టమైన",
+    "famous": "ప్రసిద్ధమైన",
+    "popular": "జనాదరణ పొందిన",
+    "important": "ముఖ్యమైన",
+    "essential": "అవసరమైన",
+    "necessary": "అవసరమైన",
+    "valuable": "విలువైన",
+    "precious": "విలువైన",
+    "this": "ఇది",
+    "is": "ఉంది",
+    "a": "ఒక",
+    "in": "లో",
+    "of": "యొక్క",
+    "the": "",
+    "with": "తో",
+    "and": "మరియు",
+    "or": "లేదా",
+    "for": "కోసం",
+    "to": "కు",
+    "from": "నుండి",
+    "by": "ద్వారా",
+    "at": "వద్ద",
+    "on": "పై",
+    "about": "గురించి",
+    "detailed": "వివరమైన",
+    "summary": "సారాంశం",
+    "please": "దయచేసి",
+    "provide": "ఇవ్వండి",
+    "festival's": "పండుగ యొక్క",
+    "traditions and": "సంప్రదాయాలు మరియు",
+    "cultural importance": "సాంస్కృతిక ముఖ్యత",
+    "hyderabad": "హైదరాబాద్",
+    "bonalu": "బోనాలు",
+    "bathukamma": "బతుకమ్మ",
+    "ugadi": "ఉగాది",
+    "sankranti": "సంక్రాంతి",
+    "dasara": "దసరా",
+    "diwali": "దీపావళి",
+    "holi": "హోళీ",
+    "ramzan": "రంజాన్",
+    "christmas": "క్రిస్మస్",
+}
+
+# Folded per character, so positions in the folded text match the original
+_FOLD_TABLE = {code: " " for code in range(0x3001) if chr(code).isspace() and code != 0x20}
+_FOLD_TABLE.update({ord("’"): "'", ord("‘"): "'"})
+
+
+def _fold_char(ch):
+    folded = ch.lower()
+    if len(folded) != 1:
+        folded = ch  # e.g. "İ" lowers to two characters; keep it as is
+    return folded.translate(_FOLD_TABLE)
+
+
+def fold_text(text):
+    """Lower-cased text of the same length, with whitespace as spaces and curly apostrophes straight"""
+    folded = text.lower()
+    if len(folded) != len(text):
+        return "".join(_fold_char(ch) for ch in text)
+    return folded.translate(_FOLD_TABLE)
+
+
+def fold_term(term):
+    """Matching key of a glossary term: folded, with inner whitespace runs as single spaces"""
+    return "".join(_fold_char(ch) for ch in " ".join(term.split()))
+
+
+def _is_word_char(ch):
+    # Letters, digits and combining marks (Telugu vowel signs) continue a word
+    return ch.isalnum() or ch == "_" or unicodedata.category(ch)[0] == "M"
+
+
+def _original_span(match, positions):
+    start, end, replacement = match
+    return positions[start], positions[end - 1] + 1, replacement
+
+
+class GlossaryMatcher:
+    """
+    Aho-Corasick automaton over the terms of a glossary
+
+    Args:
+        terms (dict): English term -> replacement
+    """
+
+    def __init__(self, terms):
+        self._goto = [{}]
+        self._fail = [0]
+        self._depth = [0]
+        self._output = [None]  # (term length, replacement) of the term ending exactly at a state
+        self._output_link = [0]  # nearest state on the failure chain with an output
+        self.size = 0
+
+        for term, replacement in terms.items():
+            key = fold_term(term)
+            if not key:
+                continue
+            state = 0
+            for ch in key:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._depth.append(self._depth[state] + 1)
+                    self._output.append(None)
+                    self._output_link.append(0)
+                state = next_state
+            if self._output[state] is None:
+                self.size += 1
+            self._output[state] = (len(key), replacement)
+        self._link()
+
+    def _link(self):
+        """Breadth-first failure and output links"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                link = self._fail[child]
+                self._output_link[child] = link if self._output[link] is not None else self._output_link[link]
+                queue.append(child)
+
+    def __len__(self):
+        return self.size
+
+    def find(self, text):
+        """
+        Non-overlapping whole-word glossary matches, leftmost-longest
+
+        Returns:
+            list: (start, end, replacement) tuples in text order
+        """
+        folded = fold_text(text)
+        positions = None
+        if "  " in folded:
+            # A run of whitespace matches the single space between the words of a term: scan
+            # the text with runs collapsed and map matches back to positions in the original
+            positions = [i for i, ch in enumerate(folded) if ch != " " or i == 0 or folded[i - 1] != " "]
+            folded = "".join(folded[i] for i in positions)
+        goto, fail, depth, output, output_link = self._goto, self._fail, self._depth, self._output, self._output_link
+        length = len(folded)
+        matches = []
+        best = None  # (start, end, replacement) of the leftmost-longest match so far
+        state = 0
+        i = 0
+        while True:
+            while i < length:
+                ch = folded[i]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                i += 1
+                if best is not None and i - depth[state] > best[0]:
+                    # No term still being read can start at or before best, so it is final.
+                    # Scanning restarts where it ends, re-reading at most one term's length.
+                    matches.append(best if positions is None else _original_span(best, positions))
+                    i = best[1]
+                    state = 0
+                    best = None
+                    continue
+
+                candidate = state if output[state] is not None else output_link[state]
+                while candidate:
+                    term_length, replacement = output[candidate]
+                    start = i - term_length
+                    if ((best is None or start <= best[0])
+                            and (start == 0 or not _is_word_char(folded[start - 1]))
+                            and (i == length or not _is_word_char(folded[i]))):
+                        best = (start, i, replacement)
+                        break  # terms further down the chain are shorter, so start later
+                    candidate = output_link[candidate]
+
+            if best is None:
+                break
+            matches.append(best if positions is None else _original_span(best, positions))
+            i = best[1]
+            state = 0
+            best = None
+        return matches
+
+    def translate(self, text):
+        """
+        Text with every glossary term replaced
+
+        A term translated to "" is dropped along with the spaces and tabs after it.
+        """
+        parts = []
+        cursor = 0
+        for start, end, replacement in self.find(text):
+            if start < cursor:
+                continue  # starts in the space consumed after a dropped term
+            parts.append(text[cursor:start])
+            parts.append(replacement)
+            cursor = end
+            while not replacement and text[cursor:cursor + 1] in (" ", "\t"):
+                cursor += 1
+        parts.append(text[cursor:])
+        return "".join(parts)
+
+
+def load_glossary_file(path):
+    """
+    Read a glossary file
+
+    Args:
+        path (Path): .json object of term -> translation, .csv with two columns,
+                     or anything else as tab-separated lines ('#' starts a comment)
+
+    Returns:
+        dict: Term -> translation
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.suffix.lower() == ".json":
+            data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError(f"{path} must contain a JSON object of term -> translation")
+            return {str(term): str(translation) for term, translation in data.items()}
+        if path.suffix.lower() == ".csv":
+            rows = csv.reader(f)
+        else:
+            rows = (line.rstrip("\r\n").split("\t") for line in f if line.strip() and not line.startswith("#"))
+        terms = {}
+        for row in rows:
+            if len(row) >= 2 and row[0].strip():
+                terms[row[0].strip()] = row[1].strip()
+        return terms
+
+
+class TeluguGlossary:
+    """
+    Glossary translator over built-in terms plus a glossary file, recompiled when the file changes
+
+    Args:
+        terms (dict, optional): Built-in terms; the file's entries override them
+        path (Path, optional): External glossary file, or None for the built-in terms only
+        check_interval (float, optional): Seconds between checks of the file's modification time
+    """
+
+    def __init__(self, terms=TELUGU_TRANSLATIONS, path=TELUGU_GLOSSARY_FILE,
+                 check_interval=TELUGU_GLOSSARY_CHECK_INTERVAL):
+        self.terms = dict(terms)
+        self.path = Path(path) if path else None
+        self.check_interval = check_interval
+        self._reload_lock = threading.Lock()
+        self._signature = None
+        self._last_check = time.monotonic()
+        self._matcher = GlossaryMatcher(self.terms)
+        self.reload()
+
+    def _file_signature(self):
+        if self.path is None:
+            return None
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def reload(self):
+        """
+        Recompile the glossary if the file was added, changed or removed
+
+        Returns:
+            bool: True if a new glossary is in use
+        """
+        with self._reload_lock:
+            signature = self._file_signature()
+            if signature == self._signature:
+                return False
+            try:
+                file_terms = load_glossary_file(self.path) if signature else {}
+                matcher = GlossaryMatcher({**self.terms, **file_terms})
+            except Exception as e:
+                # Keep the current glossary; the file is retried once it changes again
+                print(f"Debug - Could not load Telugu glossary {self.path}: {e}")
+                self._signature = signature
+                return False
+            self._matcher = matcher
+            self._signature = signature
+            print(f"Debug - Telugu glossary compiled: {len(matcher)} terms "
+                  f"({len(file_terms)} from {self.path if signature else 'no file'})")
+            return True
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval or self._reload_lock.locked():
+            return  # checked recently, or another thread is recompiling (the current glossary stays in use)
+        self._last_check = now
+        self.reload()
+
+    def __len__(self):
+        return len(self._matcher)
+
+    def translate(self, text):
+        """English text with every glossary term replaced by its Telugu translation"""
+        self._maybe_reload()
+        return self._matcher.translate(text)
+
+
+_default_glossary = None
+_default_glossary_lock = threading.Lock()
+
+
+def get_telugu_glossary():
+    """Process-wide TeluguGlossary over TELUGU_TRANSLATIONS and TELUGU_GLOSSARY_FILE"""
+    global _default_glossary
+    with _default_glossary_lock:
+        if _default_glossary is None:
+            _default_glossary = TeluguGlossary()
+        return _default_glossary
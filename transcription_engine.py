@@ -0,0 +1,271 @@
+"""
+Streaming transcription engine for FestFusion
+Audio is decoded by ffmpeg as a 16 kHz mono stream and cut at pauses by an
+energy-based voice activity detector. Segments are transcribed by Whisper in a
+process pool, and text is yielded in order as segments finish, so a long
+festival recording shows progress instead of blocking the page for minutes.
+"""
+
+import multiprocessing
+import os
+import shutil
+import subprocess
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from config import (
+    INFERENCE_BACKEND, TRANSCRIPTION_MODEL, TRANSCRIBE_SAMPLE_RATE, TRANSCRIBE_WORKERS,
+    VAD_FRAME_MS, VAD_MIN_ENERGY_DB, VAD_NOISE_MARGIN_DB,
+    VAD_MIN_SILENCE, VAD_MIN_SEGMENT, VAD_MAX_SEGMENT
+)
+
+# Audio kept before the first voiced frame of a segment, so onsets aren't clipped
+LEAD_IN_SECONDS = 0.2
+# The noise floor follows quieter frames at once but rises only this fast (dB per second),
+# so a long stretch of speech or drumming doesn't become the new "silence"
+NOISE_FLOOR_RISE_DB = 0.5
+
+
+def decode_audio_stream(path, sample_rate=TRANSCRIBE_SAMPLE_RATE, chunk_seconds=1.0):
+    """
+    Decode any audio/video file to mono float32 PCM with ffmpeg, one chunk at a time
+
+    Yields:
+        numpy.ndarray: Samples in [-1, 1]
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg is required to decode audio - install it and make sure it is on PATH")
+
+    process = subprocess.Popen(
+        [ffmpeg, "-nostdin", "-loglevel", "error", "-i", str(path),
+         "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "-"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    chunk_bytes = int(sample_rate * chunk_seconds) * 2
+    try:
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            if not data:
+                break
+            if len(data) % 2:
+                data += process.stdout.read(1)
+            yield np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg could not decode {path}: {process.stderr.read().decode(errors='replace').strip()}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+class EnergyVAD:
+    """
+    Cuts a PCM stream into speech segments at pauses
+
+    A frame is speech when its energy is above both VAD_MIN_ENERGY_DB and the
+    tracked noise floor plus VAD_NOISE_MARGIN_DB. A segment ends at the first
+    pause of VAD_MIN_SILENCE once it is VAD_MIN_SEGMENT long, and is cut at
+    VAD_MAX_SEGMENT regardless. Long pauses inside a short segment are dropped.
+
+    Args:
+        sample_rate (int, optional): Samples per second of the input
+    """
+
+    def __init__(self, sample_rate=TRANSCRIBE_SAMPLE_RATE, frame_ms=VAD_FRAME_MS,
+                 min_energy_db=VAD_MIN_ENERGY_DB, noise_margin_db=VAD_NOISE_MARGIN_DB,
+                 min_silence=VAD_MIN_SILENCE, min_segment=VAD_MIN_SEGMENT, max_segment=VAD_MAX_SEGMENT):
+        self.sample_rate = sample_rate
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.min_energy_db = min_energy_db
+        self.noise_margin_db = noise_margin_db
+        frames_per_second = 1000 / frame_ms
+        self.min_silence_frames = max(1, int(min_silence * frames_per_second))
+        self.min_segment_frames = int(min_segment * frames_per_second)
+        self.max_segment_frames = int(max_segment * frames_per_second)
+        self.lead_in_frames = int(LEAD_IN_SECONDS * frames_per_second)
+        self.floor_rise_per_frame = NOISE_FLOOR_RISE_DB / frames_per_second
+
+    def segments(self, chunks):
+        """
+        Yield speech segments from an iterable of PCM chunks
+
+        Yields:
+            tuple: (start time in seconds, float32 samples)
+        """
+        leftover = np.empty(0, dtype=np.float32)
+        noise_floor = None
+        lead_in = deque(maxlen=self.lead_in_frames)
+        segment, segment_start, voiced_frames, silence_run = [], 0, 0, 0
+        frame_index = 0
+
+        def finish():
+            return segment_start * self.frame_size / self.sample_rate, np.concatenate(segment)
+
+        for chunk in chunks:
+            samples = np.concatenate([leftover, chunk]) if len(leftover) else chunk
+            count = len(samples) // self.frame_size
+            leftover = samples[count * self.frame_size:]
+            if count == 0:
+                continue
+
+            frames = samples[:count * self.frame_size].reshape(count, self.frame_size)
+            energies = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+
+            for frame, energy in zip(frames, energies.tolist()):
+                if noise_floor is None or energy < noise_floor:
+                    noise_floor = energy
+                else:
+                    noise_floor = min(energy, noise_floor + self.floor_rise_per_frame)
+                voiced = energy > max(self.min_energy_db, noise_floor + self.noise_margin_db)
+
+                if not segment:
+                    if voiced:
+                        segment = list(lead_in) + [frame]
+                        segment_start = frame_index - len(lead_in)
+                        voiced_frames, silence_run = 1, 0
+                        lead_in.clear()
+                    else:
+                        lead_in.append(frame)
+                    frame_index += 1
+                    continue
+
+                if voiced:
+                    voiced_frames += 1
+                    silence_run = 0
+                else:
+                    silence_run += 1
+                if voiced or silence_run <= self.min_silence_frames:
+                    segment.append(frame)
+
+                paused = silence_run >= self.min_silence_frames
+                if (paused and len(segment) >= self.min_segment_frames) or len(segment) >= self.max_segment_frames:
+                    yield finish()
+                    segment, voiced_frames, silence_run = [], 0, 0
+                frame_index += 1
+
+        if segment and voiced_frames:
+            if len(leftover):
+                segment.append(leftover)
+            yield finish()
+
+
+# --- Worker processes ---
+
+_worker_pipeline = None
+
+
+def _init_worker(model_name, backend, threads):
+    global _worker_pipeline
+    import torch
+    from inference_backends import load_transcriber
+
+    # Each worker gets its share of the cores instead of every worker using all of them
+    torch.set_num_threads(threads)
+    _worker_pipeline = load_transcriber(backend, model_name)
+
+
+def _worker_ready(hold):
+    # Held briefly so each warm-up call lands on a different worker
+    time.sleep(hold)
+    return os.getpid()
+
+
+def _transcribe_segment(samples, sample_rate):
+    result = _worker_pipeline({"raw": samples, "sampling_rate": sample_rate})
+    return result["text"].strip()
+
+
+class TranscriptionEngine:
+    """
+    Parallel, streaming Whisper transcription
+
+    Args:
+        model_name (str, optional): Hugging Face ASR model
+        workers (int, optional): Worker processes, each holding one copy of the model
+        backend (str, optional): Inference backend (see inference_backends.py)
+    """
+
+    def __init__(self, model_name=TRANSCRIPTION_MODEL, workers=TRANSCRIBE_WORKERS,
+                 sample_rate=TRANSCRIBE_SAMPLE_RATE, backend=INFERENCE_BACKEND):
+        self.model_name = model_name
+        self.backend = backend
+        self.workers = workers
+        self.sample_rate = sample_rate
+        self.vad = EnergyVAD(sample_rate)
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            threads = max(1, (os.cpu_count() or 1) // self.workers)
+            # spawn: forking a process that already holds torch threads can deadlock
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.backend, threads)
+            )
+        return self._pool
+
+    def warm_up(self, timeout=None):
+        """Start every worker and load its model now instead of on the first recording"""
+        pool = self._get_pool()
+        futures = [pool.submit(_worker_ready, 0.5) for _ in range(self.workers)]
+        return {future.result(timeout) for future in futures}
+
+    def transcribe_iter(self, path, timeout=None):
+        """
+        Transcribe a file segment by segment
+
+        At most two segments per worker are decoded ahead of the transcription,
+        so memory stays bounded however long the recording is.
+
+        Args:
+            timeout (float, optional): Seconds for the whole file; raises
+                concurrent.futures.TimeoutError when exceeded
+
+        Yields:
+            dict: index, start (seconds), text of the segment and transcript so far, in order
+        """
+        pool = self._get_pool()
+        in_flight = deque()
+        transcript = []
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        def collect():
+            index, start, future = in_flight.popleft()
+            text = future.result(None if deadline is None else max(0.0, deadline - time.monotonic()))
+            if text:
+                transcript.append(text)
+            return {"index": index, "start": start, "text": text, "transcript": " ".join(transcript)}
+
+        try:
+            segments = self.vad.segments(decode_audio_stream(path, self.sample_rate))
+            for index, (start, samples) in enumerate(segments):
+                in_flight.append((index, start, pool.submit(_transcribe_segment, samples, self.sample_rate)))
+                if len(in_flight) >= self.workers * 2:
+                    yield collect()
+            while in_flight:
+                yield collect()
+        finally:
+            # Timed out or abandoned by the caller: free the workers for other requests
+            for _, _, future in in_flight:
+                future.cancel()
+
+    def transcribe(self, path):
+        """Full transcript of a file"""
+        transcript = ""
+        for update in self.transcribe_iter(path):
+            transcript = update["transcript"]
+        return transcript
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
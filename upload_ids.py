@@ -0,0 +1,127 @@
+"""
+Collision-free IDs and file creation for FestFusion uploads
+ULIDs (time-sortable, 128-bit) are monotonic within a process, random across
+processes, and every file is created exclusively so nothing is ever overwritten.
+"""
+
+import os
+import secrets
+import threading
+import time
+
+# Crockford base32, as used by the ULID spec
+ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+RANDOM_BITS = 80
+MAX_CREATE_ATTEMPTS = 10
+
+_lock = threading.Lock()
+_last_ms = -1
+_last_random = 0
+
+
+def _reset_after_fork():
+    """A forked child must not continue its parent's random sequence"""
+    global _lock, _last_ms, _last_random
+    _lock = threading.Lock()
+    _last_ms = -1
+    _last_random = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _encode(value, length):
+    chars = []
+    for _ in range(length):
+        chars.append(ULID_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def new_ulid():
+    """
+    Return a new 26-character ULID
+
+    IDs from one process are strictly increasing, even within the same millisecond.
+    """
+    global _last_ms, _last_random
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms <= _last_ms:
+            # Same (or earlier, if the clock stepped back) millisecond: bump the random part
+            now_ms = _last_ms
+            _last_random += 1
+            if _last_random >> RANDOM_BITS:
+                # Random part overflowed - borrow the next millisecond
+                now_ms += 1
+                _last_random = secrets.randbits(RANDOM_BITS)
+        else:
+            _last_random = secrets.randbits(RANDOM_BITS)
+        _last_ms = now_ms
+        return _encode((now_ms << RANDOM_BITS) | _last_random, 26)
+
+
+def unique_filename(original_filename):
+    """Stored filename for an upload: ULID prefix plus the original (secured) name"""
+    return f"{new_ulid()}_{original_filename}"
+
+
+def open_exclusive(directory, make_name, mode="xb"):
+    """
+    Create and open a new file that is guaranteed not to exist yet
+
+    Args:
+        directory (Path): Folder to create the file in
+        make_name (callable): Given a fresh ULID, returns the filename to try
+        mode (str, optional): 'x' mode for open(), 'xb' or 'x'
+
+    Returns:
+        tuple: (Path, open file object)
+    """
+    for _ in range(MAX_CREATE_ATTEMPTS):
+        path = directory / make_name(new_ulid())
+        try:
+            if "b" in mode:
+                return path, open(path, mode)
+            return path, open(path, mode, encoding="utf-8")
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Could not allocate a unique filename in {directory}")
+
+
+def place_exclusive(directory, make_name, place):
+    """
+    Call place(path) with fresh ULID-based paths until one doesn't already exist
+
+    place must raise FileExistsError (and leave its source intact) when path is taken.
+
+    Returns:
+        tuple: (Path that was used, whatever place returned)
+    """
+    for _ in range(MAX_CREATE_ATTEMPTS):
+        path = directory / make_name(new_ulid())
+        try:
+            return path, place(path)
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Could not allocate a unique filename in {directory}")
+
+
+def move_exclusive(src, dst):
+    """
+    Rename src to dst, failing with FileExistsError instead of replacing dst
+
+    Uses a hard link (atomic create-if-absent) where the filesystem supports it;
+    otherwise reserves dst with an exclusive create before replacing it.
+    """
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        raise
+    except OSError:
+        fd = os.open(dst, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        os.close(fd)
+        os.replace(src, dst)
+        return
+    os.remove(src)
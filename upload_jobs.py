@@ -0,0 +1,274 @@
+"""
+Background job pipeline for FestFusion uploads
+Drive uploads and Sheets archival run on a thread pool so the Streamlit form
+returns as soon as the file is on local disk. Jobs are recorded in a SQLite
+table so the UI can poll them and unfinished jobs are picked up after a restart.
+
+Each unfinished job is owned by one pipeline, which renews a lease on it while
+the job waits or runs. Another process only takes a job over once its lease
+has expired, so replicas never upload or archive the same file twice.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from config import UPLOAD_JOBS_DB, UPLOAD_JOB_WORKERS, UPLOAD_JOB_LEASE_SECONDS
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class UploadJobPipeline:
+    """
+    Thread-pool job runner with a persistent job table
+
+    Handlers are registered per job kind and receive the job's JSON payload.
+    Whatever a handler returns is stored as the job result.
+
+    Args:
+        db_path (Path, optional): SQLite file holding the job table
+        max_workers (int, optional): Number of worker threads
+        lease_seconds (float, optional): How long a job stays owned by this pipeline without a renewal
+    """
+
+    def __init__(self, db_path=UPLOAD_JOBS_DB, max_workers=UPLOAD_JOB_WORKERS, lease_seconds=UPLOAD_JOB_LEASE_SECONDS):
+        self.db_path = str(db_path)
+        self.handlers = {}
+        self.lease_seconds = lease_seconds
+        self._owner = f"{os.getpid()}-{id(self)}"
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upload-job")
+        self._finished = threading.Condition()
+        self._stop = threading.Event()
+        self._heartbeat = None
+        self._heartbeat_lock = threading.Lock()
+        self._init_db()
+
+    # --- Job table ---
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload_json TEXT NOT NULL,
+                    result_json TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    lease_until REAL
+                )
+            """)
+            # Job tables created before jobs had an owner
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+                conn.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+        finally:
+            conn.close()
+
+    def _set_status(self, job_id, status, result=None, error=None):
+        conn = self._connect()
+        try:
+            conn.execute(
+                """UPDATE jobs SET status = ?, result_json = ?, error = ?, updated_at = ?, owner = NULL, lease_until = NULL
+                   WHERE id = ? AND owner = ?""",
+                (status, json.dumps(result, ensure_ascii=False) if result is not None else None,
+                 error, time.time(), job_id, self._owner)
+            )
+        finally:
+            conn.close()
+
+    def _start_job(self, job_id):
+        """Mark a job this pipeline owns as running; False if another process has taken it over"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (RUNNING, time.time(), job_id, self._owner, QUEUED)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def _renew_leases(self):
+        """Heartbeat: extend the lease of every unfinished job this pipeline owns"""
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                conn = self._connect()
+                try:
+                    conn.execute(
+                        "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status IN (?, ?)",
+                        (time.time() + self.lease_seconds, self._owner, QUEUED, RUNNING)
+                    )
+                finally:
+                    conn.close()
+            except Exception as e:
+                print(f"Debug - Could not renew upload job leases: {e}")
+
+    def _ensure_heartbeat(self):
+        with self._heartbeat_lock:
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._renew_leases, name="upload-job-leases", daemon=True)
+                self._heartbeat.start()
+
+    def get(self, job_id):
+        """
+        Look up a job
+
+        Returns:
+            dict: id, kind, status, payload, result, error and timestamps, or None if unknown
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "payload": json.loads(row["payload_json"]),
+            "result": json.loads(row["result_json"]) if row["result_json"] else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    # --- Running jobs ---
+
+    def register(self, kind, handler):
+        """Register the function that runs jobs of this kind"""
+        self.handlers[kind] = handler
+
+    def _run(self, job_id, kind, payload):
+        if not self._start_job(job_id):
+            print(f"Debug - Job {job_id} ({kind}) was taken over by another process, skipping")
+            return
+        try:
+            result = self.handlers[kind](payload)
+            self._set_status(job_id, DONE, result=result)
+        except Exception as e:
+            print(f"Debug - Job {job_id} ({kind}) failed: {e}")
+            self._set_status(job_id, FAILED, error=str(e))
+        with self._finished:
+            self._finished.notify_all()
+
+    def submit(self, kind, payload):
+        """
+        Record a job and hand it to the thread pool
+
+        Returns:
+            str: Job ID the UI can poll with get()
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                """INSERT INTO jobs (id, kind, status, payload_json, created_at, updated_at, owner, lease_until)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (job_id, kind, QUEUED, json.dumps(payload, ensure_ascii=False), now, now,
+                 self._owner, now + self.lease_seconds)
+            )
+        finally:
+            conn.close()
+
+        self._ensure_heartbeat()
+        self._executor.submit(self._run, job_id, kind, payload)
+        return job_id
+
+    def wait(self, job_id, timeout=None):
+        """
+        Block until a job has finished
+
+        Returns:
+            dict: The finished job (see get())
+
+        Raises:
+            TimeoutError: If the job is still unfinished after timeout seconds
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in (DONE, FAILED):
+                return job
+            remaining = deadline - time.time() if deadline is not None else 1.0
+            if remaining <= 0:
+                raise TimeoutError(f"Job {job_id} did not finish within {timeout}s")
+            with self._finished:
+                self._finished.wait(timeout=min(remaining, 1.0))
+
+    def resume_pending(self):
+        """
+        Take over jobs left queued or running by a process that has stopped, oldest first
+
+        Only jobs whose lease has expired are taken, so jobs another live process
+        is still working on are left alone.
+
+        Returns:
+            int: Jobs resumed
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                """SELECT id, kind, payload_json FROM jobs
+                   WHERE status IN (?, ?) AND (lease_until IS NULL OR lease_until < ?) ORDER BY created_at""",
+                (QUEUED, RUNNING, now)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        resumed = 0
+        for row in rows:
+            if row["kind"] not in self.handlers:
+                continue
+            # Claimed atomically, so only one of several restarting processes takes each job
+            conn = self._connect()
+            try:
+                cursor = conn.execute(
+                    """UPDATE jobs SET status = ?, owner = ?, lease_until = ?, updated_at = ?
+                       WHERE id = ? AND status IN (?, ?) AND (lease_until IS NULL OR lease_until < ?)""",
+                    (QUEUED, self._owner, time.time() + self.lease_seconds, time.time(),
+                     row["id"], QUEUED, RUNNING, now)
+                )
+                claimed = cursor.rowcount == 1
+            finally:
+                conn.close()
+            if not claimed:
+                continue
+            self._ensure_heartbeat()
+            self._executor.submit(self._run, row["id"], row["kind"], json.loads(row["payload_json"]))
+            resumed += 1
+        if resumed:
+            print(f"Debug - Resumed {resumed} unfinished upload jobs")
+        return resumed
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs and optionally wait for running ones"""
+        self._executor.shutdown(wait=wait)
+        # Without a heartbeat, jobs still owned here expire and another process resumes them
+        self._stop.set()